@@ -0,0 +1,45 @@
+"""
+Benchmark: batched fetch_stocks_bulk vs one request per ticker.
+
+The downloader is a stub with a fixed round-trip latency plus a small
+per-symbol cost, so the numbers are reproducible offline.
+
+Usage:
+    python benchmarks/bench_bulk_fetch.py
+"""
+
+import sys
+import time
+sys.path.append('data_analyst_agent')
+
+import numpy as np
+import pandas as pd
+from data_fetcher import fetch_stocks_bulk
+
+ROUND_TRIP = 0.02      # seconds per HTTP request
+PER_SYMBOL = 0.0005    # seconds of server work per symbol
+
+
+def stub_downloader(tickers, start_date, end_date):
+    time.sleep(ROUND_TRIP + PER_SYMBOL * len(tickers))
+    dates = pd.bdate_range(start_date, end_date, inclusive='left')
+    columns = pd.MultiIndex.from_product([tickers, ['Open', 'High', 'Low', 'Close', 'Volume']])
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.uniform(90, 110, (len(dates), len(columns))), index=dates, columns=columns)
+
+
+if __name__ == "__main__":
+    tickers = [f"T{i:03d}" for i in range(500)]
+    
+    start = time.perf_counter()
+    fetch_stocks_bulk(tickers, "2024-01-01", "2024-12-31", chunk_size=1, downloader=stub_downloader)
+    per_ticker = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    fetch_stocks_bulk(tickers, "2024-01-01", "2024-12-31", chunk_size=100, downloader=stub_downloader)
+    bulk = time.perf_counter() - start
+    
+    print(f"Tickers:           {len(tickers)}")
+    print(f"Per-ticker loop:   {per_ticker:.2f}s")
+    print(f"Bulk (chunks=100): {bulk:.2f}s")
+    print(f"Speedup:           {per_ticker / bulk:.1f}x")
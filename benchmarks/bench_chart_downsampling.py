@@ -0,0 +1,43 @@
+"""
+Benchmark: chart render time vs history length, with and without
+min/max downsampling.
+
+Usage:
+    python benchmarks/bench_chart_downsampling.py
+"""
+
+import sys
+import tempfile
+import time
+sys.path.append('data_analyst_agent')
+
+import numpy as np
+import pandas as pd
+from metrics import compute_indicators
+from visualizer import plot_drawdown, plot_price_with_ma, plot_rsi
+
+
+def make_prices(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("1990-01-01", periods=n_rows, freq="h")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0, 0.002, n_rows)))
+    return pd.DataFrame({'close': close}, index=dates)
+
+
+def render_all(df, indicators, output_dir, max_points):
+    start = time.perf_counter()
+    plot_price_with_ma(df, "BENCH", output_dir, indicators=indicators, max_points=max_points)
+    plot_rsi(df, "BENCH", output_dir=output_dir, indicators=indicators, max_points=max_points)
+    plot_drawdown(df, "BENCH", output_dir, indicators=indicators, max_points=max_points)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    output_dir = tempfile.mkdtemp()
+    print(f"{'rows':>8} {'full':>8} {'downsampled':>12}")
+    for n_rows in (252, 5040, 50_000, 250_000):
+        df = make_prices(n_rows)
+        indicators = compute_indicators(df)
+        full = render_all(df, indicators, output_dir, max_points=0)
+        fast = render_all(df, indicators, output_dir, max_points=None)
+        print(f"{n_rows:>8} {full:>7.2f}s {fast:>11.2f}s")
@@ -0,0 +1,54 @@
+"""
+Benchmark: chart rendering for a universe, serial vs worker pools.
+
+Renders the three PNG charts per ticker in memory: one ticker at a
+time, with parallel=True (the three charts of a ticker on threads),
+and through generate_charts_many on a thread pool and a process pool.
+
+Usage:
+    python benchmarks/bench_charts_many.py
+    python benchmarks/bench_charts_many.py --tickers 64 --years 5 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append('benchmarks')
+sys.path.append('data_analyst_agent')
+
+from synthetic import iter_universe
+from visualizer import generate_all_charts, generate_charts_many
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=16)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    frames = dict(iter_universe(args.tickers, args.years))
+    runs = {
+        'serial': lambda: {t: generate_all_charts(df, t, output_dir=None, in_memory=True) for t, df in frames.items()},
+        'parallel=True': lambda: {t: generate_all_charts(df, t, output_dir=None, in_memory=True, parallel=True)
+                                  for t, df in frames.items()},
+        'thread pool': lambda: generate_charts_many(frames, output_dir=None, executor="thread",
+                                                    max_workers=args.workers, in_memory=True),
+        'process pool': lambda: generate_charts_many(frames, output_dir=None, executor="process",
+                                                     max_workers=args.workers, in_memory=True)
+    }
+
+    print(f"{args.tickers} tickers x {args.years:g} years, 3 charts each, {args.workers} workers")
+    baseline = None
+    for name, run in runs.items():
+        charts, elapsed = timed(run)
+        assert len(charts) == args.tickers
+        baseline = baseline or elapsed
+        print(f"  {name:<14} {elapsed:6.2f}s  {3 * args.tickers / elapsed:6.1f} charts/s  {baseline / elapsed:.1f}x")
@@ -0,0 +1,58 @@
+"""
+Benchmark: universe metrics from the columnar store vs per-ticker Parquet.
+
+Writes the same synthetic universe both ways, then times a one-year
+range read plus compute_all_metrics for every ticker: Parquet files
+through LocalDirectorySource (parse + clean_dataframe per ticker) vs
+memory-mapped range reads from ColumnarStore.
+
+Usage:
+    python benchmarks/bench_columnar_store.py
+    python benchmarks/bench_columnar_store.py --tickers 1000 --years 30
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+sys.path.append('benchmarks')
+sys.path.append('data_analyst_agent')
+
+from columnar_store import ColumnarStore
+from data_sources import LocalDirectorySource
+from metrics import compute_all_metrics
+from synthetic import iter_universe
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    files = LocalDirectorySource(tempfile.mkdtemp(), memoize=False)
+    for ticker, df in iter_universe(args.tickers, args.years):
+        files.save(ticker, df)
+    store = ColumnarStore.write(tempfile.mkdtemp(), iter_universe(args.tickers, args.years))
+    tickers = store.tickers()
+    start_date, end_date = "2024-01-01", "2025-01-01"
+
+    from_files, files_t = timed(lambda: {
+        t: compute_all_metrics(files.get_prices(t, start_date, end_date), t) for t in tickers
+    })
+    from_store, store_t = timed(lambda: {
+        a.ticker: compute_all_metrics(a, a.ticker) for a in store.iter_arrays(start_date, end_date)
+    })
+    _, full_files_t = timed(lambda: [files.get_prices(t, "1900-01-01", "2100-01-01") for t in tickers])
+    _, full_store_t = timed(lambda: [store.get_arrays(t) for t in tickers])
+
+    assert from_store[tickers[0]]['metrics']['max_drawdown'] == from_files[tickers[0]]['metrics']['max_drawdown']
+    print(f"{args.tickers} tickers x {args.years} years ({store.rows:,} rows)")
+    print(f"  1y range + metrics: parquet {files_t:.2f}s, columnar {store_t:.2f}s, speedup {files_t / store_t:.1f}x")
+    print(f"  full-history reads: parquet {full_files_t:.2f}s, columnar {full_store_t * 1000:.1f}ms")
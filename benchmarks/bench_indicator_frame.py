@@ -0,0 +1,58 @@
+"""
+Benchmark: shared IndicatorFrame vs recomputing series per consumer.
+
+"Legacy" repeats the work the pipeline used to do: compute_all_metrics
+computing returns twice, plus the visualizer recomputing SMAs, RSI and
+the drawdown series. "Shared" computes the IndicatorFrame once and feeds
+it to compute_all_metrics (the charts only read columns from it).
+
+Usage:
+    python benchmarks/bench_indicator_frame.py
+"""
+
+import sys
+import timeit
+sys.path.append('data_analyst_agent')
+
+import numpy as np
+import pandas as pd
+from metrics import (calculate_daily_returns, calculate_drawdown_series, calculate_max_drawdown,
+                     calculate_rsi, calculate_total_return, calculate_volatility,
+                     compute_all_metrics, compute_indicators)
+
+
+def make_prices(n_days: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("1990-01-01", periods=n_days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_days)))
+    return pd.DataFrame({'close': close}, index=dates)
+
+
+def legacy(df):
+    # Metrics
+    calculate_max_drawdown(df)
+    calculate_rsi(df).iloc[-1]
+    calculate_total_return(df)
+    calculate_volatility(df)
+    calculate_daily_returns(df).mean()
+    # Chart-side recomputation
+    df['close'].rolling(window=20).mean()
+    df['close'].rolling(window=50).mean()
+    calculate_rsi(df)
+    calculate_drawdown_series(df)
+
+
+def shared(df):
+    indicators = compute_indicators(df)
+    compute_all_metrics(df, "BENCH", indicators)
+
+
+if __name__ == "__main__":
+    for n_days in (252, 2520, 7560):
+        df = make_prices(n_days)
+        # Same numbers either way
+        assert compute_all_metrics(df, "BENCH", compute_indicators(df)) == compute_all_metrics(df, "BENCH")
+        legacy_t = min(timeit.repeat(lambda: legacy(df), number=20, repeat=5)) / 20
+        shared_t = min(timeit.repeat(lambda: shared(df), number=20, repeat=5)) / 20
+        print(f"{n_days:>5} days: legacy {legacy_t*1000:6.2f} ms, shared {shared_t*1000:6.2f} ms, "
+              f"saved {(1 - shared_t / legacy_t) * 100:4.1f}%")
@@ -0,0 +1,44 @@
+"""
+Benchmark: panel metrics vs a per-ticker compute_all_metrics loop.
+
+Usage:
+    python benchmarks/bench_panel_metrics.py
+"""
+
+import sys
+import time
+sys.path.append('data_analyst_agent')
+
+import numpy as np
+import pandas as pd
+from metrics import compute_all_metrics
+from panel_metrics import compute_panel_metrics
+
+
+def make_panel(n_tickers: int, n_days: int):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2000-01-03", periods=n_days)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (n_tickers, n_days)), axis=1))
+    # Ragged histories: later listings are NaN-padded at the start
+    starts = rng.integers(0, n_days // 4, n_tickers)
+    closes[np.arange(n_days)[None, :] < starts[:, None]] = np.nan
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    return closes, tickers, dates
+
+
+if __name__ == "__main__":
+    for n_tickers, n_days in ((1000, 252), (1000, 2520)):
+        closes, tickers, dates = make_panel(n_tickers, n_days)
+        frames = {t: pd.DataFrame({'close': row}, index=dates).dropna() for t, row in zip(tickers, closes)}
+        
+        start = time.perf_counter()
+        loop = {t: compute_all_metrics(df, t) for t, df in frames.items()}
+        loop_t = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        panel = compute_panel_metrics(closes, tickers, dates)
+        panel_t = time.perf_counter() - start
+        
+        assert panel[tickers[0]]['metrics']['max_drawdown'] == loop[tickers[0]]['metrics']['max_drawdown']
+        print(f"{n_tickers} tickers x {n_days} days: loop {loop_t:.2f}s, panel {panel_t:.3f}s, "
+              f"speedup {loop_t / panel_t:.0f}x")
@@ -0,0 +1,79 @@
+"""
+Benchmark: building many PDF reports.
+
+  fresh    - a new ReportTemplate per report (what generate_pdf_report
+             used to do: styles and static text rebuilt every call)
+  template - one shared ReportTemplate
+  pool     - generate_pdf_reports across a process pool
+
+Usage:
+    python benchmarks/bench_pdf_batch.py [n_reports] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append('.')
+sys.path.append('data_analyst_agent')
+
+import numpy as np
+import pandas as pd
+from visualizer import chart_series
+from report_generator import ReportTemplate, generate_pdf_reports
+
+MARKET_DATA = {
+    'sentiment': 'Bullish',
+    'confidence_score': 0.6,
+    'summary': ['Synthetic benchmark data'],
+    'key_risks': ['None']
+}
+QUANT_DATA = {'avg_return': 0.0005, 'volatility': 0.25, 'RSI': 55, 'max_drawdown': -0.3}
+
+
+def make_batch(n_reports: int) -> list:
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2024-01-01", periods=252)
+    batch = []
+    for i in range(n_reports):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+        batch.append({
+            'ticker': f'T{i:04d}',
+            'start_date': '2024-01-01',
+            'end_date': '2024-12-31',
+            'market_data': MARKET_DATA,
+            'quant_data': QUANT_DATA,
+            # Vector charts, so the benchmark measures the PDF build, not matplotlib
+            'charts': chart_series(pd.DataFrame({'close': close}, index=dates))
+        })
+    return batch
+
+
+def build_serial(batch: list, output_dir: str, shared: bool):
+    template = ReportTemplate()
+    for job in batch:
+        if not shared:
+            template = ReportTemplate()
+        template.build(job['ticker'], job['start_date'], job['end_date'], job['market_data'],
+                       job['quant_data'], output_dir=output_dir, charts=job['charts'])
+
+
+if __name__ == "__main__":
+    n_reports = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    batch = make_batch(n_reports)
+    output_dir = tempfile.mkdtemp()
+    
+    timings = {}
+    for name, run in (
+        ('fresh', lambda: build_serial(batch, output_dir, shared=False)),
+        ('template', lambda: build_serial(batch, output_dir, shared=True)),
+        ('pool', lambda: generate_pdf_reports(batch, output_dir=output_dir, max_workers=workers))
+    ):
+        start = time.perf_counter()
+        run()
+        timings[name] = time.perf_counter() - start
+    
+    print(f"{n_reports} reports, {workers} workers")
+    for name, elapsed in timings.items():
+        print(f"  {name:<9} {elapsed:6.2f}s  ({n_reports / elapsed:6.1f} reports/s)")
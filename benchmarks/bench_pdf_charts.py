@@ -0,0 +1,66 @@
+"""
+Benchmark: PDF report size and build time, raster PNG charts vs native
+vector charts, at 1-year and 20-year horizons.
+
+Raster time covers rendering the PNGs (in memory) plus building the PDF;
+vector time covers extracting the chart series plus building the PDF.
+
+Usage:
+    python benchmarks/bench_pdf_charts.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append('.')
+sys.path.append('data_analyst_agent')
+
+import numpy as np
+import pandas as pd
+from metrics import compute_indicators
+from visualizer import chart_series, generate_all_charts
+from report_generator import generate_pdf_report
+
+MARKET_DATA = {
+    'sentiment': 'Bullish',
+    'confidence_score': 0.6,
+    'summary': ['Synthetic benchmark data'],
+    'key_risks': ['None']
+}
+QUANT_DATA = {'avg_return': 0.0005, 'volatility': 0.25, 'RSI': 55, 'max_drawdown': -0.3}
+
+
+def make_prices(years: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2000-01-01", periods=252 * years)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+    return pd.DataFrame({'close': close}, index=dates)
+
+
+def build(mode: str, df: pd.DataFrame, indicators: pd.DataFrame, output_dir: str) -> tuple:
+    start = time.perf_counter()
+    if mode == "raster":
+        charts = generate_all_charts(df, "BENCH", output_dir=None, indicators=indicators, in_memory=True)
+    else:
+        charts = chart_series(df, indicators)
+    path = generate_pdf_report("BENCH", "2000-01-01", "2020-01-01", MARKET_DATA, QUANT_DATA,
+                               output_dir=os.path.join(output_dir, mode), charts=charts)
+    return time.perf_counter() - start, os.path.getsize(path)
+
+
+if __name__ == "__main__":
+    output_dir = tempfile.mkdtemp()
+    print(f"{'horizon':>8} {'mode':>7} {'build':>8} {'size':>10}")
+    for years in (1, 20):
+        df = make_prices(years)
+        indicators = compute_indicators(df)
+        results = {}
+        for mode in ("raster", "vector"):
+            # Best of 3 to smooth out first-call overhead
+            results[mode] = min(build(mode, df, indicators, output_dir) for _ in range(3))
+            elapsed, size = results[mode]
+            print(f"{years:>7}y {mode:>7} {elapsed:>7.3f}s {size / 1024:>8.1f}KB")
+        
+        raster, vector = results['raster'], results['vector']
+        print(f"{'':>8} vector is {raster[0] / vector[0]:.1f}x faster, {raster[1] / vector[1]:.1f}x smaller")
@@ -0,0 +1,49 @@
+"""
+Benchmark: vectorized rolling metrics vs naive pandas rolling().apply().
+
+Usage:
+    python benchmarks/bench_rolling_metrics.py
+"""
+
+import sys
+import time
+sys.path.append('data_analyst_agent')
+
+import numpy as np
+import pandas as pd
+from rolling_metrics import compute_rolling_metrics
+
+WINDOWS = [21, 63, 252]
+
+
+def naive(df):
+    close = df['close']
+    returns = close.pct_change()
+    columns = {}
+    for w in WINDOWS:
+        columns[f'return_{w}'] = close.rolling(w + 1).apply(lambda x: x[-1] / x[0] - 1, raw=True)
+        columns[f'volatility_{w}'] = returns.rolling(w).apply(lambda x: np.std(x, ddof=1), raw=True) * np.sqrt(252)
+        columns[f'max_drawdown_{w}'] = close.rolling(w).apply(
+            lambda x: (x / np.maximum.accumulate(x) - 1).min(), raw=True)
+    return pd.DataFrame(columns)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n_days = 252 * 30
+    dates = pd.bdate_range("1995-01-02", periods=n_days)
+    df = pd.DataFrame({'close': 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_days)))}, index=dates)
+    
+    start = time.perf_counter()
+    slow = naive(df)
+    naive_t = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    fast = compute_rolling_metrics(df, WINDOWS)
+    fast_t = time.perf_counter() - start
+    
+    assert np.allclose(fast[slow.columns], slow, equal_nan=True, atol=1e-10)
+    print(f"30-year history ({n_days} bars), windows {WINDOWS}")
+    print(f"Naive rolling().apply(): {naive_t:.3f}s")
+    print(f"Vectorized:              {fast_t * 1000:.1f}ms")
+    print(f"Speedup:                 {naive_t / fast_t:.0f}x")
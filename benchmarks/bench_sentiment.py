@@ -0,0 +1,66 @@
+"""
+Benchmark: headline sentiment scoring at 10k and 100k headlines.
+
+  loop      - polarity_scores per headline (the old get_sentiment_vader path)
+  cold      - SentimentScorer.score_many with an empty memo (dedupes the batch)
+  warm      - score_many again (every headline memoized, like a repeat run)
+  processes - cold score_many spread across worker processes
+
+The corpus mimics wire news: each unique headline is repeated across
+several tickers (about 1 in 4 headlines is unique).
+
+Usage:
+    python benchmarks/bench_sentiment.py [workers]
+"""
+
+import os
+import sys
+import time
+sys.path.append('market_research_agent')
+
+import numpy as np
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from sentiment import SentimentScorer
+
+SUBJECTS = ["Apple", "Tesla", "Nvidia", "Microsoft", "Amazon", "Fed", "Oil prices", "Chipmakers"]
+VERBS = ["surge after", "slump on", "rally despite", "tumble amid", "hold steady ahead of", "beat estimates with"]
+OBJECTS = ["strong earnings", "weak guidance", "record profit", "lawsuit fears", "rate cut hopes",
+           "supply chain worries", "an upgrade", "a downgrade", "layoffs", "a buyback"]
+
+
+def make_headlines(n: int, unique_share: float = 0.25) -> list:
+    rng = np.random.default_rng(0)
+    n_unique = max(int(n * unique_share), 1)
+    unique = [
+        f"{rng.choice(SUBJECTS)} shares {rng.choice(VERBS)} {rng.choice(OBJECTS)}, analysts say {i}"
+        for i in range(n_unique)
+    ]
+    return [unique[i] for i in rng.integers(0, n_unique, n)]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    analyzer = SentimentIntensityAnalyzer()
+    
+    for n in (10_000, 100_000):
+        headlines = make_headlines(n)
+        scorer = SentimentScorer(maxsize=n)
+        
+        loop, expected = timed(lambda: [analyzer.polarity_scores(h)['compound'] for h in headlines])
+        cold, scored = timed(lambda: scorer.score_many(headlines))
+        warm, _ = timed(lambda: scorer.score_many(headlines))
+        pooled, pooled_scored = timed(lambda: SentimentScorer(maxsize=n).score_many(headlines, workers=workers))
+        
+        assert [c for _, c in scored] == expected and pooled_scored == scored
+        
+        print(f"{n:,} headlines ({len(set(headlines)):,} unique)")
+        print(f"  loop                {loop:7.2f}s")
+        print(f"  cold                {cold:7.2f}s  ({loop / cold:5.1f}x)")
+        print(f"  warm                {warm:7.3f}s  ({loop / warm:5.0f}x)")
+        print(f"  processes ({workers:>2})      {pooled:7.2f}s  ({loop / pooled:5.1f}x)")
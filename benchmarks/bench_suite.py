@@ -0,0 +1,246 @@
+"""
+Benchmark suite: every pipeline stage on synthetic data, offline.
+
+Times compute_all_metrics, each chart function, analyze_market (news
+sampling, VADER scoring and keywords over synthetic headlines served by
+a fixture instead of Finnhub), generate_full_report and
+generate_pdf_report for every combination of history length (years)
+and universe size (tickers). Each stage is timed per ticker; the JSON
+output holds per-stage totals and percentiles plus the versions it ran
+on, so runs of different commits can be compared with --compare.
+
+The full default grid (1/10/30 years x 1/100/1,000 tickers) takes a
+long while, mostly matplotlib; --quick runs a small grid for a smoke
+test.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --quick
+    python benchmarks/bench_suite.py --horizons 1 10 --tickers 1 100 --stages compute_all_metrics plot_rsi
+    python benchmarks/bench_suite.py --output new.json --compare benchmarks/results/old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+sys.path.append('.')
+sys.path.append('data_analyst_agent')
+sys.path.append('market_research_agent')
+sys.path.append('report_writer')
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import reportlab
+
+import market_research_agent as mra
+from agent import DataAnalystAgent
+from metrics import compute_all_metrics, compute_indicators
+from visualizer import chart_series, generate_all_charts, plot_drawdown, plot_price_with_ma, plot_rsi
+from report_writer_agent import generate_full_report
+from report_generator import generate_pdf_report
+from sentiment import SentimentScorer
+from synthetic import FixtureNews, iter_universe
+
+SUITE_VERSION = 1
+
+CHART_STAGES = {
+    'plot_price_with_ma': plot_price_with_ma,
+    'plot_rsi': plot_rsi,
+    'plot_drawdown': plot_drawdown
+}
+STAGES = ('compute_all_metrics', *CHART_STAGES, 'analyze_market', 'generate_full_report', 'generate_pdf_report')
+
+DEFAULT_HORIZONS = (1, 10, 30)
+DEFAULT_TICKERS = (1, 100, 1000)
+QUICK_HORIZONS = (1, 10)
+QUICK_TICKERS = (1, 10)
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    """Versions and machine the results were measured on."""
+    return {
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'reportlab': reportlab.Version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def _summarize(stage: str, years: int, tickers: int, rows: int, seconds: list) -> dict:
+    times = np.array(seconds) * 1000
+    return {
+        'stage': stage,
+        'horizon_years': years,
+        'tickers': tickers,
+        'rows_per_ticker': rows,
+        'calls': len(times),
+        'total_s': round(float(times.sum()) / 1000, 4),
+        'mean_ms': round(float(times.mean()), 3),
+        'p50_ms': round(float(np.percentile(times, 50)), 3),
+        'p95_ms': round(float(np.percentile(times, 95)), 3),
+        'max_ms': round(float(times.max()), 3)
+    }
+
+
+def run_ticker(ticker, df, stages, timings, news, pdf_dir, chart_mode):
+    """
+    Run the pipeline for one ticker, timing the selected stages.
+
+    Stages that were not selected still run (untimed) when a selected
+    stage needs their output.
+    """
+    def timed(stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        if stage in stages:
+            timings[stage].append(time.perf_counter() - start)
+        return result
+
+    wants_report = 'generate_full_report' in stages or 'generate_pdf_report' in stages
+    start_date = df.index[0].strftime('%Y-%m-%d')
+    end_date = df.index[-1].strftime('%Y-%m-%d')
+    indicators = compute_indicators(df)
+
+    if 'compute_all_metrics' in stages or wants_report:
+        metrics = timed('compute_all_metrics', compute_all_metrics, df, ticker)
+
+    charts = {}
+    for stage, func in CHART_STAGES.items():
+        if stage in stages:
+            charts[stage] = timed(stage, func, df, ticker, output_dir=None, indicators=indicators, in_memory=True)
+
+    if 'analyze_market' in stages or wants_report:
+        market = timed('analyze_market', mra.analyze_market, ticker, start_date, end_date,
+                       cache=news, max_headlines=None)
+        assert market['success'], market.get('error')
+
+    if not wants_report:
+        return
+
+    market_data = mra.to_report_format(market)['market_research']
+    quant_data = DataAnalystAgent(output_dir=None).to_report_format(dict(metrics, success=True))['quant_analysis']
+    timed('generate_full_report', generate_full_report, market_data, quant_data)
+
+    if 'generate_pdf_report' in stages:
+        if chart_mode == 'vector':
+            pdf_charts = chart_series(df, indicators)
+        else:
+            pdf_charts = generate_all_charts(df, ticker, None, indicators=indicators, in_memory=True)
+        path = timed('generate_pdf_report', generate_pdf_report, ticker, start_date, end_date,
+                     market_data, quant_data, output_dir=pdf_dir, charts=pdf_charts)
+        os.remove(path)
+
+
+def run_suite(horizons, ticker_counts, stages=STAGES, chart_mode='vector', headlines_per_year=50, seed=0) -> dict:
+    """
+    Time the selected stages over every (horizon, tickers) case.
+
+    Returns:
+        dict with 'suite', 'environment', 'config' and 'results' (one
+        entry per case and stage)
+    """
+    mra.finnhub_key = mra.finnhub_key or "synthetic"  # fetch_news needs a key; the fixture never calls Finnhub
+    news = FixtureNews(headlines_per_year, seed)
+    pdf_dir = tempfile.mkdtemp()
+
+    # Warm-up: imports, fonts, the PDF template
+    for ticker, df in iter_universe(1, 1, seed + 1):
+        run_ticker(ticker, df, set(STAGES), {stage: [] for stage in STAGES}, news, pdf_dir, chart_mode)
+
+    results = []
+    for years in horizons:
+        for n_tickers in ticker_counts:
+            # Cold sentiment memo per case, so cases don't warm each other up
+            mra.scorer = SentimentScorer(analyzer=mra.scorer.analyzer)
+            timings = {stage: [] for stage in stages}
+            rows = 0
+            start = time.perf_counter()
+            for ticker, df in iter_universe(n_tickers, years, seed):
+                rows = len(df)
+                run_ticker(ticker, df, set(stages), timings, news, pdf_dir, chart_mode)
+            wall = time.perf_counter() - start
+
+            print(f"{years:>3}y x {n_tickers:>4} tickers ({rows} rows each): {wall:.1f}s")
+            for stage in stages:
+                summary = _summarize(stage, years, n_tickers, rows, timings[stage])
+                results.append(summary)
+                print(f"    {stage:<22} total {summary['total_s']:>9.3f}s  mean {summary['mean_ms']:>9.2f}ms  "
+                      f"p95 {summary['p95_ms']:>9.2f}ms")
+
+    return {
+        'suite': SUITE_VERSION,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'config': {
+            'horizons': list(horizons),
+            'tickers': list(ticker_counts),
+            'stages': list(stages),
+            'chart_mode': chart_mode,
+            'headlines_per_year': headlines_per_year,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def compare(baseline: dict, current: dict):
+    """Print mean time per call of each case, baseline vs current."""
+    key = lambda r: (r['stage'], r['horizon_years'], r['tickers'])
+    old = {key(r): r for r in baseline['results']}
+    print(f"\nvs {baseline['environment'].get('commit')} ({baseline['timestamp']}), mean ms per call:")
+    for result in current['results']:
+        before = old.get(key(result))
+        if before is None:
+            continue
+        ratio = result['mean_ms'] / before['mean_ms'] if before['mean_ms'] else float('nan')
+        print(f"    {result['stage']:<22} {result['horizon_years']:>3}y x {result['tickers']:>4}: "
+              f"{before['mean_ms']:>9.2f} -> {result['mean_ms']:>9.2f}  ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FinCrew benchmark suite on synthetic data")
+    parser.add_argument("--horizons", type=int, nargs="+", help="History lengths in years (default: 1 10 30)")
+    parser.add_argument("--tickers", type=int, nargs="+", help="Universe sizes (default: 1 100 1000)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="Stages to time")
+    parser.add_argument("--quick", action="store_true", help="Small grid (1/10 years x 1/10 tickers)")
+    parser.add_argument("--chart-mode", default="vector", choices=("raster", "vector"), help="Charts embedded in the timed PDFs")
+    parser.add_argument("--headlines-per-year", type=int, default=50, help="Synthetic news volume per ticker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/suite-<commit>.json)")
+    parser.add_argument("--compare", metavar="FILE", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    horizons = args.horizons or (QUICK_HORIZONS if args.quick else DEFAULT_HORIZONS)
+    ticker_counts = args.tickers or (QUICK_TICKERS if args.quick else DEFAULT_TICKERS)
+
+    report = run_suite(horizons, ticker_counts, args.stages, args.chart_mode, args.headlines_per_year, args.seed)
+
+    output = args.output or os.path.join('benchmarks', 'results', f"suite-{report['environment']['commit'] or 'unknown'}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
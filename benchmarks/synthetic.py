@@ -0,0 +1,213 @@
+"""
+Synthetic market data and news for offline benchmarks.
+
+Prices follow geometric Brownian motion with Poisson jumps (Merton jump
+diffusion), with open/high/low/volume derived from the daily moves.
+Headlines are Finnhub-shaped company-news items built from bullish,
+bearish and neutral templates. Everything is deterministic for a given
+ticker and seed, so benchmark runs on different versions see the same
+data.
+"""
+
+import zlib
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+END_DATE = "2024-12-31"
+
+
+def ticker_seed(ticker: str, seed: int = 0) -> int:
+    """Stable per-ticker seed (Python's hash() is salted per process)."""
+    return zlib.crc32(f"{seed}:{ticker}".encode())
+
+
+def synthetic_tickers(n: int) -> list:
+    return [f"SYN{i:04d}" for i in range(n)]
+
+
+def make_ohlcv(
+    ticker: str = "SYN0000",
+    years: float = 1.0,
+    seed: int = 0,
+    end_date: str = END_DATE,
+    s0: float = 100.0,
+    mu: float = 0.08,
+    sigma: float = 0.25,
+    jump_intensity: float = 3.0,
+    jump_mean: float = -0.02,
+    jump_std: float = 0.06
+) -> pd.DataFrame:
+    """
+    Daily OHLCV bars shaped like fetch_stock_data's frame.
+
+    Parameters:
+        ticker: Symbol (seeds the path together with seed)
+        years: History length in years of 252 business days
+        seed: Suite-wide seed
+        end_date: Last business day of the history
+        s0: Starting price
+        mu: Annual drift
+        sigma: Annual diffusion volatility
+        jump_intensity: Expected jumps per year
+        jump_mean: Mean log jump size
+        jump_std: Standard deviation of the log jump size
+
+    Returns:
+        DataFrame with lowercase open/high/low/close/volume columns on a
+        business-day DatetimeIndex
+    """
+    n = max(2, int(round(years * TRADING_DAYS)))
+    rng = np.random.default_rng(ticker_seed(ticker, seed))
+    dt = 1 / TRADING_DAYS
+    daily_sigma = sigma * np.sqrt(dt)
+
+    # Compensated drift keeps the expected return at mu despite the jumps
+    k = np.exp(jump_mean + 0.5 * jump_std ** 2) - 1
+    drift = (mu - 0.5 * sigma ** 2 - jump_intensity * k) * dt
+    jumps = rng.poisson(jump_intensity * dt, n)
+    jump_sizes = jumps * jump_mean + np.sqrt(jumps) * jump_std * rng.standard_normal(n)
+    log_returns = drift + daily_sigma * rng.standard_normal(n) + jump_sizes
+    log_returns[0] = 0.0
+    close = s0 * np.exp(np.cumsum(log_returns))
+
+    # Overnight gap, then intraday extremes beyond the open/close range
+    previous = np.concatenate([[s0], close[:-1]])
+    open_ = previous * np.exp(0.25 * daily_sigma * rng.standard_normal(n))
+    high = np.maximum(open_, close) * np.exp(0.5 * daily_sigma * np.abs(rng.standard_normal(n)))
+    low = np.minimum(open_, close) * np.exp(-0.5 * daily_sigma * np.abs(rng.standard_normal(n)))
+    volume = rng.lognormal(np.log(2e6), 0.35, n) * (1 + 20 * np.abs(log_returns))
+
+    index = pd.bdate_range(end=end_date, periods=n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': np.round(volume)
+    }, index=index)
+
+
+def iter_universe(n_tickers: int, years: float = 1.0, seed: int = 0):
+    """
+    Yield (ticker, frame) for a universe of synthetic tickers.
+
+    Frames are generated one at a time, so a 1,000-ticker, 30-year
+    universe never has to fit in memory at once.
+    """
+    for ticker in synthetic_tickers(n_tickers):
+        yield ticker, make_ohlcv(ticker, years, seed)
+
+
+BULLISH = [
+    "{ticker} shares surge {pct:.1f}% after record quarterly profit",
+    "{ticker} beats estimates as revenue growth accelerates",
+    "Analysts upgrade {ticker} on strong demand, raise target to ${price:.0f}",
+    "{ticker} wins major contract, stock jumps {pct:.1f}%",
+    "{ticker} raises full-year guidance on robust {segment} sales"
+]
+BEARISH = [
+    "{ticker} falls {pct:.1f}% as {segment} sales disappoint",
+    "{ticker} faces lawsuit over accounting losses",
+    "{ticker} cuts outlook, warns of weak {segment} demand",
+    "Regulators probe {ticker}; shares slump {pct:.1f}%",
+    "{ticker} misses estimates amid rising costs and layoffs"
+]
+NEUTRAL = [
+    "{ticker} to report {segment} results on {day}",
+    "{ticker} announces board meeting, dividend of ${dividend:.2f} unchanged",
+    "{ticker} files quarterly report with the SEC",
+    "What to watch as {ticker} heads into earnings season",
+    "{ticker} appoints new head of {segment} division"
+]
+SEGMENTS = ["cloud", "consumer", "hardware", "services", "advertising", "retail", "energy", "healthcare"]
+
+
+def make_headlines(ticker: str, from_date: str, to_date: str, count: int, seed: int = 0) -> list:
+    """
+    Finnhub-shaped news items spread uniformly over a date range.
+
+    Parameters:
+        ticker: Symbol (also seeds the items)
+        from_date: Start date 'YYYY-MM-DD'
+        to_date: End date 'YYYY-MM-DD' (inclusive)
+        count: Number of items
+        seed: Suite-wide seed
+
+    Returns:
+        List of dicts with 'id', 'datetime' (Unix seconds), 'headline',
+        'url', 'source' and 'summary', newest first. About 10% of the
+        stories repeat under a second URL, like syndicated wire copy.
+    """
+    rng = np.random.default_rng(ticker_seed(ticker, seed) ^ 0x5EED)
+    start = datetime.fromisoformat(from_date).replace(tzinfo=timezone.utc).timestamp()
+    end = (datetime.fromisoformat(to_date) + timedelta(days=1)).replace(tzinfo=timezone.utc).timestamp() - 1
+    timestamps = np.sort(rng.integers(int(start), int(end), count))[::-1]
+
+    pools = (BULLISH, BEARISH, NEUTRAL)
+    moods = rng.choice(3, count, p=[0.4, 0.3, 0.3])
+    items = []
+    for i, (ts, mood) in enumerate(zip(timestamps.tolist(), moods.tolist())):
+        template = pools[mood][rng.integers(len(pools[mood]))]
+        headline = template.format(
+            ticker=ticker,
+            pct=rng.uniform(1, 12),
+            price=rng.uniform(50, 500),
+            segment=SEGMENTS[rng.integers(len(SEGMENTS))],
+            day=datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%B %d"),
+            dividend=rng.uniform(0.1, 2)
+        )
+        url = f"https://news.example.com/{ticker.lower()}/{ts}-{i}"
+        if items and rng.random() < 0.1:
+            # Syndicated copy of the previous story
+            headline, url = items[-1]['headline'], url + "?syndicated"
+        items.append({
+            'id': ts * 1000 + i,
+            'datetime': ts,
+            'headline': headline,
+            'url': url,
+            'source': "Synthetic Wire",
+            'summary': headline
+        })
+    return items
+
+
+def make_earnings(ticker: str, seed: int = 0) -> list:
+    """Finnhub-shaped earnings history (latest first) for one ticker."""
+    rng = np.random.default_rng(ticker_seed(ticker, seed) ^ 0xEA5)
+    estimate = round(rng.uniform(0.5, 5), 2)
+    actual = round(estimate * rng.uniform(0.85, 1.2), 2)
+    return [{
+        'actual': actual,
+        'estimate': estimate,
+        'surprisePercent': round((actual - estimate) / estimate * 100, 2),
+        'period': "2024-09-30",
+        'symbol': ticker
+    }]
+
+
+class FixtureNews:
+    """
+    Stands in for NewsCache: serves synthetic news and earnings, so
+    analyze_market runs its full path (sampling, scoring, keywords)
+    without network access.
+    """
+
+    def __init__(self, headlines_per_year: int = 50, seed: int = 0):
+        """
+        Parameters:
+            headlines_per_year: News volume per ticker (scales with the range)
+            seed: Suite-wide seed
+        """
+        self.headlines_per_year = headlines_per_year
+        self.seed = seed
+
+    def get_news(self, ticker: str, from_date: str, to_date: str) -> list:
+        days = (date.fromisoformat(to_date) - date.fromisoformat(from_date)).days + 1
+        count = max(1, round(self.headlines_per_year * days / 365.25))
+        return make_headlines(ticker, from_date, to_date, count, self.seed)
+
+    def get_earnings(self, ticker: str) -> list:
+        return make_earnings(ticker, self.seed)
@@ -1,21 +1,53 @@
+import os
+import sys
 from data_fetcher import fetch_stock_data
-from metrics import compute_all_metrics
-from visualizer import generate_all_charts
+from metrics import compute_all_metrics, compute_indicators
+from visualizer import chart_series, generate_all_charts
+
+# Shared utilities live in the repo-level shared/ directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from tracing import annotate, span, traced
 
 class DataAnalystAgent:
     """
     Main agent class that orchestrates data fetching, metrics, and charts.
     """
     
-    def __init__(self, output_dir: str = "outputs"):
+    def __init__(
+        self,
+        output_dir: str = "outputs",
+        cache=None,
+        chart_cache=None,
+        in_memory_charts: bool = False,
+        chart_mode: str = "raster",
+        source=None
+    ):
         """
         Initialize the agent.
         
         Parameters:
-            output_dir: Where to save chart images
+            output_dir: Where to save chart images (None: don't write them)
+            cache: Optional PriceCache so repeat runs only download new bars
+            chart_cache: Optional ChartCache so unchanged charts are not re-rendered
+            in_memory_charts: Return chart artifacts (PNG bytes + dimensions)
+                instead of paths, for direct embedding in the PDF report
+            chart_mode: 'raster' renders PNGs; 'vector' returns the chart
+                series instead so the PDF report draws them as vectors
+            source: DataSource to read prices from (see data_sources;
+                defaults to Yahoo Finance). To cache a remote source, give
+                a PriceCache built with downloader=source.get_prices instead
         """
+        if chart_mode not in ("raster", "vector"):
+            raise ValueError(f"Unknown chart_mode: {chart_mode}")
+        
         self.output_dir = output_dir
+        self.cache = cache
+        self.chart_cache = chart_cache
+        self.in_memory_charts = in_memory_charts
+        self.chart_mode = chart_mode
+        self.source = source
     
+    @traced("DataAnalystAgent.run")
     def run(self, ticker: str, start_date: str, end_date: str) -> dict:
         """
         Run the full analysis pipeline.
@@ -26,10 +58,15 @@ class DataAnalystAgent:
             end_date: Format 'YYYY-MM-DD'
             
         Returns:
-            dict with metrics, chart paths, and status
+            dict with metrics, charts (paths, artifacts or series), and status
         """
+        annotate(ticker=ticker.upper(), start_date=start_date, end_date=end_date, chart_mode=self.chart_mode)
+        
         # Step 1: Fetch data
-        fetch_result = fetch_stock_data(ticker, start_date, end_date)
+        source_name = self.source.name if self.source is not None else "yahoo"
+        with span("fetch_stock_data", ticker=ticker.upper(), source=source_name, cached=self.cache is not None) as step:
+            fetch_result = fetch_stock_data(ticker, start_date, end_date, cache=self.cache, source=self.source)
+            step.set(success=fetch_result['success'])
         
         if not fetch_result['success']:
             return {
@@ -40,11 +77,22 @@ class DataAnalystAgent:
         
         df = fetch_result['data']
         
-        # Step 2: Calculate metrics
-        metrics = compute_all_metrics(df, ticker)
+        # Step 2: Calculate metrics (indicator series are computed once
+        # and shared with the charts)
+        with span("compute_metrics", rows=len(df)):
+            indicators = compute_indicators(df)
+            metrics = compute_all_metrics(df, ticker, indicators)
         
-        # Step 3: Generate charts
-        charts = generate_all_charts(df, ticker, self.output_dir)
+        # Step 3: Generate charts (vector mode skips rendering entirely)
+        if self.chart_mode == "vector":
+            charts = chart_series(df, indicators)
+        else:
+            charts = generate_all_charts(
+                df, ticker, self.output_dir,
+                indicators=indicators,
+                cache=self.chart_cache,
+                in_memory=self.in_memory_charts
+            )
         
         # Step 4: Return combined result
         return {
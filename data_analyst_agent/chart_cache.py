@@ -0,0 +1,187 @@
+"""
+CHART CACHE MODULE
+
+Content-addressed cache for rendered chart images.
+
+A chart's key is a hash of its input series (dates + close prices), the
+chart type and every rendering parameter, so an identical request returns
+the existing PNG without rendering anything, and different date ranges
+for the same ticker never overwrite each other. The directory is
+size-bounded with least-recently-used eviction (file mtime is bumped on
+every hit).
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Bump when the chart drawing code changes so old images are not reused
+CHART_VERSION = 2
+
+
+class ChartCache:
+    """
+    Size-bounded on-disk LRU cache of rendered charts.
+    """
+
+    def __init__(self, cache_dir: str = "chart_cache", max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Parameters:
+            cache_dir: Directory holding the cached images
+            max_bytes: Evict least-recently-used images above this size
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'bytes_written': 0
+        }
+
+    def __getstate__(self):
+        # Locks can't be pickled; worker processes get their own
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def make_key(self, chart_type: str, prices: pd.Series, params: dict) -> str:
+        """
+        Hash the chart inputs into a cache key.
+
+        Parameters:
+            chart_type: e.g. 'price', 'rsi', 'drawdown'
+            prices: Close-price series the chart is derived from
+            params: Every rendering parameter (ticker, size, dpi, windows...)
+
+        Returns:
+            Hex digest identifying the rendered image
+        """
+        digest = hashlib.sha256()
+        header = {'chart_type': chart_type, 'version': CHART_VERSION, 'params': params}
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+        digest.update(np.ascontiguousarray(pd.DatetimeIndex(prices.index).asi8).tobytes())
+        digest.update(np.ascontiguousarray(prices.to_numpy(dtype=float)).tobytes())
+        return digest.hexdigest()
+
+    def lookup(self, chart_type: str, ticker: str, prices: pd.Series, params: dict) -> tuple:
+        """
+        Find the cached image for a chart.
+
+        The image is read here, so a concurrent eviction between the
+        lookup and the caller's use can't turn a hit into a missing file.
+
+        Returns:
+            (filepath, image): where the image is (or should be written),
+            and its PNG bytes on a hit (None on a miss)
+        """
+        key = self.make_key(chart_type, prices, dict(params, ticker=ticker))
+        # Only safe characters from the ticker, so the path stays in cache_dir
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+        filepath = os.path.join(self.cache_dir, f'{safe}_{chart_type}_{key[:20]}.png')
+
+        try:
+            with open(filepath, 'rb') as f:
+                image = f.read()
+        except FileNotFoundError:
+            image = None
+
+        if image is not None:
+            try:
+                # Mark as recently used
+                os.utime(filepath)
+            except OSError:
+                pass
+            with self._lock:
+                self.counters['hits'] += 1
+            return filepath, image
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._lock:
+            self.counters['misses'] += 1
+        return filepath, None
+
+    def store(self, filepath: str):
+        """
+        Record a freshly rendered image and evict old ones if over budget.
+        """
+        size = os.path.getsize(filepath)
+        with self._lock:
+            self.counters['bytes_written'] += size
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            else:
+                self._total_bytes += size
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def merge_counters(self, counters: dict):
+        """
+        Add counters recorded by a copy of this cache (e.g. a pickled copy
+        in a worker process) to this one.
+        """
+        with self._lock:
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            # The copy wrote files this instance has not counted
+            self._total_bytes = None
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current cache size."""
+        with self._lock:
+            stats = dict(self.counters)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+            stats['total_bytes'] = self._scan_total()
+        return stats
+
+    def _entries(self) -> list:
+        """(mtime, size, path) for every cached image."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.png'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Delete least-recently-used images until under max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.counters['evictions'] += 1
+
+        self._total_bytes = total
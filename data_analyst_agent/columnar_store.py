@@ -0,0 +1,349 @@
+"""
+COLUMNAR STORE MODULE
+
+Memory-mapped OHLCV history for a whole universe.
+
+A store is a directory with one flat file per field and a small index:
+
+    meta.json     fields, generation, total rows and every ticker's
+                  (offset, length)
+    dates.<g>.i8  one datetime64[D] per row (the shared date index)
+    close.<g>.f8  one float64 per row, likewise open/high/low/volume
+
+Every write is a new generation <g> of data files; replacing meta.json
+switches readers over to it. Files are never rewritten in place, and
+an open store pins its generation with a pin.<g>.<pid>.<id> file, so a
+write only deletes generations no live reader uses: a reader keeps the
+generation it opened, whatever is written after it.
+
+Each ticker's bars are one contiguous, date-sorted run of rows. A
+date-range read is two binary searches in that ticker's run of dates
+followed by slicing the memory-mapped arrays: no file parsing, no copy
+and no clean_dataframe pass (bars are cleaned once, when the store is
+written). The files are opened read-only with numpy.memmap, so worker
+processes reading the same store share the OS page cache instead of
+each holding its own copy of the history.
+"""
+
+import json
+import os
+import re
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from data_sources import DataSource, _normalize
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+META_FILE = 'meta.json'
+STORE_VERSION = 2
+DATA_FILE = re.compile(r'^(\w+)\.(\d+)\.(i8|f8)$')
+PIN_FILE = re.compile(r'^pin\.(\d+)\.(\d+)\.\w+$')
+# Attempts to open a generation that a writer deleted under us
+OPEN_ATTEMPTS = 3
+
+
+def _data_file(key: str, generation: int) -> str:
+    """File name of one column of a generation ('dates' or a field)."""
+    return f"{key}.{generation}.{'i8' if key == 'dates' else 'f8'}"
+
+
+def _read_meta(directory: str) -> dict:
+    with open(os.path.join(directory, META_FILE)) as f:
+        return json.load(f)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists but belongs to someone else, or can't tell: keep its pin
+    return True
+
+
+def _day(value) -> np.datetime64:
+    """A date string or timestamp as a datetime64[D] search key."""
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+class PriceArrays:
+    """
+    One ticker's bars as read-only column arrays (views into the store).
+
+    Indexing by field name returns the NumPy array, like df['close'] on
+    a DataFrame, so metrics.compute_all_metrics accepts it directly.
+    """
+
+    __slots__ = ('ticker', 'dates', 'columns')
+
+    def __init__(self, ticker: str, dates: np.ndarray, columns: dict):
+        """
+        Parameters:
+            ticker: Symbol
+            dates: datetime64[D] array, sorted
+            columns: dict of field -> float array aligned with dates
+        """
+        self.ticker = ticker
+        self.dates = dates
+        self.columns = columns
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.columns
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.dates) == 0
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.dates.astype('datetime64[ns]'), name='Date')
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy into a DataFrame shaped like clean_dataframe's output."""
+        return pd.DataFrame({field: np.array(values) for field, values in self.columns.items()},
+                            index=self.index)
+
+    def __repr__(self):
+        if self.empty:
+            return f"PriceArrays({self.ticker!r}, 0 rows)"
+        return f"PriceArrays({self.ticker!r}, {len(self)} rows, {self.dates[0]} to {self.dates[-1]})"
+
+
+class ColumnarStore(DataSource):
+    """
+    Read side of a columnar store directory.
+
+    Maps the files of the generation its index names as soon as it is
+    opened and pins that generation until it is closed (or garbage
+    collected), so it keeps reading them after the store is rewritten.
+    Pickles without its memory maps: a store passed to a worker process
+    pins and reopens the same generation there.
+    """
+
+    name = "columnar"
+    remote = False
+
+    def __init__(self, directory: str):
+        """
+        Parameters:
+            directory: Folder written by ColumnarStore.write
+        """
+        self.directory = directory
+        self._maps = None
+        self._pin_path = None
+
+        for attempt in range(OPEN_ATTEMPTS):
+            meta = _read_meta(directory)
+            if meta.get('version') != STORE_VERSION:
+                raise ValueError(f"Unsupported columnar store version: {meta.get('version')}")
+
+            self.fields = tuple(meta['fields'])
+            self.generation = meta['generation']
+            self.rows = meta['rows']
+            self.offsets = {ticker: tuple(span) for ticker, span in meta['tickers'].items()}
+
+            self._pin()
+            try:
+                self._open()
+                return
+            except FileNotFoundError:
+                # Two writes went by between reading the index and pinning
+                self.close()
+                if attempt == OPEN_ATTEMPTS - 1:
+                    raise
+
+    def _pin(self):
+        """Mark this store's generation as in use so writers keep its files."""
+        path = os.path.join(self.directory, f"pin.{self.generation}.{os.getpid()}.{uuid.uuid4().hex}")
+        open(path, 'w').close()
+        self._pin_path = path
+
+    def close(self):
+        """Drop the memory maps and the pin; the generation may then be deleted."""
+        self._maps = None
+        if self._pin_path is not None:
+            try:
+                os.remove(self._pin_path)
+            except OSError:
+                pass
+            self._pin_path = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass  # interpreter shutdown
+
+    @staticmethod
+    def is_store(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, META_FILE))
+
+    @classmethod
+    def write(cls, directory: str, frames, fields: tuple = FIELDS) -> 'ColumnarStore':
+        """
+        Write a store from per-ticker frames, one ticker at a time.
+
+        Frames are cleaned here once; they are streamed to disk, so
+        frames can be a generator over a universe that does not fit in
+        memory. An existing store in the directory is replaced; readers
+        that already opened it keep seeing the old generation. Files of
+        generations older than the previous one are deleted unless an
+        open store pins them.
+
+        Parameters:
+            directory: Output folder (created if missing)
+            frames: dict or iterable of (ticker, OHLCV DataFrame)
+            fields: Columns to store (missing ones are stored as NaN)
+
+        Returns:
+            ColumnarStore opened on the new files
+        """
+        os.makedirs(directory, exist_ok=True)
+        items = frames.items() if isinstance(frames, dict) else frames
+        previous = _read_meta(directory).get('generation', 0) if cls.is_store(directory) else 0
+        generation = previous + 1
+
+        offsets = {}
+        rows = 0
+        handles = {key: open(os.path.join(directory, _data_file(key, generation)), 'wb')
+                   for key in ('dates',) + tuple(fields)}
+        try:
+            for ticker, df in items:
+                ticker = ticker.upper()
+                if ticker in offsets:
+                    raise ValueError(f"Duplicate ticker: {ticker}")
+                df = _normalize(df.copy())
+                if df.empty:
+                    continue
+
+                df.index.values.astype('datetime64[D]').astype('<i8').tofile(handles['dates'])
+                for field in fields:
+                    if field in df:
+                        values = df[field].to_numpy(dtype='<f8')
+                    else:
+                        values = np.full(len(df), np.nan)
+                    values.tofile(handles[field])
+
+                offsets[ticker] = (rows, len(df))
+                rows += len(df)
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        # The index goes last: it is what makes the new generation visible
+        meta = {'version': STORE_VERSION, 'fields': list(fields), 'generation': generation,
+                'rows': rows, 'tickers': offsets}
+        meta_path = os.path.join(directory, META_FILE)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+        cls._remove_generations(directory, keep=previous)
+        return cls(directory)
+
+    @staticmethod
+    def _remove_generations(directory: str, keep: int):
+        """
+        Delete data files older than generation keep that no live reader pins.
+
+        The previous generation also stays for readers that read its index
+        but have not pinned it yet. Pins of processes that have exited are
+        removed.
+        """
+        names = os.listdir(directory)
+        pinned = set()
+        for name in names:
+            match = PIN_FILE.match(name)
+            if not match:
+                continue
+            if _pid_alive(int(match.group(2))):
+                pinned.add(int(match.group(1)))
+            else:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+        for name in names:
+            match = DATA_FILE.match(name)
+            if match and int(match.group(2)) < keep and int(match.group(2)) not in pinned:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass  # still mapped on a platform that forbids deleting it
+
+    def _open(self) -> dict:
+        if self._maps is None:
+            maps = {}
+            for key, dtype in [('dates', '<i8')] + [(f, '<f8') for f in self.fields]:
+                if self.rows == 0:
+                    # np.memmap cannot map an empty file
+                    maps[key] = np.empty(0, dtype=dtype)
+                else:
+                    path = os.path.join(self.directory, _data_file(key, self.generation))
+                    maps[key] = np.memmap(path, dtype=dtype, mode='r', shape=(self.rows,))
+            maps['dates'] = maps['dates'].view('datetime64[D]')
+            self._maps = maps
+        return self._maps
+
+    def get_arrays(self, ticker: str, start_date: str = None, end_date: str = None) -> PriceArrays:
+        """
+        Zero-copy range read of one ticker.
+
+        Parameters:
+            ticker: Symbol
+            start_date: First date included (default: start of history)
+            end_date: First date excluded (default: end of history)
+
+        Returns:
+            PriceArrays of views into the memory maps (empty if the
+            ticker is not in the store or has no bars in the range)
+        """
+        maps = self._open()
+        offset, length = self.offsets.get(ticker.upper(), (0, 0))
+        dates = maps['dates'][offset:offset + length]
+
+        i = np.searchsorted(dates, _day(start_date), side='left') if start_date else 0
+        j = np.searchsorted(dates, _day(end_date), side='left') if end_date else length
+        columns = {field: maps[field][offset + i:offset + j] for field in self.fields}
+        return PriceArrays(ticker.upper(), dates[i:j], columns)
+
+    def iter_arrays(self, start_date: str = None, end_date: str = None, tickers: list = None):
+        """Yield PriceArrays for every ticker (or the given ones) with bars in the range."""
+        for ticker in tickers if tickers is not None else self.tickers():
+            arrays = self.get_arrays(ticker, start_date, end_date)
+            if not arrays.empty:
+                yield arrays
+
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        arrays = self.get_arrays(ticker, start_date, end_date)
+        if arrays.empty:
+            return pd.DataFrame()
+        return arrays.to_frame()
+
+    def tickers(self) -> list:
+        return sorted(self.offsets)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_maps'] = None
+        state['_pin_path'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Pinned here as well, so the copy outlives the store it came from
+        self._pin()
+
+    def __repr__(self):
+        return (f"ColumnarStore({self.directory!r}, generation {self.generation}, "
+                f"{len(self.offsets)} tickers, {self.rows} rows)")
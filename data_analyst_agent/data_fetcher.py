@@ -1,7 +1,15 @@
+import os
+import sys
+import warnings
 import yfinance as yf
+from yfinance.exceptions import YFException
 import pandas as pd
 from datetime import datetime
 
+# Shared utilities live in the repo-level shared/ directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from resilience import get_provider
+
 
 def validate_inputs(ticker: str, start_date: str, end_date: str) -> str:
     """
@@ -62,7 +70,86 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def fetch_stock_data(ticker: str, start_date: str, end_date: str) -> dict:
+def _failed_result(metadata: dict) -> dict:
+    """Build the standard failure result for a fetch."""
+    return {
+        'data': pd.DataFrame(),
+        'metadata': metadata,
+        'success': False
+    }
+
+
+def _success_result(df: pd.DataFrame, metadata: dict) -> dict:
+    """Fill in the date-range metadata and build the standard success result."""
+    metadata['actual_start'] = df.index.min().strftime('%Y-%m-%d')
+    metadata['actual_end'] = df.index.max().strftime('%Y-%m-%d')
+    metadata['trading_days'] = len(df)
+    
+    return {
+        'data': df,
+        'metadata': metadata,
+        'success': True
+    }
+
+
+def _new_metadata(ticker: str, start_date: str, end_date: str) -> dict:
+    """Metadata dict shared by single and bulk fetches."""
+    return {
+        'ticker': ticker.upper(),
+        'requested_start': start_date,
+        'requested_end': end_date,
+        'fetch_time': datetime.now().isoformat(),
+        'errors': []
+    }
+
+
+def _yahoo_history(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    One ticker's daily bars, shaped like yf.download's output.
+    
+    yf.download catches and only logs per-ticker errors, so a network
+    failure looks like an empty result. Ticker.history with raise_errors
+    raises instead, which is what lets the provider retry it.
+    """
+    with warnings.catch_warnings():
+        # Newer yfinance deprecates raise_errors in favour of a global switch
+        warnings.simplefilter('ignore', DeprecationWarning)
+        df = yf.Ticker(ticker).history(
+            start=start_date,
+            end=end_date,
+            auto_adjust=True,
+            actions=False,
+            raise_errors=True
+        )
+    
+    # yf.download drops the exchange timezone from daily bars
+    if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    return df
+
+
+def download_prices(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Download one ticker from Yahoo Finance and return the cleaned frame.
+    
+    end_date is exclusive, as in yf.download. Rate limited and retried
+    through the shared 'yahoo' provider: network and rate-limit errors
+    are retried and count towards its breaker, and raise once retries
+    run out. An unknown symbol or a range without bars returns an
+    empty frame.
+    """
+    provider = get_provider("yahoo")
+    try:
+        df = provider.call(_yahoo_history, ticker.upper(), start_date, end_date)
+    except YFException as e:
+        if provider.retryable(e):
+            raise
+        return pd.DataFrame()
+    
+    return clean_dataframe(df)
+
+
+def fetch_stock_data(ticker: str, start_date: str, end_date: str, cache=None, source=None) -> dict:
     """
     Fetch stock data from Yahoo Finance.
     
@@ -74,6 +161,13 @@ def fetch_stock_data(ticker: str, start_date: str, end_date: str) -> dict:
         Format: 'YYYY-MM-DD'
     end_date : str
         Format: 'YYYY-MM-DD'
+    cache : PriceCache, optional
+        Serve the range from a local price cache, downloading only
+        the spans it does not cover yet
+    source : DataSource, optional
+        Provider to read the bars from instead of Yahoo Finance (see
+        data_sources); ignored when a cache is given, which has its
+        own downloader
     
     Returns:
     --------
@@ -83,60 +177,189 @@ def fetch_stock_data(ticker: str, start_date: str, end_date: str) -> dict:
         - 'success': bool
     """
     
-    metadata = {
-        'ticker': ticker.upper(),
-        'requested_start': start_date,
-        'requested_end': end_date,
-        'fetch_time': datetime.now().isoformat(),
-        'errors': []
-    }
+    metadata = _new_metadata(ticker, start_date, end_date)
     
     # Step 2: Validate inputs
     validation_error = validate_inputs(ticker, start_date, end_date)
     if validation_error:
         metadata['errors'].append(validation_error)
-        return {
-            'data': pd.DataFrame(),
-            'metadata': metadata,
-            'success': False
-        }
+        return _failed_result(metadata)
     
-    # Step 3: Fetch data from Yahoo Finance
+    # Step 3: Fetch data from Yahoo Finance (or the local cache / data source)
     try:
-        df = yf.download(
-            tickers=ticker.upper(),
-            start=start_date,
-            end=end_date,
-            progress=False
-        )
-
-        df = clean_dataframe(df)
+        if cache is not None:
+            df = cache.get(ticker.upper(), start_date, end_date)
+        elif source is not None:
+            df = source.get_prices(ticker.upper(), start_date, end_date)
+        else:
+            df = download_prices(ticker, start_date, end_date)
         
         # Check if we got any data
         if df.empty:
             metadata['errors'].append(f"No data found for {ticker}")
-            return {
-                'data': pd.DataFrame(),
-                'metadata': metadata,
-                'success': False
-            }
+            return _failed_result(metadata)
             
     except Exception as e:
         metadata['errors'].append(f"Fetch failed: {str(e)}")
-        return {
-            'data': pd.DataFrame(),
-            'metadata': metadata,
-            'success': False
-        }
+        return _failed_result(metadata)
     
     # Step 4: Add metadata and return
-    metadata['actual_start'] = df.index.min().strftime('%Y-%m-%d')
-    metadata['actual_end'] = df.index.max().strftime('%Y-%m-%d')
-    metadata['trading_days'] = len(df)
+    return _success_result(df, metadata)
+
+
+def download_bulk(tickers: list, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Download several tickers from Yahoo Finance in one batched request.
     
-    return {
-        'data': df,
-        'metadata': metadata,
-        'success': True
-    }
+    Returns the raw yfinance frame with (ticker, field) MultiIndex columns.
+    Rate limited and retried through the shared 'yahoo' provider.
+    """
+    return get_provider("yahoo").call(
+        yf.download,
+        tickers=tickers,
+        start=start_date,
+        end=end_date,
+        group_by='ticker',
+        threads=True,
+        progress=False
+    )
+
+
+def split_bulk_frame(raw: pd.DataFrame, tickers: list) -> dict:
+    """
+    Split a batched download into one clean DataFrame per ticker.
+    
+    Parameters:
+        raw: Frame with (ticker, field) MultiIndex columns
+        tickers: Symbols that were requested in this batch
+        
+    Returns:
+        dict of ticker -> cleaned DataFrame (empty if the ticker is missing)
+    """
+    frames = {}
+    
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # yfinance may return flat columns when the batch has one symbol
+        if len(tickers) == 1 and not raw.empty:
+            frames[tickers[0]] = clean_dataframe(raw)
+        return frames
+    
+    available = set(raw.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker in available:
+            frames[ticker] = clean_dataframe(raw[ticker])
+    
+    return frames
+
+
+def download_many(tickers: list, start_date: str, end_date: str, errors: dict = None) -> dict:
+    """
+    Download several tickers in one batch, split into clean frames.
+    
+    The batched request only logs per-ticker errors, so tickers it
+    returned empty are downloaded again one at a time through
+    download_prices, where failures are retried and reach the breaker.
+    A refetch that still fails only drops its own ticker.
+    
+    Parameters:
+        tickers: Symbols to download
+        start_date: Format 'YYYY-MM-DD'
+        end_date: Format 'YYYY-MM-DD' (exclusive)
+        errors: Optional dict filled with ticker -> exception for the
+            tickers whose refetch failed
+    
+    Returns:
+        dict of ticker -> cleaned DataFrame (empty if Yahoo has no bars;
+        missing if the refetch failed)
+    """
+    frames = split_bulk_frame(download_bulk(tickers, start_date, end_date), tickers)
+    for ticker in tickers:
+        if ticker not in frames or frames[ticker].empty:
+            try:
+                frames[ticker] = download_prices(ticker, start_date, end_date)
+            except Exception as e:
+                frames.pop(ticker, None)
+                if errors is not None:
+                    errors[ticker] = e
+    
+    return frames
+
 
+def fetch_stocks_bulk(
+    tickers: list,
+    start_date: str,
+    end_date: str,
+    chunk_size: int = 100,
+    downloader=None,
+    source=None
+) -> dict:
+    """
+    Fetch stock data for many tickers with batched Yahoo Finance requests.
+    
+    Parameters:
+    -----------
+    tickers : list
+        Stock symbols (e.g., ['AAPL', 'MSFT'])
+    start_date : str
+        Format: 'YYYY-MM-DD'
+    end_date : str
+        Format: 'YYYY-MM-DD'
+    chunk_size : int
+        Maximum number of symbols per download request
+    downloader : callable, optional
+        Function (tickers, start_date, end_date) -> raw MultiIndex frame.
+        Defaults to download_many; pass a stub to run offline.
+    source : DataSource, optional
+        Provider answering each chunk with get_prices_many instead of
+        the downloader (see data_sources)
+    
+    Returns:
+    --------
+    dict of ticker -> result, each result shaped like fetch_stock_data's
+    """
+    results = {}
+    pending = []
+    
+    # Step 1: Validate every ticker up front so bad symbols never hit the network
+    for ticker in tickers:
+        symbol = ticker.upper() if isinstance(ticker, str) else ticker
+        metadata = _new_metadata(str(ticker), start_date, end_date)
+        validation_error = validate_inputs(ticker, start_date, end_date)
+        if validation_error:
+            metadata['errors'].append(validation_error)
+            results[symbol] = _failed_result(metadata)
+        elif symbol not in results:
+            results[symbol] = metadata
+            pending.append(symbol)
+    
+    # Step 2: Download in chunks and split each chunk per ticker
+    for i in range(0, len(pending), chunk_size):
+        chunk = pending[i:i + chunk_size]
+        chunk_errors = {}
+        
+        try:
+            if source is not None:
+                frames = source.get_prices_many(chunk, start_date, end_date)
+            elif downloader is not None:
+                frames = split_bulk_frame(downloader(chunk, start_date, end_date), chunk)
+            else:
+                frames = download_many(chunk, start_date, end_date, errors=chunk_errors)
+        except Exception as e:
+            for symbol in chunk:
+                results[symbol]['errors'].append(f"Fetch failed: {str(e)}")
+                results[symbol] = _failed_result(results[symbol])
+            continue
+        
+        for symbol in chunk:
+            metadata = results[symbol]
+            df = frames.get(symbol)
+            if symbol in chunk_errors:
+                metadata['errors'].append(f"Fetch failed: {str(chunk_errors[symbol])}")
+                results[symbol] = _failed_result(metadata)
+            elif df is None or df.empty:
+                metadata['errors'].append(f"No data found for {symbol}")
+                results[symbol] = _failed_result(metadata)
+            else:
+                results[symbol] = _success_result(df, metadata)
+    
+    return results
@@ -0,0 +1,252 @@
+"""
+DATA SOURCES MODULE
+
+Pluggable market data providers for the Data Analyst Agent.
+
+A DataSource answers range queries for daily OHLCV bars, one ticker at
+a time (get_prices) or in batches (get_prices_many), and always returns
+frames shaped like clean_dataframe's output: lowercase columns, sorted
+DatetimeIndex, no missing rows. Date ranges are [start_date, end_date),
+end exclusive as in yf.download.
+
+Providers:
+- YahooSource: yfinance downloads (rate limited, batched for many tickers)
+- LocalDirectorySource: one CSV or Parquet file per ticker in a
+  directory, e.g. an export of an internal price store; no network
+- InMemorySource: frames already in memory (tests, benchmarks, notebooks)
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from data_fetcher import clean_dataframe, download_many, download_prices
+
+
+def _slice_range(df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    """Rows of a sorted frame in [start_date, end_date), as a positional slice (no copy)."""
+    if df.empty:
+        return df
+    i = df.index.searchsorted(pd.Timestamp(start_date), side='left')
+    j = df.index.searchsorted(pd.Timestamp(end_date), side='left')
+    return df.iloc[i:j]
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bring a stored frame into clean_dataframe's shape.
+
+    Accepts a date index or a 'date' column, any column case, and
+    timezone-aware timestamps (converted to naive dates).
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        date_column = next((c for c in df.columns if str(c).lower() in ('date', 'datetime', 'timestamp')), None)
+        if date_column is not None:
+            df = df.set_index(date_column)
+        df.index = pd.to_datetime(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    df.index.name = 'Date'
+    return clean_dataframe(df)
+
+
+class DataSource:
+    """
+    Base class of the market data providers.
+
+    Subclasses implement get_prices; get_prices_many loops over it
+    unless a provider can batch requests.
+    """
+
+    name = "base"
+
+    # Remote sources are worth putting behind a PriceCache; local ones
+    # already serve at disk speed
+    remote = False
+
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Daily OHLCV bars of one ticker for [start_date, end_date).
+
+        Returns:
+            Cleaned DataFrame (empty if the ticker has no data)
+        """
+        raise NotImplementedError
+
+    def get_prices_many(self, tickers: list, start_date: str, end_date: str) -> dict:
+        """
+        Batch range query.
+
+        Returns:
+            dict of ticker -> cleaned DataFrame, for the tickers that have
+            data in the range
+        """
+        frames = {}
+        for ticker in tickers:
+            df = self.get_prices(ticker, start_date, end_date)
+            if not df.empty:
+                frames[ticker] = df
+        return frames
+
+    def tickers(self) -> list:
+        """Symbols this source can serve (if it can list them)."""
+        raise NotImplementedError(f"{type(self).__name__} cannot list its tickers")
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class YahooSource(DataSource):
+    """Yahoo Finance through yfinance (the default)."""
+
+    name = "yahoo"
+    remote = True
+
+    def __init__(self, chunk_size: int = 100):
+        """
+        Parameters:
+            chunk_size: Most symbols per batched download
+        """
+        self.chunk_size = chunk_size
+
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return download_prices(ticker, start_date, end_date)
+
+    def get_prices_many(self, tickers: list, start_date: str, end_date: str) -> dict:
+        frames = {}
+        for i in range(0, len(tickers), self.chunk_size):
+            chunk = tickers[i:i + self.chunk_size]
+            frames.update(download_many(chunk, start_date, end_date))
+        return {ticker: df for ticker, df in frames.items() if not df.empty}
+
+
+class LocalDirectorySource(DataSource):
+    """
+    One price file per ticker in a local directory.
+
+    Files are named <TICKER>.parquet or <TICKER>.csv (Parquet wins when
+    both exist). Columns may be in any case; the dates are the index or
+    a 'date' column. Loaded files are kept in memory and reloaded when
+    they change on disk.
+    """
+
+    name = "local"
+    remote = False
+    EXTENSIONS = ('.parquet', '.csv')
+
+    def __init__(self, directory: str, memoize: bool = True, max_workers: int = 8):
+        """
+        Parameters:
+            directory: Folder holding the price files
+            memoize: Keep loaded frames in memory (keyed by file mtime)
+            max_workers: Threads reading files in get_prices_many
+        """
+        self.directory = directory
+        self.memoize = memoize
+        self.max_workers = max_workers
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return _slice_range(self._load(ticker.upper()), start_date, end_date)
+
+    def get_prices_many(self, tickers: list, start_date: str, end_date: str) -> dict:
+        # Parquet and CSV parsing release the GIL for most of the work
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            frames = pool.map(lambda t: self.get_prices(t, start_date, end_date), tickers)
+            return {ticker: df for ticker, df in zip(tickers, frames) if not df.empty}
+
+    def tickers(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        names = {os.path.splitext(name)[0] for name in os.listdir(self.directory)
+                 if name.endswith(self.EXTENSIONS)}
+        return sorted(names)
+
+    def path_for(self, ticker: str, extension: str) -> str:
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', ticker.upper())
+        return os.path.join(self.directory, safe + extension)
+
+    def save(self, ticker: str, df: pd.DataFrame, file_format: str = 'parquet') -> str:
+        """
+        Write one ticker's bars (e.g. to prepare an offline directory).
+
+        Parameters:
+            file_format: 'parquet' or 'csv'
+
+        Returns:
+            Path of the written file
+        """
+        if file_format not in ('parquet', 'csv'):
+            raise ValueError(f"Unknown file_format: {file_format}")
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(ticker, '.' + file_format)
+        df = _normalize(df.copy())
+        if file_format == 'parquet':
+            df.to_parquet(path)
+        else:
+            df.to_csv(path)
+        return path
+
+    def _load(self, ticker: str) -> pd.DataFrame:
+        for extension in self.EXTENSIONS:
+            path = self.path_for(ticker, extension)
+            if os.path.exists(path):
+                break
+        else:
+            return pd.DataFrame()
+
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._frames.get(ticker)
+        if cached is not None and cached[0] == (path, mtime):
+            return cached[1]
+
+        if extension == '.parquet':
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+        df = _normalize(df)
+
+        if self.memoize:
+            with self._lock:
+                self._frames[ticker] = ((path, mtime), df)
+        return df
+
+    def __repr__(self):
+        return f"LocalDirectorySource({self.directory!r})"
+
+
+class InMemorySource(DataSource):
+    """Frames held in memory, e.g. synthetic data for tests and benchmarks."""
+
+    name = "memory"
+    remote = False
+
+    def __init__(self, frames: dict = None):
+        """
+        Parameters:
+            frames: dict of ticker -> OHLCV DataFrame (cleaned on the way in)
+        """
+        self._frames = {}
+        for ticker, df in (frames or {}).items():
+            self.add(ticker, df)
+
+    def add(self, ticker: str, df: pd.DataFrame):
+        """Add or replace one ticker's bars."""
+        self._frames[ticker.upper()] = _normalize(df.copy())
+
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        df = self._frames.get(ticker.upper())
+        if df is None:
+            return pd.DataFrame()
+        return _slice_range(df, start_date, end_date)
+
+    def tickers(self) -> list:
+        return sorted(self._frames)
+
+    def __repr__(self):
+        return f"InMemorySource({len(self._frames)} tickers)"
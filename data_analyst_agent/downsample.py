@@ -0,0 +1,87 @@
+"""
+DOWNSAMPLE MODULE
+
+Shape-preserving downsampling for long chart histories.
+
+Min/max bucketing: the series is cut into one bucket per couple of
+output pixels and only each bucket's lowest and highest point is kept
+(plus the first and last point). Every local extreme that could be
+visible at the target resolution survives, so price highs/lows and
+drawdown troughs are drawn exactly, while matplotlib only has to path a
+number of points proportional to the figure width.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def point_budget(figsize: tuple, dpi: int) -> int:
+    """
+    Number of points worth drawing on a figure.
+
+    One min/max pair per two horizontal pixels, i.e. one point per pixel.
+    """
+    return max(int(figsize[0] * dpi), 2)
+
+
+def minmax_indices(series: list, max_points: int) -> np.ndarray:
+    """
+    Positions to keep so every series keeps its per-bucket min and max.
+
+    Every series is drawn at the kept positions, so the union of all
+    their extremes plus both endpoints stays within max_points.
+
+    Parameters:
+        series: Equal-length arrays sharing one x axis
+        max_points: Point budget per series (at least 2)
+
+    Returns:
+        Sorted unique positions (all positions if already within budget)
+    """
+    n = len(series[0])
+    max_points = max(max_points, 2)
+    if n <= max_points:
+        return np.arange(n)
+
+    # Room for the two endpoints, then one min and one max per bucket per series
+    n_buckets = (max_points - 2) // (2 * len(series))
+    if n_buckets == 0:
+        # Too small a budget for min/max pairs: evenly spaced points
+        return np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    pad = n_buckets * size - n
+    offsets = np.arange(n_buckets) * size
+
+    keep = [np.array([0, n - 1])]
+    for values in series:
+        values = np.asarray(values, dtype=float)
+        missing = np.isnan(values)
+
+        lows = np.pad(np.where(missing, np.inf, values), (0, pad), constant_values=np.inf)
+        highs = np.pad(np.where(missing, -np.inf, values), (0, pad), constant_values=-np.inf)
+
+        keep.append(offsets + lows.reshape(n_buckets, size).argmin(axis=1))
+        keep.append(offsets + highs.reshape(n_buckets, size).argmax(axis=1))
+
+    return np.unique(np.minimum(np.concatenate(keep), n - 1))
+
+
+def downsample(index: pd.Index, series: dict, max_points: int) -> tuple:
+    """
+    Downsample several series that share an index.
+
+    Parameters:
+        index: x values (e.g. the DatetimeIndex of the price frame)
+        series: dict of name -> array-like aligned with index
+        max_points: Point budget per series (0 or None disables)
+
+    Returns:
+        (index, series) with the same keys, reduced to the kept positions
+    """
+    values = {name: np.asarray(s, dtype=float) for name, s in series.items()}
+    if not max_points or len(index) <= max_points:
+        return index, values
+
+    keep = minmax_indices(list(values.values()), max_points)
+    return index[keep], {name: v[keep] for name, v in values.items()}
@@ -4,11 +4,27 @@ METRICS CALCULATOR MODULE
 Layer 2 of the Data Analyst Agent
 
 Takes stock price data and computes financial metrics.
+
+The summary metrics (total return, volatility, max drawdown and
+compute_all_metrics) also accept column arrays instead of a DataFrame,
+e.g. a columnar_store.PriceArrays read straight from memory-mapped
+files: anything with a 'close' array and a matching date index.
 """
 
 import pandas as pd
 import numpy as np
 
+from panel_metrics import compute_panel_metrics, panel_max_drawdown, panel_total_return, panel_volatility
+
+# Default RSI lookback; compute_indicators names its column rsi_{period}
+RSI_PERIOD = 14
+
+
+def _is_arrays(df) -> bool:
+    """True for column arrays (such as PriceArrays) rather than a DataFrame."""
+    return not isinstance(df, pd.DataFrame)
+
+
 def calculate_daily_returns(df: pd.DataFrame) -> pd.Series:
     """
     Calculate daily percentage returns.
@@ -33,6 +49,9 @@ def calculate_volatility(df: pd.DataFrame, annualize: bool = True) -> float:
     Returns:
         Volatility as a decimal (e.g., 0.25 = 25%)
     """
+    if _is_arrays(df):
+        return float(panel_volatility(df['close'], annualize)[0])
+    
     returns = calculate_daily_returns(df)
     daily_vol = returns.std()
     
@@ -52,15 +71,16 @@ def calculate_moving_averages(df: pd.DataFrame, windows: list = [20, 50]) -> pd.
     Returns:
         DataFrame with SMA and EMA columns
     """
-    result = pd.DataFrame(index=df.index)
+    columns = {}
     
     for window in windows:
-        result[f'sma_{window}'] = df['close'].rolling(window=window).mean()
-        result[f'ema_{window}'] = df['close'].ewm(span=window, adjust=False).mean()
+        columns[f'sma_{window}'] = df['close'].rolling(window=window).mean()
+        columns[f'ema_{window}'] = df['close'].ewm(span=window, adjust=False).mean()
     
-    return result
+    # Build the frame once instead of inserting column by column
+    return pd.DataFrame(columns, index=df.index)
 
-def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
+def calculate_rsi(df: pd.DataFrame, period: int = RSI_PERIOD) -> pd.Series:
     """
     Calculate Relative Strength Index (RSI).
     
@@ -88,15 +108,15 @@ def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
     
     return rsi
 
-def calculate_max_drawdown(df: pd.DataFrame) -> dict:
+def calculate_drawdown_series(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Calculate maximum drawdown (worst peak-to-trough decline).
+    Calculate the running peak and drawdown at every date.
     
     Parameters:
         df: DataFrame with 'close' column
         
     Returns:
-        dict with max_drawdown, peak_date, trough_date
+        DataFrame with 'running_max' and 'drawdown' (as decimals) columns
     """
     prices = df['close']
     
@@ -106,6 +126,11 @@ def calculate_max_drawdown(df: pd.DataFrame) -> dict:
     # Drawdown at each point (current price vs peak)
     drawdown = (prices - running_max) / running_max
     
+    return pd.DataFrame({'running_max': running_max, 'drawdown': drawdown})
+
+
+def _summarize_drawdown(prices: pd.Series, drawdown: pd.Series) -> dict:
+    """Find the worst drawdown and the peak/trough dates around it."""
     # Find the worst drawdown
     max_drawdown = drawdown.min()
     trough_date = drawdown.idxmin()
@@ -119,6 +144,28 @@ def calculate_max_drawdown(df: pd.DataFrame) -> dict:
         'trough_date': trough_date.strftime('%Y-%m-%d')
     }
 
+
+def calculate_max_drawdown(df: pd.DataFrame) -> dict:
+    """
+    Calculate maximum drawdown (worst peak-to-trough decline).
+    
+    Parameters:
+        df: DataFrame with 'close' column
+        
+    Returns:
+        dict with max_drawdown, peak_date, trough_date
+    """
+    if _is_arrays(df):
+        result = panel_max_drawdown(df['close'], df.index)
+        return {
+            'max_drawdown': float(result['max_drawdown'][0]),
+            'peak_date': result['peak_date'][0],
+            'trough_date': result['trough_date'][0]
+        }
+    
+    drawdown = calculate_drawdown_series(df)['drawdown']
+    return _summarize_drawdown(df['close'], drawdown)
+
 def calculate_total_return(df: pd.DataFrame) -> float:
     """
     Calculate total return over the period.
@@ -129,27 +176,86 @@ def calculate_total_return(df: pd.DataFrame) -> float:
     Returns:
         Total return as decimal (e.g., 0.35 = 35%)
     """
+    if _is_arrays(df):
+        return float(panel_total_return(df['close'])[0])
+    
     start_price = df['close'].iloc[0]
     end_price = df['close'].iloc[-1]
     
     return (end_price - start_price) / start_price
 
 
-def compute_all_metrics(df: pd.DataFrame, ticker: str) -> dict:
+def compute_indicators(df: pd.DataFrame, windows: list = [20, 50], rsi_period: int = RSI_PERIOD) -> pd.DataFrame:
+    """
+    Compute every per-date indicator series once (the "IndicatorFrame").
+    
+    Both compute_all_metrics and the visualizer read from this frame
+    instead of recomputing returns, moving averages, RSI and drawdown.
+    
+    Parameters:
+        df: DataFrame with 'close' column
+        windows: Moving average windows
+        rsi_period: RSI lookback period
+        
+    Returns:
+        DataFrame indexed like df with columns: close, returns,
+        sma_{w}/ema_{w} per window, rsi_{rsi_period}, running_max, drawdown
+    """
+    columns = {
+        'close': df['close'],
+        'returns': calculate_daily_returns(df)
+    }
+    columns.update(calculate_moving_averages(df, windows).items())
+    columns[f'rsi_{rsi_period}'] = calculate_rsi(df, rsi_period)
+    columns.update(calculate_drawdown_series(df).items())
+    
+    # Build the frame once; every column already shares df's index
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _no_data_result(ticker: str) -> dict:
+    """compute_all_metrics' result for a ticker without any bars."""
+    return {
+        'ticker': ticker.upper(),
+        'period': {'start': None, 'end': None, 'trading_days': 0},
+        'metrics': {},
+        'errors': [f"No price data for {ticker.upper()}"]
+    }
+
+
+def compute_all_metrics(df: pd.DataFrame, ticker: str, indicators: pd.DataFrame = None) -> dict:
     """
     Compute all financial metrics for a stock.
     
     This is the MAIN function that other agents will call.
     
     Parameters:
-        df: DataFrame with OHLCV data
+        df: DataFrame with OHLCV data, or column arrays such as a
+            columnar_store.PriceArrays (computed with the NumPy kernels
+            of panel_metrics, without building a DataFrame)
         ticker: Stock symbol (for labeling)
+        indicators: Precomputed frame from compute_indicators (computed
+            here if omitted; unused for arrays)
         
     Returns:
-        dict with all metrics in structured format
+        dict with all metrics in structured format (empty metrics and
+        an 'errors' list when there are no bars)
     """
-    drawdown = calculate_max_drawdown(df)
-    rsi = calculate_rsi(df)
+    if len(df) == 0:
+        return _no_data_result(ticker)
+    
+    if _is_arrays(df):
+        # The panel leaves out a ticker without a single valid close
+        result = compute_panel_metrics(df['close'], [ticker], df.index).get(ticker)
+        return result if result is not None else _no_data_result(ticker)
+    
+    if indicators is None:
+        indicators = compute_indicators(df)
+    
+    returns = indicators['returns']
+    drawdown = _summarize_drawdown(indicators['close'], indicators['drawdown'])
+    rsi_column = f'rsi_{RSI_PERIOD}'
+    rsi = indicators[rsi_column] if rsi_column in indicators else calculate_rsi(df, RSI_PERIOD)
     
     return {
         'ticker': ticker.upper(),
@@ -160,11 +266,11 @@ def compute_all_metrics(df: pd.DataFrame, ticker: str) -> dict:
         },
         'metrics': {
             'total_return': round(calculate_total_return(df), 4),
-            'volatility_annual': round(calculate_volatility(df), 4),
+            'volatility_annual': round(returns.std() * np.sqrt(252), 4),
             'max_drawdown': round(drawdown['max_drawdown'], 4),
             'drawdown_peak_date': drawdown['peak_date'],
             'drawdown_trough_date': drawdown['trough_date'],
             'rsi_current': round(rsi.iloc[-1], 2),
-            'avg_daily_return': round(calculate_daily_returns(df).mean(), 6)
+            'avg_daily_return': round(returns.mean(), 6)
         }
     }
\ No newline at end of file
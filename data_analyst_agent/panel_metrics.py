@@ -0,0 +1,280 @@
+"""
+PANEL METRICS MODULE
+
+Cross-sectional version of metrics.py.
+
+Takes a 2-D close-price array (tickers x dates) and computes every
+ticker's metrics at once with NumPy axis operations instead of one
+pandas call per ticker. Ragged histories are NaN-padded; missing values
+are skipped exactly like clean_dataframe's dropna() does.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def build_close_panel(frames: dict) -> tuple:
+    """
+    Stack per-ticker DataFrames into a close-price panel.
+
+    Parameters:
+        frames: dict of ticker -> DataFrame with 'close' column
+
+    Returns:
+        (closes, tickers, dates): float array (tickers x dates),
+        list of tickers, DatetimeIndex of the union of all dates
+    """
+    tickers = list(frames)
+    # Union of every ticker's dates, in date order
+    closes = pd.concat({t: frames[t]['close'] for t in tickers}, axis=1, sort=True)
+    return closes.to_numpy(dtype=float).T, tickers, closes.index
+
+
+def _pack(closes: np.ndarray) -> tuple:
+    """
+    Move each row's valid prices to the front, keeping their order.
+
+    Returns:
+        (packed, positions, counts): packed prices (NaN after counts[i]),
+        original column of every packed value, valid prices per row
+    """
+    closes = np.asarray(closes, dtype=float)
+    if closes.ndim == 1:
+        closes = closes[None, :]
+
+    missing = np.isnan(closes)
+    positions = np.argsort(missing, axis=1, kind='stable')
+    packed = np.take_along_axis(closes, positions, axis=1)
+    counts = (~missing).sum(axis=1)
+    return packed, positions, counts
+
+
+def _last_valid(packed: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Last valid price of every row (NaN for empty rows)."""
+    rows = np.arange(packed.shape[0])
+    last = packed[rows, np.maximum(counts - 1, 0)]
+    return np.where(counts > 0, last, np.nan)
+
+
+def panel_daily_returns(closes: np.ndarray) -> np.ndarray:
+    """
+    Calculate daily returns for every ticker.
+
+    Parameters:
+        closes: Close prices (tickers x dates), NaN-padded
+
+    Returns:
+        Returns array (tickers x dates-1), left-aligned per ticker and
+        NaN-padded; row i has counts[i]-1 valid returns
+    """
+    packed, _, _ = _pack(closes)
+    return _returns(packed)
+
+
+def _returns(packed: np.ndarray) -> np.ndarray:
+    return packed[:, 1:] / packed[:, :-1] - 1
+
+
+def panel_total_return(closes: np.ndarray) -> np.ndarray:
+    """
+    Calculate total return over the period for every ticker.
+
+    Returns:
+        Array of total returns as decimals (one per ticker)
+    """
+    packed, _, counts = _pack(closes)
+    return _total_return(packed, counts)
+
+
+def _total_return(packed: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    first = packed[:, 0]
+    return (_last_valid(packed, counts) - first) / first
+
+
+def panel_volatility(closes: np.ndarray, annualize: bool = True) -> np.ndarray:
+    """
+    Calculate volatility (sample std of daily returns) for every ticker.
+
+    Returns:
+        Array of volatilities as decimals (one per ticker)
+    """
+    packed, _, counts = _pack(closes)
+    return _volatility(_returns(packed), counts, annualize)
+
+
+def _volatility(returns: np.ndarray, counts: np.ndarray, annualize: bool = True) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = counts - 1
+        mean = np.nansum(returns, axis=1) / n
+        sq = np.nansum((returns - mean[:, None]) ** 2, axis=1)
+        daily_vol = np.sqrt(sq / (n - 1))
+    daily_vol = np.where(n > 1, daily_vol, np.nan)
+
+    if annualize:
+        # 252 trading days in a year
+        return daily_vol * np.sqrt(252)
+    return daily_vol
+
+
+def panel_avg_daily_return(closes: np.ndarray) -> np.ndarray:
+    """
+    Calculate the mean daily return for every ticker.
+
+    Returns:
+        Array of average daily returns (one per ticker)
+    """
+    packed, _, counts = _pack(closes)
+    return _avg_daily_return(_returns(packed), counts)
+
+
+def _avg_daily_return(returns: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = counts - 1
+        return np.where(n > 0, np.nansum(returns, axis=1) / n, np.nan)
+
+
+def panel_max_drawdown(closes: np.ndarray, dates=None) -> dict:
+    """
+    Calculate maximum drawdown for every ticker.
+
+    Parameters:
+        closes: Close prices (tickers x dates), NaN-padded
+        dates: Optional date index matching the columns of closes
+
+    Returns:
+        dict with 'max_drawdown' array and 'peak_index'/'trough_index'
+        (column positions in closes); plus 'peak_date'/'trough_date'
+        lists of 'YYYY-MM-DD' strings when dates are given
+    """
+    packed, positions, counts = _pack(closes)
+    result = _max_drawdown(packed, counts)
+
+    # Map positions in the packed rows back to columns of closes
+    rows = np.arange(packed.shape[0])
+    result['peak_index'] = positions[rows, result['peak_index']]
+    result['trough_index'] = positions[rows, result['trough_index']]
+
+    if dates is not None:
+        dates = pd.DatetimeIndex(dates)
+        result['peak_date'] = list(dates[result['peak_index']].strftime('%Y-%m-%d'))
+        result['trough_date'] = list(dates[result['trough_index']].strftime('%Y-%m-%d'))
+
+    return result
+
+
+def _max_drawdown(packed: np.ndarray, counts: np.ndarray) -> dict:
+    n_tickers, n_dates = packed.shape
+    rows = np.arange(n_tickers)
+
+    # Running maximum and drawdown along the date axis
+    running_max = np.fmax.accumulate(packed, axis=1)
+    drawdown = (packed - running_max) / running_max
+
+    # Worst drawdown (first occurrence, like pandas idxmin)
+    filled = np.where(np.isnan(drawdown), np.inf, drawdown)
+    trough = np.argmin(filled, axis=1)
+    max_drawdown = np.where(counts > 0, drawdown[rows, trough], np.nan)
+
+    # Peak = first date at or before the trough where the price hit that running max
+    peak_value = running_max[rows, trough]
+    at_peak = (packed == peak_value[:, None]) & (np.arange(n_dates)[None, :] <= trough[:, None])
+    peak = np.argmax(at_peak, axis=1)
+
+    return {
+        'max_drawdown': max_drawdown,
+        'peak_index': peak,
+        'trough_index': trough
+    }
+
+
+def panel_current_rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Calculate the latest RSI value for every ticker.
+
+    Same definition as metrics.calculate_rsi (simple moving average of
+    gains and losses over the last `period` price changes).
+
+    Returns:
+        Array of RSI values (0-100), NaN where history is too short
+    """
+    packed, _, counts = _pack(closes)
+    return _current_rsi(packed, counts, period)
+
+
+def _current_rsi(packed: np.ndarray, counts: np.ndarray, period: int = 14) -> np.ndarray:
+    n_tickers, n_dates = packed.shape
+    if n_dates < 2:
+        return np.full(n_tickers, np.nan)
+
+    # Column positions of the last `period` price changes per row. Like
+    # calculate_rsi, position 0 (no previous price) counts as a zero change.
+    idx = (counts - period)[:, None] + np.arange(period)[None, :]
+    idx = np.clip(idx, 0, n_dates - 1)
+
+    current = np.take_along_axis(packed, idx, axis=1)
+    previous = np.take_along_axis(packed, np.maximum(idx - 1, 0), axis=1)
+    delta = np.where(idx > 0, current - previous, 0.0)
+
+    avg_gains = np.where(delta > 0, delta, 0).mean(axis=1)
+    avg_losses = np.where(delta < 0, -delta, 0).mean(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = avg_gains / avg_losses
+        rsi = 100 - (100 / (1 + rs))
+
+    return np.where(counts >= period, rsi, np.nan)
+
+
+def compute_panel_metrics(closes: np.ndarray, tickers: list, dates) -> dict:
+    """
+    Compute all metrics for every ticker in a panel.
+
+    Parameters:
+        closes: Close prices (tickers x dates), NaN-padded
+        tickers: Symbols matching the rows of closes
+        dates: Date index matching the columns of closes
+
+    Returns:
+        dict of ticker -> dict shaped like compute_all_metrics' output
+    """
+    packed, positions, counts = _pack(closes)
+    dates = pd.DatetimeIndex(dates)
+
+    returns = _returns(packed)
+
+    total_return = _total_return(packed, counts)
+    volatility = _volatility(returns, counts)
+    avg_return = _avg_daily_return(returns, counts)
+    rsi = _current_rsi(packed, counts)
+    drawdown = _max_drawdown(packed, counts)
+
+    # Convert positions in the packed rows back to calendar dates
+    rows = np.arange(len(tickers))
+    first_dates = dates[positions[:, 0]].strftime('%Y-%m-%d')
+    last_dates = dates[positions[rows, np.maximum(counts - 1, 0)]].strftime('%Y-%m-%d')
+    peak_dates = dates[positions[rows, drawdown['peak_index']]].strftime('%Y-%m-%d')
+    trough_dates = dates[positions[rows, drawdown['trough_index']]].strftime('%Y-%m-%d')
+
+    results = {}
+    for i, ticker in enumerate(tickers):
+        if counts[i] == 0:
+            continue
+        results[ticker] = {
+            'ticker': ticker.upper(),
+            'period': {
+                'start': first_dates[i],
+                'end': last_dates[i],
+                'trading_days': int(counts[i])
+            },
+            'metrics': {
+                'total_return': round(float(total_return[i]), 4),
+                'volatility_annual': round(float(volatility[i]), 4),
+                'max_drawdown': round(float(drawdown['max_drawdown'][i]), 4),
+                'drawdown_peak_date': peak_dates[i],
+                'drawdown_trough_date': trough_dates[i],
+                'rsi_current': round(float(rsi[i]), 2),
+                'avg_daily_return': round(float(avg_return[i]), 6)
+            }
+        }
+
+    return results
@@ -0,0 +1,279 @@
+"""
+PRICE CACHE MODULE
+
+On-disk OHLCV cache for the Data Analyst Agent.
+
+Each ticker is stored as one columnar file (Parquet when an engine is
+installed, pickle otherwise) plus a small JSON sidecar recording the date
+range that has already been requested. A request that is partly covered
+only downloads the missing leading/trailing spans and merges them in.
+"""
+
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr,
+    USMemorialDay, USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+from pandas.tseries.offsets import CustomBusinessDay
+
+from data_fetcher import download_prices
+
+
+class _NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day NYSE closures (a New Year's Day on a Saturday is not moved)."""
+    rules = [
+        Holiday('NewYearsDay', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('IndependenceDay', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+
+_TRADING_DAY = CustomBusinessDay(calendar=_NYSEHolidayCalendar())
+
+
+def _parquet_available() -> bool:
+    """Check whether pandas has a Parquet engine to write with."""
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def _expects_rows(start: pd.Timestamp, end: pd.Timestamp) -> bool:
+    """Whether a [start, end) span holds trading days (not weekends or market holidays) before today."""
+    end = min(end, pd.Timestamp.today().normalize())
+    return start < end and len(pd.date_range(start, end, freq=_TRADING_DAY, inclusive='left')) > 0
+
+
+class PriceCache:
+    """
+    Persistent per-ticker price cache with incremental range extension.
+
+    Coverage is kept contiguous: a request outside the cached range
+    downloads everything between the request and the cached range.
+    """
+
+    def __init__(self, cache_dir: str = "cache", downloader=None):
+        """
+        Initialize the cache.
+
+        Parameters:
+            cache_dir: Directory holding the cached files
+            downloader: Function (ticker, start_date, end_date) -> clean
+                DataFrame, end exclusive. Defaults to download_prices.
+        """
+        self.cache_dir = cache_dir
+        self.downloader = downloader or download_prices
+        self.file_format = 'parquet' if _parquet_available() else 'pickle'
+
+        # In-memory copies, so repeated reads are slices of one frame
+        self._frames = {}
+        self._coverage = {}
+
+        # One lock per ticker so concurrent runs never download a span twice
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+        self.counters = {
+            'hits': 0,
+            'partial_hits': 0,
+            'misses': 0,
+            'downloads': 0,
+            'failed_downloads': 0,
+            'rows_fetched': 0,
+            'bytes_fetched': 0
+        }
+
+    def get(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Return cleaned OHLCV data for [start_date, end_date).
+
+        Parameters:
+            ticker: Stock symbol
+            start_date: Format 'YYYY-MM-DD'
+            end_date: Format 'YYYY-MM-DD' (exclusive, as in yf.download)
+
+        Returns:
+            DataFrame slice of the cached history
+        """
+        ticker = ticker.upper()
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date)
+
+        with self._ticker_lock(ticker):
+            self._load(ticker)
+            spans = self._missing_spans(ticker, start, end)
+
+            if not spans:
+                self.counters['hits'] += 1
+            elif ticker in self._coverage:
+                self.counters['partial_hits'] += 1
+            else:
+                self.counters['misses'] += 1
+
+            if spans:
+                self._extend(ticker, spans)
+
+            return self._slice(ticker, start, end)
+
+    def stats(self) -> dict:
+        """Return hit/miss/bytes-fetched counters."""
+        stats = dict(self.counters)
+        requests = stats['hits'] + stats['partial_hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / requests, 4) if requests else 0.0
+        stats['cached_tickers'] = len(self._coverage)
+        return stats
+
+    def coverage(self, ticker: str) -> tuple:
+        """Return the cached (start, end) range for a ticker, or None."""
+        ticker = ticker.upper()
+        self._load(ticker)
+        cov = self._coverage.get(ticker)
+        if cov is None:
+            return None
+        return cov[0].strftime('%Y-%m-%d'), cov[1].strftime('%Y-%m-%d')
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        """Get (or create) the lock guarding one ticker."""
+        with self._locks_guard:
+            if ticker not in self._locks:
+                self._locks[ticker] = threading.Lock()
+            return self._locks[ticker]
+
+    def _missing_spans(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> list:
+        """Work out which [start, end) spans still need downloading."""
+        cov = self._coverage.get(ticker)
+        if cov is None:
+            return [(start, end)]
+
+        covered_start, covered_end = cov
+        spans = []
+        if start < covered_start:
+            spans.append((start, covered_start))
+        if end > covered_end:
+            spans.append((covered_end, end))
+        return spans
+
+    def _extend(self, ticker: str, spans: list):
+        """Download the missing spans, merge them in and persist."""
+        parts = []
+        if ticker in self._frames:
+            parts.append(self._frames[ticker])
+
+        covered = []
+        for span_start, span_end in spans:
+            df = self.downloader(ticker, span_start.strftime('%Y-%m-%d'), span_end.strftime('%Y-%m-%d'))
+            self.counters['downloads'] += 1
+            self.counters['rows_fetched'] += len(df)
+            self.counters['bytes_fetched'] += int(df.memory_usage(index=True).sum())
+            if not df.empty:
+                parts.append(df)
+                covered.append((span_start, span_end))
+            elif _expects_rows(span_start, span_end):
+                # Downloaders may return an empty frame on errors: don't let
+                # a transient failure mark the span as covered
+                self.counters['failed_downloads'] += 1
+            else:
+                covered.append((span_start, span_end))
+
+        if parts:
+            merged = pd.concat(parts) if len(parts) > 1 else parts[0]
+            # Newer downloads win (e.g. a bar that was still forming last time)
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        else:
+            merged = pd.DataFrame()
+
+        self._frames[ticker] = merged
+        if not covered:
+            return
+
+        # Spans border the cached range, so coverage stays contiguous.
+        # Today's bar may still be forming, so never mark it as covered.
+        today = pd.Timestamp.today().normalize()
+        new_start = min(s for s, _ in covered)
+        new_end = max(e for _, e in covered)
+        if ticker in self._coverage:
+            new_start = min(new_start, self._coverage[ticker][0])
+            new_end = max(new_end, self._coverage[ticker][1])
+        new_end = min(new_end, today)
+
+        if new_start < new_end:
+            self._coverage[ticker] = (new_start, new_end)
+            self._save(ticker)
+
+    def _slice(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Positional slice of the cached frame (no copy of the data)."""
+        df = self._frames.get(ticker)
+        if df is None or df.empty:
+            return pd.DataFrame()
+
+        i = df.index.searchsorted(start, side='left')
+        j = df.index.searchsorted(end, side='left')
+        return df.iloc[i:j]
+
+    def _paths(self, ticker: str) -> tuple:
+        """Data file and coverage sidecar for a ticker."""
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+        ext = 'parquet' if self.file_format == 'parquet' else 'pkl'
+        return (
+            os.path.join(self.cache_dir, f'{safe}.{ext}'),
+            os.path.join(self.cache_dir, f'{safe}.json')
+        )
+
+    def _load(self, ticker: str):
+        """Load a ticker from disk into memory if it is not there yet."""
+        if ticker in self._coverage:
+            return
+
+        data_path, meta_path = self._paths(ticker)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if self.file_format == 'parquet':
+                df = pd.read_parquet(data_path)
+            else:
+                df = pd.read_pickle(data_path)
+        except (OSError, ValueError):
+            # Corrupt or half-written entry: treat as a miss
+            return
+
+        self._frames[ticker] = df
+        self._coverage[ticker] = (pd.Timestamp(meta['start']), pd.Timestamp(meta['end']))
+
+    def _save(self, ticker: str):
+        """Write a ticker's frame and coverage to disk."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        df = self._frames[ticker]
+
+        # Write to a temp file first so readers never see a partial file;
+        # the name is unique per writer so concurrent saves can't clobber it
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if self.file_format == 'parquet':
+            df.to_parquet(data_path + suffix)
+        else:
+            df.to_pickle(data_path + suffix)
+        os.replace(data_path + suffix, data_path)
+
+        start, end = self._coverage[ticker]
+        with open(meta_path + suffix, 'w') as f:
+            json.dump({'start': start.strftime('%Y-%m-%d'), 'end': end.strftime('%Y-%m-%d')}, f)
+        os.replace(meta_path + suffix, meta_path)
@@ -0,0 +1,175 @@
+"""
+ROLLING METRICS MODULE
+
+Rolling-window versions of the metrics in metrics.py, for risk dashboards.
+
+Everything is computed with vectorized sliding-window techniques instead
+of rolling().apply():
+- Rolling return: ratio of the price to the price w bars earlier
+- Rolling volatility: cumulative sums of (demeaned) returns and squares
+- Rolling max drawdown: block decomposition, O(n) per window length
+"""
+
+import pandas as pd
+import numpy as np
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of every trailing window of `values` (NaN before the first full window)."""
+    csum = np.concatenate([[0.0], np.cumsum(values)])
+    out = np.full(len(values), np.nan)
+    out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+def rolling_returns(df: pd.DataFrame, windows: list = [21, 63, 252]) -> pd.DataFrame:
+    """
+    Calculate trailing returns over each window.
+
+    Parameters:
+        df: DataFrame with 'close' column
+        windows: Window lengths in trading days
+
+    Returns:
+        DataFrame with a 'return_{w}' column per window
+    """
+    prices = df['close'].to_numpy(dtype=float)
+    result = {}
+
+    for window in windows:
+        out = np.full(len(prices), np.nan)
+        if window < len(prices):
+            out[window:] = prices[window:] / prices[:-window] - 1
+        result[f'return_{window}'] = out
+
+    return pd.DataFrame(result, index=df.index)
+
+
+def rolling_volatility(df: pd.DataFrame, windows: list = [21, 63, 252], annualize: bool = True) -> pd.DataFrame:
+    """
+    Calculate rolling volatility (sample std of daily returns) per window.
+
+    Same values as df['close'].pct_change().rolling(w).std().
+
+    Parameters:
+        df: DataFrame with 'close' column
+        windows: Window lengths in returns
+        annualize: If True, multiply by sqrt(252) for annual volatility
+
+    Returns:
+        DataFrame with a 'volatility_{w}' column per window
+    """
+    prices = df['close'].to_numpy(dtype=float)
+    returns = np.zeros(len(prices))
+    returns[1:] = prices[1:] / prices[:-1] - 1
+
+    # Demean first so the cumulative sums stay small (less cancellation)
+    if len(prices) > 1:
+        returns[1:] -= returns[1:].mean()
+    squares = returns ** 2
+
+    scale = np.sqrt(252) if annualize else 1.0
+    result = {}
+
+    for window in windows:
+        out = np.full(len(prices), np.nan)
+        if 1 < window < len(prices):
+            s1 = _window_sums(returns, window)
+            s2 = _window_sums(squares, window)
+            var = (s2 - s1 ** 2 / window) / (window - 1)
+            # The first return is undefined, so the first full window ends at `window`
+            out[window:] = np.sqrt(np.maximum(var[window:], 0)) * scale
+        result[f'volatility_{window}'] = out
+
+    return pd.DataFrame(result, index=df.index)
+
+
+def _rolling_max_drawdown(prices: np.ndarray, window: int) -> np.ndarray:
+    """
+    Max drawdown of every trailing window of `window` prices.
+
+    The series is cut into blocks of length `window`, so every window is
+    a suffix of one block followed by a prefix of the next. Prefix and
+    suffix statistics are cumulative scans within each block, and each
+    window combines them in O(1):
+        mdd = min(suffix_mdd, prefix_mdd, prefix_min / suffix_max - 1)
+    """
+    n = len(prices)
+    out = np.full(n, np.nan)
+    if window > n:
+        return out
+    if window == 1:
+        out[:] = 0.0
+        return out
+
+    # Pad the last block with the last price (adds no new drawdown)
+    n_blocks = -(-n // window)
+    padded = np.concatenate([prices, np.full(n_blocks * window - n, prices[-1])])
+    blocks = padded.reshape(n_blocks, window)
+
+    # Prefix stats: from the block start to each position
+    prefix_max = np.maximum.accumulate(blocks, axis=1)
+    prefix_min = np.minimum.accumulate(blocks, axis=1)
+    prefix_mdd = np.minimum.accumulate(blocks / prefix_max - 1, axis=1)
+
+    # Suffix stats: from each position to the block end
+    reversed_blocks = blocks[:, ::-1]
+    suffix_min = np.minimum.accumulate(reversed_blocks, axis=1)
+    suffix_max = np.maximum.accumulate(reversed_blocks, axis=1)[:, ::-1]
+    suffix_mdd = np.minimum.accumulate(suffix_min / reversed_blocks - 1, axis=1)[:, ::-1]
+
+    prefix_min = prefix_min.ravel()
+    prefix_mdd = prefix_mdd.ravel()
+    suffix_max = suffix_max.ravel()
+    suffix_mdd = suffix_mdd.ravel()
+
+    ends = np.arange(window - 1, n)
+    starts = ends - window + 1
+
+    spanning = np.minimum(
+        np.minimum(suffix_mdd[starts], prefix_mdd[ends]),
+        prefix_min[ends] / suffix_max[starts] - 1
+    )
+    # A window that starts on a block boundary is exactly one block
+    out[ends] = np.where(starts % window == 0, prefix_mdd[ends], spanning)
+    return out
+
+
+def rolling_max_drawdown(df: pd.DataFrame, windows: list = [21, 63, 252]) -> pd.DataFrame:
+    """
+    Calculate the max drawdown within every trailing window.
+
+    Same values as
+    df['close'].rolling(w).apply(lambda x: (x / np.maximum.accumulate(x) - 1).min()).
+
+    Parameters:
+        df: DataFrame with 'close' column
+        windows: Window lengths in trading days (prices per window)
+
+    Returns:
+        DataFrame with a 'max_drawdown_{w}' column per window (as decimals)
+    """
+    prices = df['close'].to_numpy(dtype=float)
+    result = {f'max_drawdown_{w}': _rolling_max_drawdown(prices, w) for w in windows}
+    return pd.DataFrame(result, index=df.index)
+
+
+def compute_rolling_metrics(df: pd.DataFrame, windows: list = [21, 63, 252]) -> pd.DataFrame:
+    """
+    Compute rolling return, volatility and max drawdown for every window.
+
+    This is the MAIN function for risk dashboards.
+
+    Parameters:
+        df: DataFrame with 'close' column
+        windows: Window lengths in trading days
+
+    Returns:
+        DataFrame indexed like df with return_{w}, volatility_{w} and
+        max_drawdown_{w} columns
+    """
+    return pd.concat([
+        rolling_returns(df, windows),
+        rolling_volatility(df, windows),
+        rolling_max_drawdown(df, windows)
+    ], axis=1)
@@ -0,0 +1,262 @@
+"""
+STREAMING METRICS MODULE
+
+Incremental version of compute_all_metrics.
+
+MetricsState keeps running aggregates so a new daily bar costs O(1)
+instead of recomputing the whole history, and the state can be saved
+as JSON between runs.
+"""
+
+import copy
+import json
+import math
+from collections import deque
+
+import pandas as pd
+
+
+class MetricsState:
+    """
+    Running metrics for one ticker, updated bar by bar.
+
+    - Returns: Welford mean/variance (sample variance, like pandas std)
+    - RSI: the last `rsi_period` price changes (matches calculate_rsi),
+      or Wilder smoothing with rsi_smoothing='wilder'
+    - Drawdown: running max with current and worst drawdown and dates
+    """
+
+    def __init__(self, ticker: str, rsi_period: int = 14, rsi_smoothing: str = 'sma'):
+        """
+        Initialize an empty state.
+
+        Parameters:
+            ticker: Stock symbol
+            rsi_period: RSI lookback period
+            rsi_smoothing: 'sma' (same values as compute_all_metrics) or
+                'wilder' (classic Wilder smoothing, O(1) memory)
+        """
+        if rsi_smoothing not in ('sma', 'wilder'):
+            raise ValueError(f"Unknown rsi_smoothing: {rsi_smoothing}")
+
+        self.ticker = ticker.upper()
+        self.rsi_period = rsi_period
+        self.rsi_smoothing = rsi_smoothing
+
+        # Bars seen
+        self.count = 0
+        self.first_date = None
+        self.first_close = None
+        self.last_date = None
+        self.last_close = None
+
+        # Welford accumulators over daily returns
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self.m2 = 0.0
+
+        # RSI state
+        self.recent_changes = deque(maxlen=rsi_period)
+        self.avg_gain = None
+        self.avg_loss = None
+
+        # Drawdown state
+        self.running_max = None
+        self.running_max_date = None
+        self.current_drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.peak_date = None
+        self.trough_date = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ticker: str, **kwargs) -> 'MetricsState':
+        """
+        Build a state from a price history (one-off O(history) seed).
+
+        Parameters:
+            df: DataFrame with 'close' column and a date index
+            ticker: Stock symbol
+        """
+        state = cls(ticker, **kwargs)
+        state.update_frame(df)
+        return state
+
+    def update(self, bar) -> 'MetricsState':
+        """
+        Add one bar.
+
+        Parameters:
+            bar: dict with 'date' and 'close', or a (date, close) tuple.
+                Bars must arrive in date order.
+
+        Returns:
+            self, so calls can be chained
+        """
+        if isinstance(bar, dict):
+            date, close = bar['date'], bar['close']
+        else:
+            date, close = bar
+
+        date = pd.Timestamp(date).strftime('%Y-%m-%d')
+        close = float(close)
+
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"Bar for {date} is not after the last bar ({self.last_date})")
+
+        if self.count == 0:
+            self.first_date = date
+            self.first_close = close
+            self.running_max = close
+            self.running_max_date = date
+            self.peak_date = date
+            self.trough_date = date
+            # calculate_rsi counts the first bar as a zero change
+            change = 0.0
+        else:
+            change = close - self.last_close
+            self._update_returns(close / self.last_close - 1)
+
+        self._update_rsi(change)
+        self._update_drawdown(date, close)
+
+        self.count += 1
+        self.last_date = date
+        self.last_close = close
+        return self
+
+    def update_frame(self, df: pd.DataFrame) -> 'MetricsState':
+        """
+        Add every bar of df that is newer than the last bar seen.
+
+        Parameters:
+            df: DataFrame with 'close' column and a date index
+        """
+        if self.last_date is not None:
+            df = df[df.index > pd.Timestamp(self.last_date)]
+
+        for date, close in zip(df.index, df['close'].to_numpy()):
+            self.update((date, close))
+        return self
+
+    def _update_returns(self, ret: float):
+        """Welford's online mean/variance update."""
+        self.n_returns += 1
+        delta = ret - self.mean_return
+        self.mean_return += delta / self.n_returns
+        self.m2 += delta * (ret - self.mean_return)
+
+    def _update_rsi(self, change: float):
+        """Update the RSI window (sma) or smoothed averages (wilder)."""
+        if self.rsi_smoothing == 'sma':
+            self.recent_changes.append(change)
+            return
+
+        # Wilder: seed with a simple average of the first `period` real changes
+        if self.count == 0:
+            return
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        if self.avg_gain is None:
+            self.recent_changes.append(change)
+            if len(self.recent_changes) == self.rsi_period:
+                self.avg_gain = sum(max(c, 0.0) for c in self.recent_changes) / self.rsi_period
+                self.avg_loss = sum(max(-c, 0.0) for c in self.recent_changes) / self.rsi_period
+                self.recent_changes.clear()
+        else:
+            self.avg_gain = (self.avg_gain * (self.rsi_period - 1) + gain) / self.rsi_period
+            self.avg_loss = (self.avg_loss * (self.rsi_period - 1) + loss) / self.rsi_period
+
+    def _update_drawdown(self, date: str, close: float):
+        """Update running max and current/worst drawdown."""
+        # Strict comparisons keep the first occurrence, like idxmax/idxmin
+        if close > self.running_max:
+            self.running_max = close
+            self.running_max_date = date
+
+        self.current_drawdown = (close - self.running_max) / self.running_max
+        if self.current_drawdown < self.max_drawdown:
+            self.max_drawdown = self.current_drawdown
+            self.peak_date = self.running_max_date
+            self.trough_date = date
+
+    def rsi(self) -> float:
+        """Current RSI (NaN until enough bars have been seen)."""
+        if self.rsi_smoothing == 'sma':
+            if len(self.recent_changes) < self.rsi_period:
+                return float('nan')
+            avg_gain = sum(c for c in self.recent_changes if c > 0) / self.rsi_period
+            avg_loss = sum(-c for c in self.recent_changes if c < 0) / self.rsi_period
+        else:
+            if self.avg_gain is None:
+                return float('nan')
+            avg_gain, avg_loss = self.avg_gain, self.avg_loss
+
+        if avg_loss == 0:
+            # Same as pandas: x/0 -> inf -> RSI 100, 0/0 -> NaN
+            return float('nan') if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def snapshot(self) -> dict:
+        """
+        Current metrics, in the same shape as compute_all_metrics.
+        """
+        if self.count == 0:
+            raise ValueError(f"No bars seen yet for {self.ticker}")
+
+        nan = float('nan')
+        volatility = math.sqrt(self.m2 / (self.n_returns - 1) * 252) if self.n_returns > 1 else nan
+        avg_return = self.mean_return if self.n_returns > 0 else nan
+
+        return {
+            'ticker': self.ticker,
+            'period': {
+                'start': self.first_date,
+                'end': self.last_date,
+                'trading_days': self.count
+            },
+            'metrics': {
+                'total_return': round((self.last_close - self.first_close) / self.first_close, 4),
+                'volatility_annual': round(volatility, 4),
+                'max_drawdown': round(self.max_drawdown, 4),
+                'drawdown_peak_date': self.peak_date,
+                'drawdown_trough_date': self.trough_date,
+                'rsi_current': round(self.rsi(), 2),
+                'avg_daily_return': round(avg_return, 6)
+            }
+        }
+
+    def preview(self, bar) -> dict:
+        """
+        Snapshot as if `bar` had been added, without changing this state.
+
+        Useful for intraday refreshes where today's bar is still forming.
+        """
+        return copy.deepcopy(self).update(bar).snapshot()
+
+    def to_dict(self) -> dict:
+        """Serializable form of the state."""
+        data = dict(self.__dict__)
+        data['recent_changes'] = list(self.recent_changes)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MetricsState':
+        """Rebuild a state from to_dict() output."""
+        state = cls(data['ticker'], rsi_period=data['rsi_period'], rsi_smoothing=data['rsi_smoothing'])
+        for key, value in data.items():
+            if key == 'recent_changes':
+                state.recent_changes = deque(value, maxlen=state.rsi_period)
+            else:
+                setattr(state, key, value)
+        return state
+
+    def save(self, path: str):
+        """Write the state to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'MetricsState':
+        """Read a state written by save()."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,166 @@
+"""
+Test file for the bulk multi-ticker fetch.
+
+Runs offline: a stub downloader stands in for yf.download, and a
+stub yfinance module for the retry and circuit breaker tests.
+"""
+
+import tempfile
+import types
+
+import numpy as np
+import pandas as pd
+import data_fetcher
+from data_fetcher import download_prices, fetch_stock_data, fetch_stocks_bulk
+from resilience import CircuitOpenError, configure_provider, provider_stats
+from yfinance.exceptions import YFTzMissingError
+
+
+def make_stub_downloader(missing=(), calls=None):
+    """Return a downloader that builds a yfinance-style MultiIndex frame."""
+    def downloader(tickers, start_date, end_date):
+        if calls is not None:
+            calls.append(list(tickers))
+        dates = pd.bdate_range(start_date, end_date, inclusive='left')
+        columns = pd.MultiIndex.from_product([tickers, ['Open', 'High', 'Low', 'Close', 'Volume']])
+        values = np.tile(np.linspace(100, 110, len(dates))[:, None], (1, len(columns)))
+        raw = pd.DataFrame(values, index=dates, columns=columns)
+        for ticker in missing:
+            if ticker in tickers:
+                raw[ticker] = np.nan
+        # Ragged history: first ticker has a gap in its first week
+        raw.loc[dates[:5], tickers[0]] = np.nan
+        return raw
+    return downloader
+
+
+# Test 1: Batched fetch splits into clean per-ticker frames
+print("Test 1: Batched fetch")
+calls = []
+results = fetch_stocks_bulk(["AAPL", "msft", "GOOGL"], "2024-01-01", "2024-03-01",
+                            downloader=make_stub_downloader(calls=calls))
+print(f"Requests made: {len(calls)}")
+for ticker, result in results.items():
+    print(f"{ticker}: success={result['success']}, days={result['metadata'].get('trading_days')}")
+assert len(calls) == 1
+assert set(results) == {"AAPL", "MSFT", "GOOGL"}
+assert list(results["MSFT"]["data"].columns) == ['open', 'high', 'low', 'close', 'volume']
+assert results["AAPL"]["metadata"]["trading_days"] == results["MSFT"]["metadata"]["trading_days"] - 5
+
+# Test 2: Chunking
+print("\nTest 2: Chunked requests")
+calls = []
+fetch_stocks_bulk(["A", "B", "C", "D", "E"], "2024-01-01", "2024-02-01",
+                  chunk_size=2, downloader=make_stub_downloader(calls=calls))
+print(f"Chunks: {calls}")
+assert calls == [["A", "B"], ["C", "D"], ["E"]]
+
+# Test 3: Missing ticker and bad input are isolated
+print("\nTest 3: Per-ticker errors")
+results = fetch_stocks_bulk(["AAPL", "XYZFAKE123", "WAYTOOLONGTICKER"], "2024-01-01", "2024-02-01",
+                            downloader=make_stub_downloader(missing=["XYZFAKE123"]))
+for ticker, result in results.items():
+    print(f"{ticker}: success={result['success']}, errors={result['metadata']['errors']}")
+assert results["AAPL"]["success"]
+assert results["XYZFAKE123"]["metadata"]["errors"] == ["No data found for XYZFAKE123"]
+assert not results["WAYTOOLONGTICKER"]["success"]
+
+# Test 4: Downloader failure fails the whole chunk, not the call
+print("\nTest 4: Downloader failure")
+def broken(tickers, start_date, end_date):
+    raise ConnectionError("network down")
+
+results = fetch_stocks_bulk(["AAPL", "MSFT"], "2024-01-01", "2024-02-01", downloader=broken)
+print(f"Errors: {results['AAPL']['metadata']['errors']}")
+assert not any(r['success'] for r in results.values())
+
+
+class StubTicker:
+    """Stands in for yf.Ticker: fails a set number of times per symbol."""
+    failures = {}
+    requests = []
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, start, end, **kwargs):
+        StubTicker.requests.append(self.ticker)
+        if self.ticker == "XYZFAKE123":
+            raise YFTzMissingError(self.ticker)  # what yfinance raises for an unknown symbol
+        if StubTicker.failures.get(self.ticker, 0) != 0:
+            StubTicker.failures[self.ticker] -= 1
+            raise ConnectionError("network down")
+        dates = pd.bdate_range(start, end, inclusive='left', tz='America/New_York')
+        close = np.linspace(100, 110, len(dates))
+        return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1e6}, index=dates)
+
+
+def stub_download(tickers, start, end, **kwargs):
+    """yf.download logs per-ticker errors and leaves those tickers empty."""
+    return make_stub_downloader(missing=["MSFT"])(tickers, start, end)
+
+
+real_yf = data_fetcher.yf
+data_fetcher.yf = types.SimpleNamespace(Ticker=StubTicker, download=stub_download)
+configure_provider("yahoo", rate=1000, burst=1000, max_retries=2, backoff_base=0.001,
+                   failure_threshold=4, reset_timeout=60, state_dir=tempfile.mkdtemp())
+
+# Test 5: Network errors are retried; unknown symbols are not
+print("\nTest 5: Yahoo retries")
+StubTicker.failures = {"AAPL": 2}
+df = download_prices("aapl", "2024-01-01", "2024-02-01")
+print(f"Stats: {provider_stats()['yahoo']}")
+assert StubTicker.requests == ["AAPL"] * 3 and provider_stats()['yahoo']['retries'] == 2
+assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume'] and df.index.tz is None
+
+StubTicker.requests = []
+result = fetch_stock_data("XYZFAKE123", "2024-01-01", "2024-02-01")
+assert result['metadata']['errors'] == ["No data found for XYZFAKE123"]
+assert StubTicker.requests == ["XYZFAKE123"] and provider_stats()['yahoo']['retries'] == 2
+
+# Test 6: Tickers a batch returned empty are downloaded again, with retries
+print("\nTest 6: Batch refetch")
+StubTicker.requests = []
+StubTicker.failures = {"MSFT": 1}
+results = fetch_stocks_bulk(["AAPL", "MSFT"], "2024-01-01", "2024-02-01")
+assert all(r['success'] for r in results.values())
+assert StubTicker.requests == ["MSFT", "MSFT"] and provider_stats()['yahoo']['retries'] == 3
+
+# Test 7: A refetch that fails only fails its own ticker
+print("\nTest 7: Failed refetch")
+StubTicker.requests = []
+StubTicker.failures = {"MSFT": -1}  # fails on every request
+results = fetch_stocks_bulk(["AAPL", "MSFT", "GOOGL"], "2024-01-01", "2024-02-01")
+for ticker, result in results.items():
+    print(f"{ticker}: success={result['success']}, errors={result['metadata']['errors']}")
+assert results["AAPL"]["success"] and results["GOOGL"]["success"]
+assert results["MSFT"]["metadata"]["errors"] == ["Fetch failed: network down"]
+assert StubTicker.requests == ["MSFT"] * 3
+configure_provider("yahoo", rate=1000, burst=1000, max_retries=2, backoff_base=0.001,
+                   failure_threshold=4, reset_timeout=60, state_dir=tempfile.mkdtemp())
+
+# Test 8: An outage opens the breaker, which then fails fast
+print("\nTest 8: Circuit breaker")
+StubTicker.requests = []
+StubTicker.failures = {"AAPL": -1}  # fails on every request
+result = fetch_stock_data("AAPL", "2024-01-01", "2024-02-01")
+print(f"Errors: {result['metadata']['errors']}")
+assert result['metadata']['errors'] == ["Fetch failed: network down"]
+assert len(StubTicker.requests) == 3 and provider_stats()['yahoo']['circuit'] == 'closed'
+
+try:
+    download_prices("AAPL", "2024-01-01", "2024-02-01")
+    raise AssertionError("outage not raised")
+except ConnectionError:
+    pass
+assert len(StubTicker.requests) == 4 and provider_stats()['yahoo']['circuit'] == 'open'
+
+try:
+    download_prices("MSFT", "2024-01-01", "2024-02-01")
+    raise AssertionError("open breaker let a request through")
+except CircuitOpenError as e:
+    print(f"Breaker: {e}")
+assert len(StubTicker.requests) == 4
+
+data_fetcher.yf = real_yf
+print("\nBulk fetch OK")
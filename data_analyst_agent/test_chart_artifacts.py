@@ -0,0 +1,57 @@
+"""
+Test file for in-memory chart artifacts.
+
+Runs offline on synthetic prices; the PDF part needs reportlab.
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from chart_cache import ChartCache
+from metrics import compute_indicators
+from visualizer import generate_all_charts
+
+sys.path.append('..')
+from report_generator import generate_pdf_report
+
+
+dates = pd.bdate_range("2023-01-01", periods=252)
+close = 100 + np.cumsum(np.random.default_rng(2).normal(0, 1, len(dates)))
+df = pd.DataFrame({'close': close}, index=dates)
+indicators = compute_indicators(df)
+workdir = tempfile.mkdtemp()
+
+# Test 1: No disk writes when output_dir is None
+charts = generate_all_charts(df, "TEST", output_dir=None, indicators=indicators, in_memory=True)
+for name, chart in charts.items():
+    print(f"{name}: {chart['width']}x{chart['height']} @ {chart['dpi']} dpi, {len(chart['image'])} bytes")
+    assert chart['image'].startswith(b'\x89PNG')
+    assert chart['path'] is None
+assert charts['price']['width'] == 1800 and charts['price']['height'] == 900
+
+# Test 2: Artifacts are embedded in the PDF directly
+pdf = generate_pdf_report("TEST", "2023-01-01", "2024-01-01", {}, {}, output_dir=workdir, charts=charts)
+empty = generate_pdf_report("NONE", "2023-01-01", "2024-01-01", {}, {}, output_dir=workdir, charts={})
+print(f"PDF with charts: {os.path.getsize(pdf)} bytes, without: {os.path.getsize(empty)} bytes")
+assert os.path.getsize(pdf) > os.path.getsize(empty) + 50_000
+
+# Test 3: Persisting through a ChartCache still returns artifacts, hit or miss
+cache = ChartCache(os.path.join(workdir, "charts"))
+first = generate_all_charts(df, "TEST", indicators=indicators, cache=cache, in_memory=True)
+second = generate_all_charts(df, "TEST", indicators=indicators, cache=cache, in_memory=True)
+assert os.path.exists(first['rsi']['path'])
+assert second['rsi']['image'] == first['rsi']['image']
+assert cache.stats()['hits'] == 3
+print("Artifacts OK")
+
+# Test 4: Vector charts from chart_series are drawn natively (no PNGs)
+from visualizer import chart_series
+series = chart_series(df, indicators)
+assert set(series) == {'price', 'rsi', 'drawdown'}
+vector = generate_pdf_report("VEC", "2023-01-01", "2024-01-01", {}, {}, output_dir=workdir, charts=series)
+print(f"Vector PDF: {os.path.getsize(vector)} bytes")
+assert os.path.getsize(empty) < os.path.getsize(vector) < os.path.getsize(pdf) / 5
+print("Vector charts OK")
@@ -0,0 +1,63 @@
+"""
+Test file for the chart cache module.
+
+Runs offline on synthetic prices.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from chart_cache import ChartCache
+from visualizer import generate_all_charts, plot_price_with_ma
+
+
+dates = pd.bdate_range("2023-01-02", periods=300)
+df = pd.DataFrame({'close': 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.02, 300)))}, index=dates)
+cache = ChartCache(cache_dir=tempfile.mkdtemp())
+
+# Test 1: First render is a miss, second is a hit with the same file
+print("Test 1: Miss then hit")
+first = generate_all_charts(df, "AAPL", cache=cache)
+second = generate_all_charts(df, "AAPL", cache=cache)
+print(f"Charts: {first}")
+print(f"Stats: {cache.stats()}")
+assert first == second
+assert cache.stats()['hits'] == 3 and cache.stats()['misses'] == 3
+
+# Test 2: A different date range gets its own file
+print("\nTest 2: Different range, different file")
+other = plot_price_with_ma(df.iloc[:200], "AAPL", cache=cache)
+print(f"Path: {other}")
+assert other != first['price'] and os.path.exists(first['price'])
+
+# Test 3: LRU eviction keeps the directory under max_bytes
+print("\nTest 3: Eviction")
+small = ChartCache(cache_dir=tempfile.mkdtemp(), max_bytes=os.path.getsize(first['price']) * 2)
+paths = [plot_price_with_ma(df.iloc[:n], "AAPL", cache=small) for n in (100, 150, 200, 250)]
+stats = small.stats()
+print(f"Stats: {stats}")
+assert stats['evictions'] >= 1 and stats['total_bytes'] <= small.max_bytes
+assert os.path.exists(paths[-1]) and not os.path.exists(paths[0])
+
+# Test 4: A hit carries the image bytes, so a later eviction can't break it
+print("\nTest 4: Hit survives eviction")
+path, image = cache.lookup('price', "AAPL", df['close'], {'figsize': (12, 6)})
+assert image is None
+with open(path, 'wb') as f:
+    f.write(b"png bytes")
+path, image = cache.lookup('price', "AAPL", df['close'], {'figsize': (12, 6)})
+os.remove(path)  # another process evicts it
+assert image == b"png bytes"
+assert cache.lookup('price', "AAPL", df['close'], {'figsize': (12, 6)})[1] is None
+
+artifact = plot_price_with_ma(df, "AAPL", cache=cache, in_memory=True)
+assert artifact['image'] == open(first['price'], 'rb').read()
+
+# Test 5: Tickers can't escape the cache directory
+print("\nTest 5: Unsafe tickers")
+for ticker in ("../../etc/evil", "/tmp/x", "BRK/B"):
+    path, _ = cache.lookup('price', ticker, df['close'], {})
+    print(f"{ticker!r} -> {os.path.basename(path)}")
+    assert os.path.dirname(path) == cache.cache_dir and '/' not in os.path.basename(path)
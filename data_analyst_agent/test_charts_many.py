@@ -0,0 +1,65 @@
+"""
+Test file for parallel chart generation.
+
+Runs offline on synthetic prices.
+"""
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+from chart_cache import ChartCache
+from visualizer import generate_all_charts, generate_charts_many
+
+
+def make_prices(seed: int, days: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=days)
+    return pd.DataFrame({'close': 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))}, index=dates)
+
+
+if __name__ == "__main__":
+    frames = {ticker: make_prices(seed) for seed, ticker in enumerate(["AAPL", "MSFT", "NVDA"])}
+    serial = {ticker: generate_all_charts(df, ticker, output_dir=None, in_memory=True) for ticker, df in frames.items()}
+
+    # Test 1: Rendering the three charts on threads gives the serial images
+    print("Test 1: parallel=True")
+    parallel = generate_all_charts(frames['AAPL'], "AAPL", output_dir=None, in_memory=True, parallel=True)
+    assert set(parallel) == {'price', 'rsi', 'drawdown'}
+    assert all(parallel[name]['image'] == serial['AAPL'][name]['image'] for name in parallel)
+
+    # Test 2: Thread and process pools match the serial images
+    for executor in ("thread", "process"):
+        print(f"\nTest 2: executor={executor}")
+        charts = generate_charts_many(frames, output_dir=None, executor=executor, max_workers=2, in_memory=True)
+        assert list(charts) == list(frames)
+        for ticker, ticker_charts in charts.items():
+            for name, chart in ticker_charts.items():
+                assert chart['image'] == serial[ticker][name]['image'], (executor, ticker, name)
+        print(f"Charts for {list(charts)} match the serial run")
+
+    # Test 3: Cache counters add up in both modes, including across processes
+    for executor in ("thread", "process"):
+        print(f"\nTest 3: Cache stats ({executor})")
+        cache = ChartCache(cache_dir=tempfile.mkdtemp())
+        output_dir = tempfile.mkdtemp()
+        first = generate_charts_many(frames, output_dir, executor=executor, max_workers=2, cache=cache)
+        second = generate_charts_many(frames, output_dir, executor=executor, max_workers=2, cache=cache)
+        stats = cache.stats()
+        print(f"Stats: {stats}")
+        assert first == second
+        assert (stats['misses'], stats['hits']) == (9, 9)
+        assert stats['bytes_written'] == stats['total_bytes'] > 0
+
+    # Test 4: A ticker that fails is recorded; the others still render
+    for executor in ("thread", "process"):
+        print(f"\nTest 4: Failing ticker ({executor})")
+        errors = {}
+        broken = dict(frames, BAD=pd.DataFrame({'open': [1.0]}, index=pd.bdate_range("2024-01-01", periods=1)))
+        charts = generate_charts_many(broken, output_dir=None, executor=executor, max_workers=2,
+                                      in_memory=True, errors=errors)
+        print(f"Errors: {errors}")
+        assert list(charts) == ["AAPL", "MSFT", "NVDA"]
+        assert list(errors) == ["BAD"] and errors["BAD"].startswith("KeyError")
+
+    print("\nParallel charts OK")
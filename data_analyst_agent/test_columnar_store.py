@@ -0,0 +1,158 @@
+"""
+Test file for the columnar store module.
+
+Runs offline on synthetic prices.
+"""
+
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from columnar_store import ColumnarStore
+from data_sources import InMemorySource
+from metrics import calculate_max_drawdown, calculate_total_return, calculate_volatility, compute_all_metrics
+
+
+def make_prices(seed: int, days: int, end: str = "2024-12-31") -> pd.DataFrame:
+    """Random-walk OHLCV bars in yfinance's column case."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, days)))
+    return pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                         'Close': close, 'Volume': 1e6}, index=dates)
+
+
+def worker_metrics(store, ticker):
+    """Runs in another process: opens its own maps of the same files."""
+    return compute_all_metrics(store.get_arrays(ticker, "2020-01-01", "2025-01-01"), ticker)
+
+
+if __name__ == "__main__":
+    frames = {'AAPL': make_prices(1, 2000), 'MSFT': make_prices(2, 700, end="2023-06-30"), 'NVDA': make_prices(3, 30)}
+    frames['MSFT'].iloc[10, 3] = np.nan  # cleaned away when the store is written
+    memory = InMemorySource(frames)
+
+    # Test 1: Writing from a generator, one ticker at a time
+    print("Test 1: Write")
+    directory = tempfile.mkdtemp()
+    store = ColumnarStore.write(directory, ((t, df) for t, df in frames.items()))
+    print(store)
+    assert ColumnarStore.is_store(directory) and not ColumnarStore.is_store(tempfile.mkdtemp())
+    assert store.tickers() == ['AAPL', 'MSFT', 'NVDA'] and store.rows == 2000 + 699 + 30
+
+    # Test 2: Range reads are zero-copy views matching the cleaned frames
+    print("\nTest 2: Range reads")
+    for ticker, start, end in [('AAPL', "2020-03-01", "2021-03-01"), ('msft', None, None),
+                               ('NVDA', "2024-12-01", "2030-01-01"), ('AAPL', "1990-01-01", "1990-02-01")]:
+        arrays = store.get_arrays(ticker, start, end)
+        expected = memory.get_prices(ticker, start or "1900-01-01", end or "2100-01-01")
+        print(f"{arrays}")
+        assert len(arrays) == len(expected)
+        if not arrays.empty:
+            assert isinstance(arrays['close'].base, np.memmap) or isinstance(arrays['close'], np.memmap)
+            assert not arrays['close'].flags.writeable
+            pd.testing.assert_frame_equal(arrays.to_frame(), expected, check_freq=False, check_names=False, check_index_type=False)
+    assert store.get_arrays('GOOG').empty and store.get_prices('GOOG', "2020-01-01", "2025-01-01").empty
+    pd.testing.assert_frame_equal(store.get_prices('AAPL', "2022-01-01", "2022-07-01"),
+                                  memory.get_prices('AAPL', "2022-01-01", "2022-07-01"),
+                                  check_freq=False, check_names=False, check_index_type=False)
+
+    # Test 3: Metrics accept the arrays directly
+    print("\nTest 3: Metrics on arrays")
+    for arrays in store.iter_arrays("2022-01-01", "2024-01-01"):
+        df = memory.get_prices(arrays.ticker, "2022-01-01", "2024-01-01")
+        expected = compute_all_metrics(df, arrays.ticker)
+        got = compute_all_metrics(arrays, arrays.ticker)
+        assert got['period'] == expected['period']
+        for key, value in expected['metrics'].items():
+            if isinstance(value, str):
+                assert got['metrics'][key] == value, (arrays.ticker, key)
+            else:
+                assert np.isclose(got['metrics'][key], value, equal_nan=True, atol=1e-6), (arrays.ticker, key)
+        assert np.isclose(calculate_total_return(arrays), calculate_total_return(df))
+        assert np.isclose(calculate_volatility(arrays, annualize=False), calculate_volatility(df, annualize=False))
+        drawdown = calculate_max_drawdown(df)
+        assert calculate_max_drawdown(arrays)['peak_date'] == drawdown['peak_date']
+        print(f"{arrays.ticker}: {got['metrics']['total_return']} total return, {got['period']['trading_days']} days")
+    assert [a.ticker for a in store.iter_arrays("2024-06-01", "2025-01-01")] == ['AAPL', 'NVDA']
+
+    # Empty ranges, unknown tickers and all-NaN closes give an error result, like DataFrames
+    no_bars = [store.get_arrays('AAPL', "1990-01-01", "1990-02-01"), store.get_arrays('GOOG')]
+    for arrays, df in zip(no_bars, [memory.get_prices('AAPL', "1990-01-01", "1990-02-01"), pd.DataFrame()]):
+        got = compute_all_metrics(arrays, arrays.ticker)
+        assert got == compute_all_metrics(df, arrays.ticker)
+        assert got['metrics'] == {} and got['errors'] == [f"No price data for {arrays.ticker}"]
+    arrays = store.get_arrays('NVDA')
+    arrays.columns = dict(arrays.columns, close=np.full(len(arrays), np.nan))
+    assert compute_all_metrics(arrays, 'NVDA')['errors'] == ["No price data for NVDA"]
+    short = store.get_arrays('NVDA', "2024-12-31")
+    assert compute_all_metrics(short, 'NVDA')['period']['trading_days'] == 1
+
+    # Test 4: Worker processes reopen the store instead of receiving the data
+    print("\nTest 4: Worker processes")
+    assert len(pickle.dumps(store)) < 1000
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(worker_metrics, [store] * 3, store.tickers()))
+    assert [r['metrics'] for r in results] == [worker_metrics(store, t)['metrics'] for t in store.tickers()]
+    print(f"Workers computed: {[r['ticker'] for r in results]}")
+
+    # Test 5: Rewriting replaces the store; an empty store opens
+    ColumnarStore.write(directory, {'AAPL': frames['AAPL'].iloc[:50]})
+    assert ColumnarStore(directory).get_arrays('AAPL').dates[-1] == np.datetime64(frames['AAPL'].index[49].date())
+    empty = ColumnarStore.write(tempfile.mkdtemp(), {})
+    assert empty.tickers() == [] and empty.get_arrays('AAPL').empty
+
+    # Test 6: Rewriting under an open reader leaves its view intact
+    print("\nTest 6: Rewrite under a reader")
+    directory = tempfile.mkdtemp()
+    reader = ColumnarStore.write(directory, frames)
+    before = reader.get_arrays('AAPL', "2022-01-01", "2023-01-01").to_frame()
+    for generation in range(3):
+        ColumnarStore.write(directory, {'NVDA': frames['NVDA'], 'AAPL': frames['MSFT'].iloc[:100 + generation]})
+    after = ColumnarStore(directory)
+    print(f"{reader}\n{after}")
+    assert reader.rows == 2000 + 699 + 30 and reader.tickers() == ['AAPL', 'MSFT', 'NVDA']
+    pd.testing.assert_frame_equal(reader.get_arrays('AAPL', "2022-01-01", "2023-01-01").to_frame(), before)
+    assert len(reader.get_arrays('MSFT')) == 699
+    assert after.tickers() == ['AAPL', 'NVDA'] and len(after.get_arrays('AAPL')) == 101  # one NaN row cleaned
+    # The current and previous generations stay, plus the one the reader pins
+    def generations(directory):
+        return sorted({int(name.split('.')[1]) for name in os.listdir(directory) if name.endswith('.f8')})
+    assert generations(directory) == [1, 3, 4]
+    reader.close()
+    ColumnarStore.write(directory, frames)
+    assert generations(directory) == [4, 5]
+
+    # Test 7: Pickled stores keep their generation through two rewrites
+    print("\nTest 7: Pickled store across rewrites")
+    directory = tempfile.mkdtemp()
+    store = ColumnarStore.write(directory, frames)
+    expected = store.get_arrays('AAPL', "2022-01-01", "2023-01-01").to_frame()
+    blob = pickle.dumps(store)
+    worker_copy = pickle.loads(blob)  # e.g. a pool worker that has not read yet
+    store.close()
+    for generation in range(2):
+        ColumnarStore.write(directory, {'AAPL': frames['MSFT'].iloc[:100 + generation]})
+    assert generations(directory) == [1, 2, 3]
+    pd.testing.assert_frame_equal(worker_copy.get_arrays('AAPL', "2022-01-01", "2023-01-01").to_frame(), expected)
+
+    # Pickled while its store is still open, unpickled after the rewrites
+    store = ColumnarStore(directory)
+    blob = pickle.dumps(store)
+    for generation in range(2):
+        ColumnarStore.write(directory, frames)
+    assert len(pickle.loads(blob).get_arrays('AAPL')) == 100 and len(ColumnarStore(directory).get_arrays('AAPL')) == 2000
+
+    # Pins of exited processes don't keep a generation alive
+    worker_copy.close()
+    store.close()
+    with open(os.path.join(directory, "pin.1.999999999.dead"), 'w'):
+        pass
+    ColumnarStore.write(directory, frames)
+    assert generations(directory) == [5, 6] and "pin.1.999999999.dead" not in os.listdir(directory)
+    print(f"Generations on disk: {generations(directory)}")
+
+    print("\nColumnar store OK")
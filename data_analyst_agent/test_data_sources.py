@@ -0,0 +1,95 @@
+"""
+Test file for the data sources module.
+
+Runs offline: in-memory and local-directory sources on synthetic prices.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from agent import DataAnalystAgent
+from data_fetcher import fetch_stock_data, fetch_stocks_bulk
+from data_sources import InMemorySource, LocalDirectorySource
+from price_cache import PriceCache
+
+
+def make_prices(seed: int, days: int = 500) -> pd.DataFrame:
+    """Random-walk OHLCV bars ending 2024-12-31, in yfinance's column case."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2024-12-31", periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, days)))
+    return pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                         'Close': close, 'Volume': 1e6}, index=dates)
+
+
+frames = {'AAPL': make_prices(1), 'MSFT': make_prices(2)}
+
+# Test 1: In-memory range queries are [start, end) slices, cleaned
+print("Test 1: InMemorySource")
+memory = InMemorySource(frames)
+df = memory.get_prices("aapl", "2024-03-01", "2024-04-01")
+print(f"Rows: {len(df)}, columns: {list(df.columns)}, {df.index.min().date()} to {df.index.max().date()}")
+assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+assert df.index.min() >= pd.Timestamp("2024-03-01") and df.index.max() < pd.Timestamp("2024-04-01")
+assert len(df) == len(pd.bdate_range("2024-03-01", "2024-04-01", inclusive='left'))
+assert memory.get_prices("NOPE", "2024-01-01", "2024-02-01").empty
+assert memory.tickers() == ['AAPL', 'MSFT']
+
+# Test 2: Local directory with Parquet and CSV files serves the same bars
+print("\nTest 2: LocalDirectorySource")
+directory = tempfile.mkdtemp()
+local = LocalDirectorySource(directory)
+local.save('AAPL', frames['AAPL'], file_format='parquet')
+csv = frames['MSFT'].reset_index().rename(columns={'index': 'Date'})
+csv.to_csv(os.path.join(directory, 'MSFT.csv'), index=False)
+print(f"Files: {sorted(os.listdir(directory))}, tickers: {local.tickers()}")
+assert local.tickers() == ['AAPL', 'MSFT']
+for ticker in ('AAPL', 'MSFT'):
+    expected = memory.get_prices(ticker, "2024-01-01", "2025-01-01")
+    got = local.get_prices(ticker, "2024-01-01", "2025-01-01")
+    pd.testing.assert_frame_equal(got, expected, check_freq=False, check_names=False)
+assert local.get_prices('GOOG', "2024-01-01", "2025-01-01").empty
+
+# Test 3: Batch range queries skip tickers without data
+batch = local.get_prices_many(['AAPL', 'MSFT', 'GOOG'], "2024-06-01", "2024-07-01")
+print(f"Batch: {sorted(batch)}")
+june = len(pd.bdate_range("2024-06-01", "2024-07-01", inclusive='left'))
+assert sorted(batch) == ['AAPL', 'MSFT'] and all(len(df) == june for df in batch.values())
+results = fetch_stocks_bulk(['AAPL', 'GOOG'], "2024-06-01", "2024-07-01", source=memory)
+assert results['AAPL']['success'] and not results['GOOG']['success']
+assert results['GOOG']['metadata']['errors'] == ["No data found for GOOG"]
+
+# Test 4: Changed files are reloaded
+local.save('AAPL', frames['AAPL'].iloc[:100], file_format='parquet')
+os.utime(local.path_for('AAPL', '.parquet'), (0, 1))
+assert local.get_prices('AAPL', "2000-01-01", "2030-01-01").shape[0] == 100
+
+# Test 5: fetch_stock_data and the agent read from any source
+print("\nTest 5: Agent with a source")
+result = fetch_stock_data("MSFT", "2024-01-01", "2024-12-31", source=local)
+assert result['success'] and result['metadata']['actual_end'] == "2024-12-30"
+
+agent = DataAnalystAgent(output_dir=None, source=memory, chart_mode="vector")
+run = agent.run("AAPL", "2024-01-01", "2024-12-31")
+print(f"Success: {run['success']}, total return: {run['metrics']['total_return']}")
+assert run['success'] and run['period']['trading_days'] == len(memory.get_prices("AAPL", "2024-01-01", "2024-12-31"))
+assert run['metrics'] == agent.run("AAPL", "2024-01-01", "2024-12-31")['metrics']  # deterministic
+
+missing = agent.run("GOOG", "2024-01-01", "2024-12-31")
+assert not missing['success'] and missing['errors'] == ["No data found for GOOG"]
+
+# Test 6: A source can sit behind the price cache
+calls = []
+def counting(ticker, start_date, end_date):
+    calls.append(ticker)
+    return memory.get_prices(ticker, start_date, end_date)
+
+cache = PriceCache(cache_dir=tempfile.mkdtemp(), downloader=counting)
+cached_agent = DataAnalystAgent(output_dir=None, cache=cache, chart_mode="vector")
+first = cached_agent.run("MSFT", "2024-01-01", "2024-12-31")
+second = cached_agent.run("MSFT", "2024-02-01", "2024-11-30")
+assert first['success'] and second['success'] and calls == ['MSFT']
+
+print("\nData sources OK")
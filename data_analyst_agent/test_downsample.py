@@ -0,0 +1,49 @@
+"""
+Test file for the downsample module.
+
+Runs offline on a synthetic 30-year history.
+"""
+
+import numpy as np
+import pandas as pd
+from downsample import downsample, minmax_indices, point_budget
+from metrics import compute_indicators
+
+
+dates = pd.bdate_range("1990-01-01", periods=252 * 30)
+close = 100 * np.exp(np.cumsum(np.random.default_rng(5).normal(0.0003, 0.02, len(dates))))
+df = pd.DataFrame({'close': close}, index=dates)
+indicators = compute_indicators(df)
+
+budget = point_budget((12, 4), 150)
+print(f"Rows: {len(df)}, budget: {budget}")
+
+# Test 1: Extremes survive exactly
+x, lines = downsample(df.index, {'close': df['close'], 'drawdown': indicators['drawdown']}, budget)
+print(f"Kept: {len(x)} points")
+assert len(x) <= budget
+assert lines['close'].max() == df['close'].max() and lines['close'].min() == df['close'].min()
+assert lines['drawdown'].min() == indicators['drawdown'].min()
+assert x[lines['drawdown'].argmin()] == indicators['drawdown'].idxmin()
+assert x[0] == df.index[0] and x[-1] == df.index[-1]
+
+# Test 2: Short series and leading NaNs are handled
+assert len(minmax_indices([np.arange(10.0)], budget)) == 10
+x, lines = downsample(df.index, {'sma_50': indicators['sma_50']}, budget)
+assert np.nanmax(lines['sma_50']) == indicators['sma_50'].max()
+
+# Test 3: max_points=0 disables downsampling
+x, _ = downsample(df.index, {'close': df['close']}, 0)
+assert len(x) == len(df)
+print("Extremes preserved")
+
+# Test 4: The kept points never exceed the budget, whatever the sizes
+for n in (3, 10, 101, 1000, 7561):
+    values = [np.random.default_rng(n).normal(size=n).cumsum() for _ in range(3)]
+    for max_points in (2, 3, 5, 8, 9, 50, 333, 1000, 10000):
+        for n_series in (1, 2, 3):
+            keep = minmax_indices(values[:n_series], max_points)
+            assert len(keep) <= max(max_points, 2), (n, max_points, n_series, len(keep))
+            if n > max_points:
+                assert keep[0] == 0 and keep[-1] == n - 1
+print("Budgets respected")
@@ -0,0 +1,50 @@
+"""
+Test file for the panel metrics module.
+
+Runs offline on synthetic prices and checks every panel metric against
+the per-ticker functions in metrics.py.
+"""
+
+import numpy as np
+import pandas as pd
+from metrics import compute_all_metrics
+from panel_metrics import build_close_panel, compute_panel_metrics
+
+
+# Ragged universe: different start dates, an early delisting, a gap and
+# a flat stretch (RSI with zero losses)
+rng = np.random.default_rng(42)
+dates = pd.bdate_range("2022-01-03", periods=400)
+frames = {}
+for i in range(20):
+    start = int(rng.integers(0, 150))
+    end = len(dates) - int(rng.integers(0, 100))
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, end - start)))
+    frames[f"T{i:02d}"] = pd.DataFrame({'close': close}, index=dates[start:end])
+frames["T00"] = frames["T00"].drop(frames["T00"].index[30:35])
+frames["FLAT"] = pd.DataFrame({'close': np.r_[np.linspace(10, 20, 30), np.full(20, 20.0), np.linspace(20, 21, 20)]},
+                              index=dates[:70])
+frames["SHORT"] = pd.DataFrame({'close': np.linspace(10, 12, 14)}, index=dates[:14])
+
+closes, tickers, panel_dates = build_close_panel(frames)
+print(f"Panel shape: {closes.shape}")
+
+panel = compute_panel_metrics(closes, tickers, panel_dates)
+
+mismatches = 0
+for ticker, df in frames.items():
+    expected = compute_all_metrics(df, ticker)
+    got = panel[ticker]
+    assert got['period'] == expected['period'], (ticker, got['period'], expected['period'])
+    for key, value in expected['metrics'].items():
+        if isinstance(value, str):
+            same = got['metrics'][key] == value
+        else:
+            same = np.isclose(got['metrics'][key], value, equal_nan=True, atol=1e-6)
+        if not same:
+            mismatches += 1
+            print(f"  MISMATCH {ticker} {key}: panel={got['metrics'][key]} per-ticker={value}")
+
+print(f"Tickers checked: {len(frames)}, mismatches: {mismatches}")
+print(f"Example: {panel['T01']['metrics']}")
+assert mismatches == 0
@@ -0,0 +1,126 @@
+"""
+Test file for the price cache module.
+
+Runs offline: a stub downloader stands in for Yahoo Finance.
+"""
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+from data_fetcher import fetch_stock_data
+from price_cache import PriceCache
+
+
+calls = []
+
+def stub_downloader(ticker, start_date, end_date):
+    """Return one bar per business day in [start_date, end_date)."""
+    calls.append((start_date, end_date))
+    dates = pd.bdate_range(start_date, end_date, inclusive='left')
+    close = 100.0 + dates.dayofyear.values
+    return pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close,
+                         'volume': np.full(len(dates), 1000.0)}, index=dates)
+
+
+cache_dir = tempfile.mkdtemp()
+cache = PriceCache(cache_dir=cache_dir, downloader=stub_downloader)
+
+# Test 1: Cold miss downloads the full range
+print("Test 1: Cold miss")
+df = cache.get("AAPL", "2024-01-01", "2024-03-01")
+print(f"Rows: {len(df)}, downloads: {calls}")
+assert calls == [("2024-01-01", "2024-03-01")]
+assert cache.stats()['misses'] == 1
+
+# Test 2: Covered range is a hit with no download
+print("\nTest 2: Hit")
+calls.clear()
+df = cache.get("AAPL", "2024-01-15", "2024-02-15")
+print(f"Rows: {len(df)}, first: {df.index.min().date()}, last: {df.index.max().date()}")
+assert calls == []
+assert df.index.min() >= pd.Timestamp("2024-01-15") and df.index.max() < pd.Timestamp("2024-02-15")
+
+# Test 3: Partial overlap downloads only the missing spans
+print("\nTest 3: Partial hit")
+df = cache.get("AAPL", "2023-12-01", "2024-04-01")
+print(f"Downloads: {calls}")
+assert calls == [("2023-12-01", "2024-01-01"), ("2024-03-01", "2024-04-01")]
+assert df.equals(stub_downloader("AAPL", "2023-12-01", "2024-04-01"))
+calls.pop()
+
+# Test 4: A fresh cache object reloads from disk
+print("\nTest 4: Persistence")
+calls.clear()
+reloaded = PriceCache(cache_dir=cache_dir, downloader=stub_downloader)
+df = reloaded.get("AAPL", "2024-01-01", "2024-03-01")
+print(f"Coverage: {reloaded.coverage('AAPL')}, downloads: {calls}")
+assert calls == []
+assert reloaded.coverage("AAPL") == ("2023-12-01", "2024-04-01")
+
+# Test 5: fetch_stock_data integration and counters
+print("\nTest 5: fetch_stock_data with cache")
+result = fetch_stock_data("aapl", "2024-01-01", "2024-02-01", cache=reloaded)
+print(f"Success: {result['success']}, days: {result['metadata']['trading_days']}")
+print(f"Stats: {reloaded.stats()}")
+assert result['success']
+assert reloaded.stats()['hits'] == 2 and reloaded.stats()['bytes_fetched'] == 0
+
+# Test 6: An empty download for a past range is a failure, not coverage
+print("\nTest 6: Empty download is not cached")
+def failing_downloader(ticker, start_date, end_date):
+    return pd.DataFrame()
+
+flaky = PriceCache(cache_dir=tempfile.mkdtemp(), downloader=failing_downloader)
+assert flaky.get("MSFT", "2024-01-01", "2024-03-01").empty
+assert flaky.coverage("MSFT") is None and flaky.stats()['failed_downloads'] == 1
+flaky.downloader = stub_downloader
+calls.clear()
+df = flaky.get("MSFT", "2024-01-01", "2024-03-01")
+print(f"Rows after recovery: {len(df)}, stats: {flaky.stats()}")
+assert calls == [("2024-01-01", "2024-03-01")] and len(df) > 0
+assert flaky.stats()['hits'] == 0 and flaky.coverage("MSFT") == ("2024-01-01", "2024-03-01")
+
+# A failing trailing span keeps the earlier coverage and is retried
+flaky.downloader = failing_downloader
+assert len(flaky.get("MSFT", "2024-01-01", "2024-04-01")) == len(df)
+assert flaky.coverage("MSFT") == ("2024-01-01", "2024-03-01")
+
+# A span without business days (a weekend) is legitimately empty
+flaky.get("MSFT", "2023-12-30", "2024-03-01")
+assert flaky.coverage("MSFT") == ("2023-12-30", "2024-03-01")
+
+# So is one holding only market holidays, and it is not downloaded again
+failed = flaky.stats()['failed_downloads']
+for start, end in [("2024-12-25", "2024-12-26"), ("2024-03-29", "2024-04-01"), ("2024-06-19", "2024-06-20")]:
+    holiday = PriceCache(cache_dir=tempfile.mkdtemp(), downloader=failing_downloader)
+    holiday.get("MSFT", start, end)
+    holiday.get("MSFT", start, end)
+    assert holiday.coverage("MSFT") == (start, end) and holiday.stats()['downloads'] == 1, start
+assert flaky.stats()['failed_downloads'] == failed
+
+# Test 7: Concurrent saves of one ticker never share a temp file
+print("\nTest 7: Concurrent saves")
+shared_dir = tempfile.mkdtemp()
+errors = []
+
+def save_concurrently(writer):
+    try:
+        for _ in range(20):
+            writer._save("AAPL")
+    except OSError as e:
+        errors.append(e)
+
+writers = [PriceCache(cache_dir=shared_dir, downloader=stub_downloader) for _ in range(8)]
+for w in writers:
+    w.get("AAPL", "2024-01-01", "2024-03-01")
+threads = [threading.Thread(target=save_concurrently, args=(w,)) for w in writers]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert errors == [], errors
+assert not [name for name in os.listdir(shared_dir) if name.endswith('.tmp')]
+assert len(PriceCache(cache_dir=shared_dir, downloader=failing_downloader).get("AAPL", "2024-01-01", "2024-03-01")) > 0
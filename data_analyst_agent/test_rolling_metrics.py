@@ -0,0 +1,41 @@
+"""
+Test file for the rolling metrics module.
+
+Runs offline on synthetic prices and checks the vectorized rolling
+metrics against naive pandas rolling computations.
+"""
+
+import numpy as np
+import pandas as pd
+from rolling_metrics import compute_rolling_metrics, rolling_max_drawdown
+
+
+rng = np.random.default_rng(3)
+dates = pd.bdate_range("2015-01-01", periods=1000)
+df = pd.DataFrame({'close': 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, len(dates))))}, index=dates)
+windows = [1, 5, 21, 63, 252]
+
+
+def naive_mdd(x):
+    return (x / np.maximum.accumulate(x) - 1).min()
+
+
+rolling = compute_rolling_metrics(df, windows)
+print(f"Columns: {list(rolling.columns)}")
+print(rolling.iloc[-1])
+
+returns = df['close'].pct_change()
+for w in windows:
+    expected_ret = df['close'] / df['close'].shift(w) - 1
+    expected_vol = returns.rolling(w).std() * np.sqrt(252)
+    expected_mdd = df['close'].rolling(w).apply(naive_mdd, raw=True)
+    
+    assert np.allclose(rolling[f'return_{w}'], expected_ret, equal_nan=True), w
+    assert np.allclose(rolling[f'volatility_{w}'], expected_vol, equal_nan=True, atol=1e-10), w
+    assert np.allclose(rolling[f'max_drawdown_{w}'], expected_mdd, equal_nan=True), w
+    print(f"Window {w:>3}: matches pandas")
+
+# Window longer than the history is all NaN
+short = rolling_max_drawdown(df.iloc[:10], [21])
+assert short['max_drawdown_21'].isna().all()
+print("Short history: all NaN")
@@ -0,0 +1,80 @@
+"""
+Test file for the streaming metrics module.
+
+Runs offline on synthetic prices and checks MetricsState against
+compute_all_metrics after every stage of updates.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from metrics import compute_all_metrics
+from streaming_metrics import MetricsState
+
+
+rng = np.random.default_rng(7)
+dates = pd.bdate_range("2023-01-02", periods=300)
+close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.018, len(dates))))
+df = pd.DataFrame({'close': close}, index=dates)
+
+
+def same(a, b):
+    """Compare two compute_all_metrics-shaped dicts (NaN-safe)."""
+    if a['period'] != b['period']:
+        return False
+    for key, value in a['metrics'].items():
+        other = b['metrics'][key]
+        if isinstance(value, str):
+            if value != other:
+                return False
+        elif not np.isclose(value, other, equal_nan=True, atol=1e-6):
+            return False
+    return True
+
+
+# Test 1: Seeding from history matches the batch computation
+print("Test 1: Seed from history")
+state = MetricsState.from_frame(df.iloc[:200], "AAPL")
+print(state.snapshot()['metrics'])
+assert same(state.snapshot(), compute_all_metrics(df.iloc[:200], "AAPL"))
+
+# Test 2: Bar-by-bar updates stay in sync
+print("\nTest 2: Bar-by-bar updates")
+for i in range(200, 260):
+    state.update({'date': dates[i], 'close': close[i]})
+    assert same(state.snapshot(), compute_all_metrics(df.iloc[:i + 1], "AAPL")), i
+print(state.snapshot()['metrics'])
+
+# Test 3: Save, reload, keep going
+print("\nTest 3: Persistence")
+path = os.path.join(tempfile.mkdtemp(), "AAPL_state.json")
+state.save(path)
+reloaded = MetricsState.load(path).update_frame(df)
+print(f"Reloaded state at {reloaded.last_date}, {reloaded.count} bars")
+assert same(reloaded.snapshot(), compute_all_metrics(df, "AAPL"))
+
+# Test 4: Intraday preview does not change the state
+print("\nTest 4: Preview")
+before = reloaded.snapshot()
+preview = reloaded.preview(("2024-03-01", close[-1] * 0.5))
+print(f"Preview drawdown: {preview['metrics']['max_drawdown']}")
+assert reloaded.snapshot() == before and preview['metrics']['max_drawdown'] < before['metrics']['max_drawdown']
+
+# Test 5: Short history and out-of-order bars
+print("\nTest 5: Edge cases")
+short = MetricsState.from_frame(df.iloc[:5], "AAPL").snapshot()
+print(f"Short history RSI: {short['metrics']['rsi_current']}")
+assert same(short, compute_all_metrics(df.iloc[:5], "AAPL"))
+try:
+    reloaded.update((dates[0], 1.0))
+    raise AssertionError("out-of-order bar accepted")
+except ValueError as e:
+    print(f"Rejected: {e}")
+
+# Test 6: Wilder smoothing
+print("\nTest 6: Wilder RSI")
+wilder = MetricsState.from_frame(df, "AAPL", rsi_smoothing='wilder')
+print(f"Wilder RSI: {wilder.rsi():.2f}, SMA RSI: {reloaded.rsi():.2f}")
+assert 0 <= wilder.rsi() <= 100
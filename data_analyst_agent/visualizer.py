@@ -1,49 +1,196 @@
 import pandas as pd
-import matplotlib.pyplot as plt
+import io
 import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-def plot_price_with_ma(df: pd.DataFrame, ticker: str, output_dir: str = "outputs") -> str:
+# Explicit Figure + Agg canvas objects instead of the global pyplot state
+# machine, so charts can be rendered from several threads at once
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from metrics import calculate_drawdown_series, calculate_moving_averages, calculate_rsi, compute_indicators
+from downsample import downsample, point_budget
+
+# Shared utilities live in the repo-level shared/ directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from tracing import annotate, bind, traced
+
+CHART_DPI = 150
+
+# Points per line for vector charts (a 6-inch PDF chart is 432pt wide)
+VECTOR_POINTS = 864
+
+
+def _new_figure(figsize: tuple):
+    """Create a standalone figure with its own Agg canvas and one axes."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _render_png(fig: Figure, dpi: int = CHART_DPI) -> dict:
+    """
+    Lay out a figure and render it to PNG bytes in memory.
+    
+    Returns:
+        Chart artifact: dict with 'image' (PNG bytes), 'width' and
+        'height' in pixels, 'dpi', and 'path' (None until written to disk)
+    """
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, dpi=dpi, format='png')
+    
+    width, height = fig.get_size_inches()
+    return {
+        'image': buffer.getvalue(),
+        'width': int(round(width * dpi)),
+        'height': int(round(height * dpi)),
+        'dpi': dpi,
+        'path': None
+    }
+
+
+def _write_png(image: bytes, filepath: str):
+    """Write PNG bytes to disk."""
+    # Write to a temp file first so overlapping runs never see a partial PNG
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(image)
+    os.replace(tmp_path, filepath)
+
+
+def _load_artifact(image: bytes, filepath: str, figsize: tuple, dpi: int = CHART_DPI) -> dict:
+    """Chart artifact for an image read from the chart cache (cache hit)."""
+    return {
+        'image': image,
+        'width': int(round(figsize[0] * dpi)),
+        'height': int(round(figsize[1] * dpi)),
+        'dpi': dpi,
+        'path': filepath
+    }
+
+
+def _finish_chart(fig: Figure, filepath: str, cache, in_memory: bool):
+    """
+    Render a finished figure and hand it back the way the caller asked.
+    
+    Returns:
+        The chart artifact if in_memory, otherwise the saved path
+    """
+    artifact = _render_png(fig)
+    
+    if filepath is not None:
+        _write_png(artifact['image'], filepath)
+        artifact['path'] = filepath
+        if cache is not None:
+            cache.store(filepath)
+    
+    return artifact if in_memory else filepath
+
+
+def _resolve_budget(max_points: int, figsize: tuple) -> int:
+    """Default point budget: one point per horizontal pixel of the figure."""
+    if max_points is None:
+        return point_budget(figsize, CHART_DPI)
+    return max_points
+
+
+def _chart_path(chart_type: str, df: pd.DataFrame, ticker: str, output_dir: str, cache, params: dict) -> tuple:
+    """
+    Decide where a chart goes.
+    
+    Returns:
+        (filepath, image): with a ChartCache, a content-addressed path and
+        the cached PNG bytes if it is already rendered; otherwise
+        {ticker}_{chart_type}.png in output_dir (None if output_dir is
+        None) and None
+    """
+    if cache is not None:
+        return cache.lookup(chart_type, ticker, df['close'], params)
+    
+    if output_dir is None:
+        return None, None
+    
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, f'{ticker}_{chart_type}.png'), None
+
+
+@traced("plot_price")
+def plot_price_with_ma(
+    df: pd.DataFrame,
+    ticker: str,
+    output_dir: str = "outputs",
+    indicators: pd.DataFrame = None,
+    cache=None,
+    max_points: int = None,
+    in_memory: bool = False
+):
     """
     Create price chart with moving averages.
     
     Parameters:
         df: DataFrame with 'close' column
         ticker: Stock symbol (for title)
-        output_dir: Where to save the PNG
+        output_dir: Where to save the PNG (None: don't write to disk)
+        indicators: Precomputed frame from compute_indicators (optional)
+        cache: Optional ChartCache; a hit skips rendering entirely
+        max_points: Downsampling budget per line (default: one point per
+            horizontal pixel; 0 draws every row)
+        in_memory: Return a chart artifact (PNG bytes + dimensions)
+            instead of a path
         
     Returns:
-        Path to saved image
+        Path to saved image, or the chart artifact if in_memory
     """
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    figsize = (12, 6)
+    max_points = _resolve_budget(max_points, figsize)
+    filepath, cached = _chart_path('price', df, ticker, output_dir, cache,
+                                {'figsize': figsize, 'dpi': CHART_DPI, 'windows': [20, 50],
+                                 'max_points': max_points})
+    if cached is not None:
+        return _load_artifact(cached, filepath, figsize) if in_memory else filepath
     
-    # Calculate moving averages
-    sma_20 = df['close'].rolling(window=20).mean()
-    sma_50 = df['close'].rolling(window=50).mean()
+    # Moving averages (reuse the indicator frame when we have one)
+    if indicators is None or 'sma_20' not in indicators or 'sma_50' not in indicators:
+        indicators = calculate_moving_averages(df, [20, 50])
     
-    # Create the plot
-    plt.figure(figsize=(12, 6))
+    # Keep each bucket's extremes so highs/lows are drawn exactly
+    dates, lines = downsample(df.index, {
+        'close': df['close'],
+        'sma_20': indicators['sma_20'],
+        'sma_50': indicators['sma_50']
+    }, max_points)
     
-    plt.plot(df.index, df['close'], label='Price', color='blue', linewidth=1)
-    plt.plot(df.index, sma_20, label='SMA 20', color='orange', linewidth=1)
-    plt.plot(df.index, sma_50, label='SMA 50', color='red', linewidth=1)
+    # Create the plot
+    fig, ax = _new_figure(figsize)
     
-    plt.title(f'{ticker} - Price with Moving Averages')
-    plt.xlabel('Date')
-    plt.ylabel('Price ($)')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.plot(dates, lines['close'], label='Price', color='blue', linewidth=1)
+    ax.plot(dates, lines['sma_20'], label='SMA 20', color='orange', linewidth=1)
+    ax.plot(dates, lines['sma_50'], label='SMA 50', color='red', linewidth=1)
     
-    # Save the figure
-    filepath = os.path.join(output_dir, f'{ticker}_price.png')
-    plt.savefig(filepath, dpi=150)
-    plt.close()
+    ax.set_title(f'{ticker} - Price with Moving Averages')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price ($)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
     
-    return filepath
+    # Save
+    return _finish_chart(fig, filepath, cache, in_memory)
 
 
-def plot_rsi(df: pd.DataFrame, ticker: str, period: int = 14, output_dir: str = "outputs") -> str:
+@traced("plot_rsi")
+def plot_rsi(
+    df: pd.DataFrame,
+    ticker: str,
+    period: int = 14,
+    output_dir: str = "outputs",
+    indicators: pd.DataFrame = None,
+    cache=None,
+    max_points: int = None,
+    in_memory: bool = False
+):
     """
     Create RSI chart with overbought/oversold bands.
     
@@ -51,87 +198,119 @@ def plot_rsi(df: pd.DataFrame, ticker: str, period: int = 14, output_dir: str =
         df: DataFrame with 'close' column
         ticker: Stock symbol
         period: RSI lookback period (default 14)
-        output_dir: Where to save the PNG
+        output_dir: Where to save the PNG (None: don't write to disk)
+        indicators: Precomputed frame from compute_indicators (optional)
+        cache: Optional ChartCache; a hit skips rendering entirely
+        max_points: Downsampling budget per line (default: one point per
+            horizontal pixel; 0 draws every row)
+        in_memory: Return a chart artifact (PNG bytes + dimensions)
+            instead of a path
         
     Returns:
-        Path to saved image
+        Path to saved image, or the chart artifact if in_memory
     """
-    os.makedirs(output_dir, exist_ok=True)
+    figsize = (12, 4)
+    max_points = _resolve_budget(max_points, figsize)
+    filepath, cached = _chart_path('rsi', df, ticker, output_dir, cache,
+                                {'figsize': figsize, 'dpi': CHART_DPI, 'period': period,
+                                 'max_points': max_points})
+    if cached is not None:
+        return _load_artifact(cached, filepath, figsize) if in_memory else filepath
     
-    # Calculate RSI
-    delta = df['close'].diff()
-    gains = delta.where(delta > 0, 0)
-    losses = (-delta).where(delta < 0, 0)
-    avg_gains = gains.rolling(window=period).mean()
-    avg_losses = losses.rolling(window=period).mean()
-    rs = avg_gains / avg_losses
-    rsi = 100 - (100 / (1 + rs))
+    # RSI (reuse the indicator frame when it has this period)
+    if indicators is not None and f'rsi_{period}' in indicators:
+        rsi = indicators[f'rsi_{period}']
+    else:
+        rsi = calculate_rsi(df, period)
+    dates, lines = downsample(df.index, {'rsi': rsi}, max_points)
     
     # Create the plot
-    plt.figure(figsize=(12, 4))
+    fig, ax = _new_figure(figsize)
     
-    plt.plot(df.index, rsi, label='RSI', color='purple', linewidth=1)
+    ax.plot(dates, lines['rsi'], label='RSI', color='purple', linewidth=1)
     
     # Overbought/Oversold lines
-    plt.axhline(y=70, color='red', linestyle='--', label='Overbought (70)')
-    plt.axhline(y=30, color='green', linestyle='--', label='Oversold (30)')
+    ax.axhline(y=70, color='red', linestyle='--', label='Overbought (70)')
+    ax.axhline(y=30, color='green', linestyle='--', label='Oversold (30)')
     
-    plt.title(f'{ticker} - RSI ({period}-day)')
-    plt.xlabel('Date')
-    plt.ylabel('RSI')
-    plt.ylim(0, 100)
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.set_title(f'{ticker} - RSI ({period}-day)')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('RSI')
+    ax.set_ylim(0, 100)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
     
     # Save
-    filepath = os.path.join(output_dir, f'{ticker}_rsi.png')
-    plt.savefig(filepath, dpi=150)
-    plt.close()
-    
-    return filepath
+    return _finish_chart(fig, filepath, cache, in_memory)
 
 
-def plot_drawdown(df: pd.DataFrame, ticker: str, output_dir: str = "outputs") -> str:
+@traced("plot_drawdown")
+def plot_drawdown(
+    df: pd.DataFrame,
+    ticker: str,
+    output_dir: str = "outputs",
+    indicators: pd.DataFrame = None,
+    cache=None,
+    max_points: int = None,
+    in_memory: bool = False
+):
     """
     Create drawdown chart showing peak-to-trough declines.
     
     Parameters:
         df: DataFrame with 'close' column
         ticker: Stock symbol
-        output_dir: Where to save the PNG
+        output_dir: Where to save the PNG (None: don't write to disk)
+        indicators: Precomputed frame from compute_indicators (optional)
+        cache: Optional ChartCache; a hit skips rendering entirely
+        max_points: Downsampling budget per line (default: one point per
+            horizontal pixel; 0 draws every row)
+        in_memory: Return a chart artifact (PNG bytes + dimensions)
+            instead of a path
         
     Returns:
-        Path to saved image
+        Path to saved image, or the chart artifact if in_memory
     """
-    os.makedirs(output_dir, exist_ok=True)
+    figsize = (12, 4)
+    max_points = _resolve_budget(max_points, figsize)
+    filepath, cached = _chart_path('drawdown', df, ticker, output_dir, cache,
+                                {'figsize': figsize, 'dpi': CHART_DPI, 'max_points': max_points})
+    if cached is not None:
+        return _load_artifact(cached, filepath, figsize) if in_memory else filepath
+    
+    # Drawdown (reuse the indicator frame when we have one)
+    if indicators is None or 'drawdown' not in indicators:
+        indicators = calculate_drawdown_series(df)
+    drawdown = indicators['drawdown'] * 100  # As percentage
     
-    # Calculate drawdown
-    prices = df['close']
-    running_max = prices.cummax()
-    drawdown = (prices - running_max) / running_max * 100  # As percentage
+    # Troughs are bucket minimums, so they survive downsampling exactly
+    dates, lines = downsample(df.index, {'drawdown': drawdown}, max_points)
     
     # Create the plot
-    plt.figure(figsize=(12, 4))
+    fig, ax = _new_figure(figsize)
     
-    plt.fill_between(df.index, drawdown, 0, color='red', alpha=0.3)
-    plt.plot(df.index, drawdown, color='red', linewidth=1)
+    ax.fill_between(dates, lines['drawdown'], 0, color='red', alpha=0.3)
+    ax.plot(dates, lines['drawdown'], color='red', linewidth=1)
     
-    plt.title(f'{ticker} - Drawdown')
-    plt.xlabel('Date')
-    plt.ylabel('Drawdown (%)')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.set_title(f'{ticker} - Drawdown')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Drawdown (%)')
+    ax.grid(True, alpha=0.3)
     
     # Save
-    filepath = os.path.join(output_dir, f'{ticker}_drawdown.png')
-    plt.savefig(filepath, dpi=150)
-    plt.close()
-    
-    return filepath
+    return _finish_chart(fig, filepath, cache, in_memory)
 
 
-def generate_all_charts(df: pd.DataFrame, ticker: str, output_dir: str = "outputs") -> dict:
+@traced("generate_all_charts")
+def generate_all_charts(
+    df: pd.DataFrame,
+    ticker: str,
+    output_dir: str = "outputs",
+    indicators: pd.DataFrame = None,
+    parallel: bool = False,
+    cache=None,
+    in_memory: bool = False
+) -> dict:
     """
     Generate all charts for a stock.
     
@@ -140,15 +319,147 @@ def generate_all_charts(df: pd.DataFrame, ticker: str, output_dir: str = "output
     Parameters:
         df: DataFrame with OHLCV data
         ticker: Stock symbol
-        output_dir: Where to save the PNGs
+        output_dir: Where to save the PNGs (None: keep them in memory only)
+        indicators: Precomputed frame from compute_indicators (optional)
+        parallel: Render the three charts on a thread pool
+        cache: Optional ChartCache (charts are then written to its directory)
+        in_memory: Return chart artifacts (PNG bytes, width, height, dpi,
+            path) that generate_pdf_report can embed without reading disk
         
     Returns:
-        dict with paths to all generated charts
+        dict with paths to all generated charts (or artifacts if in_memory)
     """
-    charts = {
-        'price': plot_price_with_ma(df, ticker, output_dir),
-        'rsi': plot_rsi(df, ticker, output_dir=output_dir),
-        'drawdown': plot_drawdown(df, ticker, output_dir)
+    annotate(ticker=ticker, rows=len(df), parallel=parallel, in_memory=in_memory)
+    kwargs = {'output_dir': output_dir, 'indicators': indicators, 'cache': cache, 'in_memory': in_memory}
+    jobs = {
+        'price': plot_price_with_ma,
+        'rsi': plot_rsi,
+        'drawdown': plot_drawdown
     }
     
-    return charts
\ No newline at end of file
+    if not parallel:
+        return {name: func(df, ticker, **kwargs) for name, func in jobs.items()}
+    
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = {name: pool.submit(bind(func), df, ticker, **kwargs) for name, func in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+@traced("chart_series")
+def chart_series(
+    df: pd.DataFrame,
+    indicators: pd.DataFrame = None,
+    rsi_period: int = 14,
+    max_points: int = VECTOR_POINTS
+) -> dict:
+    """
+    Downsampled data behind each chart, for drawing them as vectors.
+    
+    Same lines as plot_price_with_ma / plot_rsi / plot_drawdown, but
+    nothing is rendered; report_generator draws them as native PDF
+    vector graphics.
+    
+    Parameters:
+        df: DataFrame with 'close' column
+        indicators: Precomputed frame from compute_indicators (optional)
+        rsi_period: RSI lookback period
+        max_points: Downsampling budget per line (0 keeps every row)
+        
+    Returns:
+        dict with 'price', 'rsi' and 'drawdown', each a dict with
+        'dates' (DatetimeIndex) and 'lines' (name -> array); the RSI
+        entry also has 'period'
+    """
+    if indicators is None:
+        indicators = compute_indicators(df, rsi_period=rsi_period)
+    
+    rsi = indicators.get(f'rsi_{rsi_period}')
+    if rsi is None:
+        rsi = calculate_rsi(df, rsi_period)
+    
+    series = {
+        'price': {
+            'close': df['close'],
+            'sma_20': indicators['sma_20'],
+            'sma_50': indicators['sma_50']
+        },
+        'rsi': {'rsi': rsi},
+        'drawdown': {'drawdown': indicators['drawdown'] * 100}
+    }
+    
+    charts = {}
+    for name, lines in series.items():
+        dates, lines = downsample(df.index, lines, max_points)
+        charts[name] = {'dates': dates, 'lines': lines}
+    charts['rsi']['period'] = rsi_period
+    return charts
+
+
+def _charts_for_ticker(df: pd.DataFrame, ticker: str, output_dir: str, indicators: pd.DataFrame, cache, in_memory: bool) -> tuple:
+    """
+    Worker for generate_charts_many (module level so it can be pickled).
+    
+    Returns:
+        (charts, counters): the charts, and the cache counters this call
+        added (so a process pool can report them back to the parent)
+    """
+    before = dict(cache.counters) if cache is not None else {}
+    charts = generate_all_charts(df, ticker, output_dir, indicators=indicators, cache=cache, in_memory=in_memory)
+    counters = {name: value - before.get(name, 0) for name, value in cache.counters.items()} if cache is not None else {}
+    return charts, counters
+
+
+def generate_charts_many(
+    frames: dict,
+    output_dir: str = "outputs",
+    indicators: dict = None,
+    executor: str = "process",
+    max_workers: int = None,
+    cache=None,
+    in_memory: bool = False,
+    errors: dict = None
+) -> dict:
+    """
+    Generate all charts for many stocks across a worker pool.
+    
+    Parameters:
+        frames: dict of ticker -> DataFrame with OHLCV data
+        output_dir: Where to save the PNGs
+        indicators: Optional dict of ticker -> compute_indicators frame
+        executor: 'process' (scales across cores) or 'thread'
+        max_workers: Pool size (defaults to the executor's default)
+        cache: Optional ChartCache shared by all workers; process workers
+            use copies of it, whose hit/miss counters are merged back
+        in_memory: Return chart artifacts instead of paths
+        errors: Optional dict filled with ticker -> "Type: message" for
+            the tickers whose charts failed
+        
+    Returns:
+        dict of ticker -> charts (same shape as generate_all_charts); a
+        ticker that failed is left out instead of failing the call
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(f"Unknown executor: {executor}")
+    
+    indicators = indicators or {}
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    
+    results = {}
+    with pool_class(max_workers=max_workers) as pool:
+        futures = {
+            ticker: pool.submit(_charts_for_ticker, df, ticker, output_dir, indicators.get(ticker), cache, in_memory)
+            for ticker, df in frames.items()
+        }
+        for ticker, future in futures.items():
+            try:
+                charts, counters = future.result()
+            except Exception as e:
+                if errors is not None:
+                    errors[ticker] = f"{type(e).__name__}: {e}"
+                continue
+            if executor == "process" and cache is not None:
+                # Threads share the cache object; processes counted on a copy
+                cache.merge_counters(counters)
+            results[ticker] = charts
+    
+    return results
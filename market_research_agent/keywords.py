@@ -0,0 +1,179 @@
+"""
+KEYWORDS MODULE
+
+Streaming keyword counts over headline corpora of any size.
+
+Headlines are consumed one at a time from any iterable (a list, a
+generator over an archive, a database cursor), tokenized with one
+precompiled pattern and counted incrementally, so memory grows with the
+vocabulary, not with the corpus. Counts can be kept per ticker and per
+day, and engines built on separate shards (e.g. in worker processes)
+merge into one.
+"""
+
+import re
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+TOKEN_PATTERN = re.compile(r'\b[a-z]{4,}\b')
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'is', 'are', 'was', 'were', 'be', 'been', 'has', 'have'
+})
+
+
+def tokenize(text: str) -> list:
+    """Lowercase words of 4+ letters, minus stop words."""
+    return [word for word in TOKEN_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def _item_fields(item) -> tuple:
+    """
+    (title, ticker, day) of one headline.
+
+    Accepts a plain string, or a dict with 'title' or 'headline' and
+    optionally 'ticker' and 'day' ('YYYY-MM-DD') or 'datetime' (Unix
+    seconds, as returned by Finnhub).
+    """
+    if isinstance(item, str):
+        return item, None, None
+
+    title = item.get('title') or item.get('headline') or ""
+    day = item.get('day')
+    if day is None and item.get('datetime'):
+        day = datetime.fromtimestamp(item['datetime'], tz=timezone.utc).strftime('%Y-%m-%d')
+    return title, item.get('ticker'), day
+
+
+class KeywordEngine:
+    """
+    Incremental keyword counter with optional per-ticker and per-day windows.
+    """
+
+    def __init__(self, per_ticker: bool = True, per_day: bool = True):
+        """
+        Initialize an empty engine.
+
+        Parameters:
+            per_ticker: Also keep counts per ticker
+            per_day: Also keep counts per day
+        """
+        self.per_ticker = per_ticker
+        self.per_day = per_day
+        self.total = Counter()
+        self.by_ticker = {}
+        self.by_day = {}
+        self.headlines = 0
+
+    def add(self, title: str, ticker: str = None, day: str = None) -> 'KeywordEngine':
+        """Count the keywords of one headline."""
+        words = tokenize(title)
+        self.headlines += 1
+        self.total.update(words)
+
+        if self.per_ticker and ticker is not None:
+            self.by_ticker.setdefault(ticker.upper(), Counter()).update(words)
+        if self.per_day and day is not None:
+            self.by_day.setdefault(day, Counter()).update(words)
+        return self
+
+    def consume(self, items) -> 'KeywordEngine':
+        """
+        Count every headline of an iterable (strings or news dicts).
+
+        Returns:
+            self, so calls can be chained
+        """
+        for item in items:
+            self.add(*_item_fields(item))
+        return self
+
+    def merge(self, other: 'KeywordEngine') -> 'KeywordEngine':
+        """Add another engine's counts (e.g. from a worker shard) to this one."""
+        self.total.update(other.total)
+        self.headlines += other.headlines
+        for windows, other_windows in ((self.by_ticker, other.by_ticker), (self.by_day, other.by_day)):
+            for key, counts in other_windows.items():
+                windows.setdefault(key, Counter()).update(counts)
+        return self
+
+    def top(self, n: int = 10, ticker: str = None, day: str = None) -> list:
+        """
+        Most common keywords overall, for one ticker, or for one day.
+
+        Returns:
+            List of (word, count), like Counter.most_common
+        """
+        if ticker is not None:
+            counts = self.by_ticker.get(ticker.upper(), Counter())
+        elif day is not None:
+            counts = self.by_day.get(day, Counter())
+        else:
+            counts = self.total
+        return counts.most_common(n)
+
+    def top_range(self, start_day: str, end_day: str, n: int = 10) -> list:
+        """Most common keywords over the days in [start_day, end_day]."""
+        counts = Counter()
+        for day, day_counts in self.by_day.items():
+            if start_day <= day <= end_day:
+                counts.update(day_counts)
+        return counts.most_common(n)
+
+    def trend(self, word: str) -> dict:
+        """Daily counts of one keyword, oldest day first."""
+        word = word.lower()
+        return {day: self.by_day[day][word] for day in sorted(self.by_day) if word in self.by_day[day]}
+
+
+def _count_shard(items, per_ticker: bool, per_day: bool) -> KeywordEngine:
+    """Worker for count_keywords (module level so it can be pickled)."""
+    return KeywordEngine(per_ticker, per_day).consume(items)
+
+
+def count_keywords(shards, workers: int = 1, per_ticker: bool = True, per_day: bool = True) -> KeywordEngine:
+    """
+    Count keywords over many shards of headlines and merge the results.
+
+    Parameters:
+        shards: Iterable of headline iterables (e.g. one list per file
+            or per month). With workers > 1 each shard is sent to a
+            worker process, so shards must be picklable (lists, not
+            generators); at most 2 x workers shards are held at once, so
+            shards can come from a generator over a large corpus
+        workers: Worker processes (1 counts in this process)
+        per_ticker: Keep per-ticker counts
+        per_day: Keep per-day counts
+
+    Returns:
+        One merged KeywordEngine
+    """
+    engine = KeywordEngine(per_ticker, per_day)
+
+    if workers <= 1:
+        for shard in shards:
+            engine.consume(shard)
+        return engine
+
+    pending = iter(shards)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+
+        while True:
+            # Keep the pool fed without materializing every shard up front
+            while len(in_flight) < 2 * workers:
+                shard = next(pending, None)
+                if shard is None:
+                    break
+                in_flight.add(pool.submit(_count_shard, shard, per_ticker, per_day))
+
+            if not in_flight:
+                break
+
+            # Counts add up in any order, so merge as shards finish
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                engine.merge(future.result())
+    return engine
@@ -8,18 +8,47 @@ Converted to module by: GG
 """
 
 import requests
+import heapq
 import os
 import re
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from collections import Counter
+
+from keywords import KeywordEngine
+from sentiment import SentimentScorer
+
+# Shared utilities live in the repo-level shared/ directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from resilience import get_provider
+from tracing import annotate, bind, span, traced
 
 # Load API key
 load_dotenv()
 finnhub_key = os.getenv("FINNHUB_API_KEY")
 
-# Initialize sentiment analyzer
-analyzer = SentimentIntensityAnalyzer()
+# HTTP settings (override the URL to point at a stub server in tests)
+FINNHUB_BASE_URL = os.getenv("FINNHUB_BASE_URL", "https://finnhub.io/api/v1")
+CONNECT_TIMEOUT = float(os.getenv("FINNHUB_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("FINNHUB_READ_TIMEOUT", "10"))
+POOL_SIZE = int(os.getenv("FINNHUB_POOL_SIZE", "16"))
+
+# News sampling defaults (how many headlines feed the sentiment stage)
+MAX_HEADLINES = 10
+SAMPLING_POLICIES = ("latest", "uniform")
+
+# Shared keep-alive session and request pool, created on first use
+_session = None
+_session_pid = None
+_request_pool = None
+_http_lock = threading.Lock()
+
+# Shared sentiment scorer (memoizes scores of repeated headlines)
+scorer = SentimentScorer()
 
 def clean_text(text):
     """Clean and normalize text."""
@@ -33,57 +62,256 @@ def clean_text(text):
 
 def get_sentiment_vader(text):
     """Classify sentiment using VADER."""
-    scores = analyzer.polarity_scores(text)
-    compound = scores['compound']
-    if compound >= 0.05:
-        return "Bullish", compound
-    elif compound <= -0.05:
-        return "Bearish", compound
-    else:
-        return "Neutral", compound
+    return scorer.score(text)
+
+
+def get_session():
+    """
+    Return the shared HTTP session.
+    
+    One requests.Session with a pooled adapter, so every Finnhub call
+    reuses an open keep-alive connection instead of a new TCP/TLS
+    handshake. A forked worker process builds its own session.
+    """
+    global _session, _session_pid, _request_pool
+    with _http_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+            _session_pid = os.getpid()
+            _request_pool = None
+        return _session
+
+
+def get_request_pool():
+    """Return the shared thread pool used to issue requests concurrently."""
+    global _request_pool
+    get_session()
+    with _http_lock:
+        if _request_pool is None:
+            _request_pool = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="finnhub")
+        return _request_pool
+
+
+def finnhub_get(path, **params):
+    """
+    GET a Finnhub endpoint and decode the JSON body.
+    
+    Parameters:
+        path: Endpoint path, e.g. '/company-news'
+        params: Query parameters
+    
+    Requests are rate limited, and connection errors, timeouts, 429s and
+    5xx responses retried, by the shared 'finnhub' provider.
+    
+    Returns:
+        Decoded JSON
+    
+    Raises:
+        requests.RequestException on connection errors, timeouts and
+        non-2xx responses (after the retries), CircuitOpenError while
+        Finnhub is considered down
+    """
+    with span("finnhub_get", path=path, symbol=params.get("symbol")):
+        return get_provider("finnhub").call(_finnhub_request, path, params)
+
+
+def _finnhub_request(path, params):
+    """One GET attempt, for finnhub_get."""
+    # Token in a header, so it never shows up in URLs or error messages
+    response = get_session().get(
+        f"{FINNHUB_BASE_URL}{path}",
+        params=params,
+        headers={"X-Finnhub-Token": finnhub_key},
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 def extract_keywords(news_list):
     """Extract top keywords from headlines."""
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                  'of', 'with', 'is', 'are', 'was', 'were', 'be', 'been', 'has', 'have'}
-    all_words = []
-    for item in news_list:
-        words = re.findall(r'\b[a-z]{4,}\b', item['title'].lower())
-        all_words.extend([w for w in words if w not in stop_words])
-    return Counter(all_words).most_common(10)
-
-def fetch_news(ticker, from_date, to_date):
-    """Fetch news headlines from Finnhub."""
+    engine = KeywordEngine(per_ticker=False, per_day=False)
+    return engine.consume(item['title'] for item in news_list).top(10)
+
+
+def fetch_news_raw(ticker, from_date, to_date):
+    """Raw company-news items from Finnhub (dates inclusive)."""
+    return finnhub_get("/company-news", symbol=ticker, **{"from": from_date, "to": to_date})
+
+
+def fetch_earnings_raw(ticker):
+    """Raw earnings history from Finnhub, latest first."""
+    return finnhub_get("/stock/earnings", symbol=ticker)
+
+
+def split_date_range(from_date, to_date, window_days):
+    """
+    Split [from_date, to_date] into consecutive windows of window_days.
+    
+    Returns:
+        List of (start, end) 'YYYY-MM-DD' pairs, both inclusive
+    """
+    start = date.fromisoformat(from_date)
+    last = date.fromisoformat(to_date)
+    windows = []
+    while start <= last:
+        end = min(start + timedelta(days=window_days - 1), last)
+        windows.append((start.isoformat(), end.isoformat()))
+        start = end + timedelta(days=1)
+    return windows
+
+
+def _headline(item):
+    """Cleaned headline dict from a raw Finnhub item (None if it has no title)."""
+    title = clean_text(item.get("headline", ""))
+    if not title:
+        return None
+    return {"title": title, "link": item.get("url", ""), "datetime": item.get("datetime") or 0}
+
+
+def iter_news(ticker, from_date, to_date, window_days=7, cache=None, errors=None):
+    """
+    Stream headlines for a long date range, window by window.
+    
+    The range is split into windows that are requested concurrently on
+    the shared request pool; headlines are yielded as each window
+    arrives, deduplicated by URL and by headline text.
+    
+    Parameters:
+        ticker: Stock symbol
+        from_date: Start date 'YYYY-MM-DD'
+        to_date: End date 'YYYY-MM-DD'
+        window_days: Days per request
+        cache: Optional NewsCache (each window goes through it)
+        errors: Optional list; failed windows are appended to it and
+            skipped. Without it the first failure is raised.
+    
+    Yields:
+        dicts with 'title', 'link' and 'datetime' (Unix seconds)
+    """
+    fetch = cache.get_news if cache is not None else fetch_news_raw
+    pool = get_request_pool()
+    futures = {
+        pool.submit(bind(fetch), ticker, start, end): (start, end)
+        for start, end in split_date_range(from_date, to_date, window_days)
+    }
+    seen = set()
+    
+    try:
+        for future in as_completed(futures):
+            try:
+                data = future.result()
+            except Exception as e:
+                if errors is None:
+                    raise
+                start, end = futures[future]
+                errors.append(f"{start} to {end}: {e}")
+                continue
+            
+            for item in data:
+                headline = _headline(item)
+                if headline is None:
+                    continue
+                keys = {headline["link"], headline["title"].lower()} - {""}
+                if keys & seen:
+                    continue
+                seen.update(keys)
+                yield headline
+    finally:
+        # Stop requesting windows nobody will read
+        for future in futures:
+            future.cancel()
+
+
+def sample_headlines(headlines, max_headlines=MAX_HEADLINES, policy="latest", seed=0):
+    """
+    Pick the headlines that feed the sentiment stage.
+    
+    Consumes any iterable in one pass with memory bounded by max_headlines.
+    
+    Parameters:
+        headlines: Iterable of headline dicts (with 'datetime')
+        max_headlines: Cap (None keeps every headline)
+        policy: 'latest' (newest first) or 'uniform' (random sample over
+            the whole range, reproducible with seed)
+    
+    Returns:
+        List of headline dicts, newest first
+    """
+    if policy not in SAMPLING_POLICIES:
+        raise ValueError(f"Unknown sampling policy: {policy}")
+    
+    newest_first = lambda h: -h.get("datetime", 0)
+    
+    if max_headlines is None:
+        return sorted(headlines, key=newest_first)
+    
+    if policy == "latest":
+        return sorted(heapq.nlargest(max_headlines, headlines, key=lambda h: h.get("datetime", 0)), key=newest_first)
+    
+    # Bottom-k sampling on a seeded hash: uniform, and the same sample
+    # whatever order the windows arrive in
+    rank = lambda h: zlib.crc32(f"{seed}:{h['title']}".encode())
+    return sorted(heapq.nsmallest(max_headlines, headlines, key=rank), key=newest_first)
+
+
+@traced("fetch_news")
+def fetch_news(ticker, from_date, to_date, cache=None, max_headlines=MAX_HEADLINES, sampling="latest", window_days=None):
+    """
+    Fetch news headlines from Finnhub.
+    
+    Parameters:
+        cache: Optional NewsCache; only uncovered days are requested
+        max_headlines: How many headlines to keep (None: all)
+        sampling: 'latest' or 'uniform' (see sample_headlines)
+        window_days: Split the range into windows of this many days,
+            fetched concurrently (None: one request for the whole range)
+    
+    Returns:
+        (headlines, error): list of dicts with 'title', 'link' and
+        'datetime', newest first; error message or None
+    """
     if not finnhub_key:
         return [], "Missing FINNHUB_API_KEY in .env file"
     
-    url = f"https://finnhub.io/api/v1/company-news?symbol={ticker}&from={from_date}&to={to_date}&token={finnhub_key}"
+    if window_days:
+        errors = []
+        headlines = sample_headlines(
+            iter_news(ticker, from_date, to_date, window_days, cache, errors),
+            max_headlines, sampling
+        )
+        if errors and not headlines:
+            return [], f"Error fetching news: {errors[0]}"
+        return headlines, None
     
     try:
-        data = requests.get(url).json()
+        if cache is not None:
+            data = cache.get_news(ticker, from_date, to_date)
+        else:
+            data = fetch_news_raw(ticker, from_date, to_date)
     except Exception as e:
         return [], f"Error fetching news: {e}"
     
-    headlines = []
-    for item in data[:10]:
-        title = clean_text(item.get("headline", ""))
-        link = item.get("url", "")
-        if title:
-            headlines.append({"title": title, "link": link})
-    
-    return headlines, None
+    headlines = (headline for headline in map(_headline, data) if headline is not None)
+    return sample_headlines(headlines, max_headlines, sampling), None
 
 
-def fetch_earnings(ticker):
-    """Fetch latest earnings data from Finnhub."""
+def fetch_earnings(ticker, cache=None):
+    """
+    Fetch latest earnings data from Finnhub.
+    
+    Parameters:
+        cache: Optional NewsCache (earnings are kept for its earnings_ttl)
+    """
     if not finnhub_key:
         return None
     
-    url = f"https://finnhub.io/api/v1/stock/earnings?symbol={ticker}&token={finnhub_key}"
-    
     try:
-        data = requests.get(url).json()
+        data = cache.get_earnings(ticker) if cache is not None else fetch_earnings_raw(ticker)
         if data and len(data) > 0:
             latest = data[0]
             return {
@@ -98,7 +326,8 @@ def fetch_earnings(ticker):
     return None
 
 
-def analyze_market(ticker, from_date, to_date):
+@traced("analyze_market")
+def analyze_market(ticker, from_date, to_date, cache=None, **news_options):
     """
     Main function to analyze market sentiment for a stock.
     
@@ -106,27 +335,32 @@ def analyze_market(ticker, from_date, to_date):
         ticker: Stock symbol (e.g., 'AAPL')
         from_date: Start date 'YYYY-MM-DD'
         to_date: End date 'YYYY-MM-DD'
+        cache: Optional NewsCache for the news and earnings requests
+        news_options: max_headlines, sampling and window_days, passed
+            to fetch_news (defaults: the 10 latest headlines, one request)
     
     Returns:
         dict with sentiment analysis results
     """
-    # Fetch news
-    news, error = fetch_news(ticker, from_date, to_date)
+    annotate(ticker=ticker, from_date=from_date, to_date=to_date)
     
-    if error:
-        return {"success": False, "error": error}
+    # Earnings don't depend on the news, so request them concurrently
+    earnings_future = get_request_pool().submit(bind(fetch_earnings), ticker, cache)
     
-    if not news:
-        return {"success": False, "error": "No news found for this ticker/date range"}
+    # Fetch news
+    news, error = fetch_news(ticker, from_date, to_date, cache, **news_options)
     
-    # Analyze sentiment for each headline
-    sentiments = []
-    compound_scores = []
+    if error or not news:
+        # Drop the earnings request if it has not started yet; a running
+        # one finishes in the background and its result is ignored
+        earnings_future.cancel()
+        return {"success": False, "error": error or "No news found for this ticker/date range"}
     
-    for item in news:
-        sentiment, score = get_sentiment_vader(item['title'])
-        sentiments.append(sentiment)
-        compound_scores.append(score)
+    # Analyze sentiment for all headlines in one batch
+    with span("score_sentiment", headlines=len(news)):
+        scored = scorer.score_many([item['title'] for item in news])
+    sentiments = [sentiment for sentiment, _ in scored]
+    compound_scores = [score for _, score in scored]
     
     # Count sentiments
     bullish = sentiments.count('Bullish')
@@ -160,8 +394,9 @@ def analyze_market(ticker, from_date, to_date):
     if not summary_points:
         summary_points = [f"Analyzed {total} headlines", f"Overall sentiment: {overall_signal}"]
     
-    # Fetch earnings
-    earnings = fetch_earnings(ticker)
+    # Earnings (requested alongside the news)
+    earnings = earnings_future.result()
+    annotate(headlines=total, signal=overall_signal)
     
     return {
         "success": True,
@@ -181,6 +416,35 @@ def analyze_market(ticker, from_date, to_date):
         "earnings": earnings
     }
 
+def analyze_market_many(tickers, from_date, to_date, max_workers=8, cache=None, **news_options):
+    """
+    Analyze market sentiment for many stocks at once.
+    
+    Tickers run concurrently over the shared connection pool; a failing
+    ticker gets an error result without affecting the others.
+    
+    Parameters:
+        tickers: Stock symbols
+        from_date: Start date 'YYYY-MM-DD'
+        to_date: End date 'YYYY-MM-DD'
+        max_workers: Tickers analyzed at the same time
+        cache: Optional NewsCache shared by all tickers
+        news_options: Passed to fetch_news (see analyze_market)
+    
+    Returns:
+        dict of ticker -> analyze_market result
+    """
+    def run(ticker):
+        try:
+            return analyze_market(ticker, from_date, to_date, cache, **news_options)
+        except Exception as e:
+            return {"success": False, "error": f"{type(e).__name__}: {e}"}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {ticker: pool.submit(run, ticker) for ticker in tickers}
+        return {ticker: future.result() for ticker, future in futures.items()}
+
+
 def to_report_format(result):
     """
     Convert output to Report Writer's expected schema.
@@ -0,0 +1,328 @@
+"""
+NEWS CACHE MODULE
+
+Persistent SQLite cache for Finnhub company news and earnings.
+
+News is cached per ticker and per calendar day (UTC). Every day that has
+been requested is recorded with the time it was fetched, so a request
+only goes to Finnhub for the days that are not covered yet (or whose
+cached copy has expired), one narrower request per contiguous gap.
+
+Freshness policies:
+- Historical days (fetched after the day had ended) never change, so
+  they are kept forever by default (historical_ttl)
+- Today's news, or a day fetched while it was still today, expires
+  after today_ttl
+- Earnings expire after earnings_ttl
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from market_research_agent import fetch_earnings_raw, fetch_news_raw
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_items (
+    ticker TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    day TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (ticker, item_key)
+);
+CREATE INDEX IF NOT EXISTS news_items_day ON news_items (ticker, day);
+CREATE TABLE IF NOT EXISTS news_days (
+    ticker TEXT NOT NULL,
+    day TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (ticker, day)
+);
+CREATE TABLE IF NOT EXISTS earnings (
+    ticker TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+
+def _day_end(day: date) -> float:
+    """Unix time at which a UTC calendar day is over."""
+    end = datetime.combine(day + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return end.timestamp()
+
+
+def _days(start: date, end: date) -> list:
+    """Every date in [start, end], both inclusive."""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _item_day(item: dict, default: str) -> tuple:
+    """(day, timestamp) of a Finnhub news item (its 'datetime' is Unix seconds)."""
+    ts = item.get("datetime")
+    if not ts:
+        return default, 0
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d"), int(ts)
+
+
+class NewsCache:
+    """
+    SQLite-backed TTL cache in front of the Finnhub news and earnings calls.
+    """
+
+    def __init__(
+        self,
+        path: str = "cache/finnhub.sqlite",
+        news_fetcher=None,
+        earnings_fetcher=None,
+        historical_ttl: float = None,
+        today_ttl: float = 15 * 60,
+        earnings_ttl: float = 24 * 60 * 60,
+        clock=None
+    ):
+        """
+        Initialize the cache.
+
+        Parameters:
+            path: SQLite database file
+            news_fetcher: Function (ticker, from_date, to_date) -> list of raw
+                Finnhub news items, dates inclusive. Defaults to fetch_news_raw.
+            earnings_fetcher: Function (ticker) -> raw earnings list.
+                Defaults to fetch_earnings_raw.
+            historical_ttl: Seconds a completed day stays fresh (None: forever)
+            today_ttl: Seconds today's news (or a day fetched while still
+                open) stays fresh
+            earnings_ttl: Seconds earnings stay fresh
+            clock: Function returning the current Unix time (for tests)
+        """
+        self.path = path
+        self.news_fetcher = news_fetcher or fetch_news_raw
+        self.earnings_fetcher = earnings_fetcher or fetch_earnings_raw
+        self.historical_ttl = historical_ttl
+        self.today_ttl = today_ttl
+        self.earnings_ttl = earnings_ttl
+        self.clock = clock or time.time
+        self._initialized = False
+
+        # (ticker, day) and (ticker, 'earnings') keys being fetched right
+        # now, so concurrent calls never fetch the same days twice. Keys
+        # are released when the fetch ends, so the set stays small.
+        self._inflight = set()
+        self._cond = threading.Condition()
+
+        self.counters = {
+            'hits': 0,
+            'partial_hits': 0,
+            'misses': 0,
+            'requests': 0,
+            'items_fetched': 0,
+            'earnings_hits': 0,
+            'earnings_misses': 0
+        }
+
+    def get_news(self, ticker: str, from_date: str, to_date: str) -> list:
+        """
+        Return raw Finnhub news items for [from_date, to_date], newest first.
+
+        Only the uncovered or expired days are requested from Finnhub.
+
+        Parameters:
+            ticker: Stock symbol
+            from_date: Start date 'YYYY-MM-DD'
+            to_date: End date 'YYYY-MM-DD' (inclusive, as in Finnhub)
+        """
+        ticker = ticker.upper()
+        first = date.fromisoformat(from_date)
+        last = date.fromisoformat(to_date)
+
+        with self._connect() as conn:
+            def plan():
+                spans, covered = self._missing_spans(conn, ticker, first, last)
+                days = {(ticker, day) for start, end in spans for day in _days(start, end)}
+                return days, (spans, covered)
+
+            # Claims the missing days; windows of one ticker that don't
+            # overlap fetch concurrently, overlapping ones wait and then
+            # only fetch what is still missing
+            days, (spans, covered) = self._claim(plan)
+            try:
+                if not spans:
+                    self._count('hits')
+                elif covered:
+                    self._count('partial_hits')
+                else:
+                    self._count('misses')
+
+                for span_start, span_end in spans:
+                    self._fetch_span(conn, ticker, span_start, span_end)
+            finally:
+                self._release(days)
+
+            rows = conn.execute(
+                "SELECT payload FROM news_items WHERE ticker = ? AND day BETWEEN ? AND ? "
+                "ORDER BY ts DESC, rowid",
+                (ticker, first.isoformat(), last.isoformat())
+            ).fetchall()
+
+        return [json.loads(payload) for (payload,) in rows]
+
+    def get_earnings(self, ticker: str) -> list:
+        """
+        Return the raw Finnhub earnings list, refreshed after earnings_ttl.
+        """
+        ticker = ticker.upper()
+        now = self.clock()
+
+        # Separate key from the news days, so both can be fetched at once
+        keys, _ = self._claim(lambda: ({(ticker, 'earnings')}, None))
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT fetched_at, payload FROM earnings WHERE ticker = ?", (ticker,)
+                ).fetchone()
+                if row is not None and now - row[0] < self.earnings_ttl:
+                    self._count('earnings_hits')
+                    return json.loads(row[1])
+
+                self._count('earnings_misses')
+                self._count('requests')
+                data = self.earnings_fetcher(ticker)
+                conn.execute(
+                    "INSERT OR REPLACE INTO earnings (ticker, fetched_at, payload) VALUES (?, ?, ?)",
+                    (ticker, now, json.dumps(data))
+                )
+                return data
+        finally:
+            self._release(keys)
+
+    def stats(self) -> dict:
+        """Return hit/miss/request counters."""
+        with self._cond:
+            stats = dict(self.counters)
+        lookups = stats['hits'] + stats['partial_hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def coverage(self, ticker: str) -> list:
+        """Return the cached news days for a ticker, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day FROM news_days WHERE ticker = ? ORDER BY day", (ticker.upper(),)
+            ).fetchall()
+        return [day for (day,) in rows]
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Short-lived connection per call, so the cache is safe to share across threads."""
+        if not self._initialized:
+            # Create the database on first use, not at import time
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+            finally:
+                conn.close()
+            self._initialized = True
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _claim(self, plan) -> tuple:
+        """
+        Claim the keys a fetch is about to work on.
+
+        plan() returns (keys, info) and is re-run after every wait, since
+        the thread that held a key may have fetched it meanwhile. All keys
+        are claimed at once, so two callers can't deadlock.
+
+        Returns:
+            (keys, info) from the plan that could be claimed
+        """
+        with self._cond:
+            while True:
+                keys, info = plan()
+                if not keys & self._inflight:
+                    self._inflight |= keys
+                    return keys, info
+                self._cond.wait()
+
+    def _release(self, keys: set):
+        with self._cond:
+            self._inflight -= keys
+            self._cond.notify_all()
+
+    def _count(self, name: str, n: int = 1):
+        with self._cond:
+            self.counters[name] += n
+
+    def _is_fresh(self, day: date, fetched_at: float, now: float) -> bool:
+        """Apply the historical / today TTL policy to one cached day."""
+        if fetched_at >= _day_end(day):
+            # Fetched after the day ended: the news for it is final
+            return self.historical_ttl is None or now - fetched_at < self.historical_ttl
+        return now - fetched_at < self.today_ttl
+
+    def _missing_spans(self, conn: sqlite3.Connection, ticker: str, first: date, last: date) -> tuple:
+        """
+        Contiguous runs of days that need fetching.
+
+        Returns:
+            (spans, covered): list of (start, end) dates (inclusive), and
+            whether any requested day was served from the cache
+        """
+        fetched = dict(conn.execute(
+            "SELECT day, fetched_at FROM news_days WHERE ticker = ? AND day BETWEEN ? AND ?",
+            (ticker, first.isoformat(), last.isoformat())
+        ).fetchall())
+        now = self.clock()
+
+        spans = []
+        covered = False
+        day = first
+        while day <= last:
+            fetched_at = fetched.get(day.isoformat())
+            if fetched_at is not None and self._is_fresh(day, fetched_at, now):
+                covered = True
+            elif spans and spans[-1][1] == day - timedelta(days=1):
+                spans[-1] = (spans[-1][0], day)
+            else:
+                spans.append((day, day))
+            day += timedelta(days=1)
+
+        return spans, covered
+
+    def _fetch_span(self, conn: sqlite3.Connection, ticker: str, start: date, end: date):
+        """Fetch one uncovered span and record its days as covered."""
+        now = self.clock()
+        items = self.news_fetcher(ticker, start.isoformat(), end.isoformat())
+        self._count('requests')
+        self._count('items_fetched', len(items))
+
+        rows = []
+        for item in items:
+            day, ts = _item_day(item, start.isoformat())
+            key = str(item.get("id") or item.get("url") or item.get("headline"))
+            rows.append((ticker, key, day, ts, json.dumps(item)))
+        conn.executemany(
+            "INSERT OR REPLACE INTO news_items (ticker, item_key, day, ts, payload) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+        days = [(ticker, day.isoformat(), now) for day in _days(start, end)]
+        conn.executemany(
+            "INSERT OR REPLACE INTO news_days (ticker, day, fetched_at) VALUES (?, ?, ?)",
+            days
+        )
+        conn.commit()
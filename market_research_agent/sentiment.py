@@ -0,0 +1,154 @@
+"""
+SENTIMENT MODULE
+
+Memoized, batched VADER scoring for news headlines.
+
+The same wire headline shows up for many tickers and on every run, so
+scores are memoized in a bounded LRU keyed by the headline with its
+whitespace normalized (VADER is case- and punctuation-sensitive, so
+nothing else is changed). score_many dedupes a whole batch, scores only
+the unseen headlines, and can spread large batches across processes.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+
+# Per-process analyzer for worker processes, built on first use
+_worker_analyzer = None
+
+
+def classify(compound: float) -> str:
+    """Map a VADER compound score to Bullish / Bearish / Neutral."""
+    if compound >= 0.05:
+        return "Bullish"
+    elif compound <= -0.05:
+        return "Bearish"
+    return "Neutral"
+
+
+def normalize(text: str) -> str:
+    """Memo key for a headline: surrounding and repeated whitespace removed."""
+    return " ".join(text.split())
+
+
+def _score_chunk(texts: list) -> list:
+    """Compound scores for a chunk of headlines (worker process entry point)."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SentimentIntensityAnalyzer()
+    return [_worker_analyzer.polarity_scores(text)['compound'] for text in texts]
+
+
+class SentimentScorer:
+    """
+    VADER scorer with a bounded LRU memo of compound scores.
+    """
+
+    def __init__(self, maxsize: int = 100_000, analyzer=None):
+        """
+        Initialize the scorer.
+
+        Parameters:
+            maxsize: Most headlines kept in the memo (least recently used
+                are dropped first)
+            analyzer: SentimentIntensityAnalyzer to reuse (optional)
+        """
+        self.maxsize = maxsize
+        self.analyzer = analyzer or SentimentIntensityAnalyzer()
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def score(self, text: str) -> tuple:
+        """
+        Score one headline.
+
+        Returns:
+            (label, compound), same as get_sentiment_vader
+        """
+        return self.score_many([text])[0]
+
+    def score_many(self, texts: list, workers: int = 1, chunk_size: int = 2000) -> list:
+        """
+        Score a batch of headlines.
+
+        Duplicates within the batch and headlines already in the memo are
+        scored once.
+
+        Parameters:
+            texts: Headlines
+            workers: Processes for the unseen headlines (1 scores in this
+                process; pools only pay off for tens of thousands)
+            chunk_size: Headlines per worker task
+
+        Returns:
+            List of (label, compound), in the order of texts
+        """
+        keys = [normalize(text) for text in texts]
+        compounds = {}
+        missing = []
+
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    compounds[key] = self._memo[key]
+                else:
+                    missing.append(key)
+            self.counters['hits'] += len(keys) - len(missing)
+            self.counters['misses'] += len(missing)
+
+        if missing:
+            scores = self._score_missing(missing, workers, chunk_size)
+            compounds.update(zip(missing, scores))
+            self._remember(zip(missing, scores))
+
+        return [(classify(compounds[key]), compounds[key]) for key in keys]
+
+    def _score_missing(self, texts: list, workers: int, chunk_size: int) -> list:
+        if workers <= 1 or len(texts) <= chunk_size:
+            return [self.analyzer.polarity_scores(text)['compound'] for text in texts]
+
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return [score for chunk in pool.map(_score_chunk, chunks) for score in chunk]
+
+    def _remember(self, items):
+        with self._lock:
+            for key, compound in items:
+                self._memo[key] = compound
+                self._memo.move_to_end(key)
+            while len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and memo size."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['size'] = len(self._memo)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def save(self, path: str):
+        """Write the memo to a JSON file (least recently used first)."""
+        with self._lock:
+            items = list(self._memo.items())
+        with open(path, 'w') as f:
+            json.dump(items, f)
+
+    def load(self, path: str):
+        """Add the memo entries saved by save()."""
+        with open(path) as f:
+            self._remember(json.load(f))
@@ -0,0 +1,93 @@
+"""
+Test file for the keyword engine.
+
+Runs offline on synthetic headlines.
+"""
+
+import random
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import keywords
+from keywords import KeywordEngine, count_keywords
+
+
+def legacy_extract_keywords(news_list):
+    """The original per-call implementation, for comparison."""
+    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+                  'of', 'with', 'is', 'are', 'was', 'were', 'be', 'been', 'has', 'have'}
+    all_words = []
+    for item in news_list:
+        words = re.findall(r'\b[a-z]{4,}\b', item['title'].lower())
+        all_words.extend([w for w in words if w not in stop_words])
+    return Counter(all_words).most_common(10)
+
+
+random.seed(1)
+words = ["surge", "earnings", "lawsuit", "growth", "chips", "have", "been", "rates", "record", "with"]
+news = [
+    {
+        'title': " ".join(random.choice(words).capitalize() for _ in range(6)),
+        'ticker': random.choice(["aapl", "msft"]),
+        'day': f"2024-03-{random.randint(1, 9):02d}"
+    }
+    for _ in range(2000)
+]
+
+# Test 1: Same top keywords as the original implementation
+engine = KeywordEngine().consume(news)
+print(f"Top 5: {engine.top(5)}")
+assert engine.top(10) == legacy_extract_keywords(news)
+
+# Test 2: Per-ticker and per-day windows add up to the total
+assert sum((engine.by_ticker[t] for t in engine.by_ticker), Counter()) == engine.total
+assert sum((engine.by_day[d] for d in engine.by_day), Counter()) == engine.total
+assert engine.top(3, ticker="AAPL") == legacy_extract_keywords([n for n in news if n['ticker'] == "aapl"])[:3]
+assert engine.top_range("2024-03-01", "2024-03-09") == engine.top(10)
+assert sum(engine.trend("surge").values()) == engine.total["surge"]
+
+# Test 3: Streaming from a generator, Finnhub-style items
+stream = ({'headline': n['title'], 'datetime': 1709294400} for n in news)
+streamed = KeywordEngine(per_ticker=False).consume(stream)
+assert streamed.total == engine.total and list(streamed.by_day) == ["2024-03-01"]
+
+# Test 4: Merged shards (serial and across processes) match one pass
+shards = [news[i:i + 300] for i in range(0, len(news), 300)]
+serial = count_keywords(shards)
+parallel = count_keywords(shards, workers=2)
+for merged in (serial, parallel):
+    assert merged.total == engine.total and merged.headlines == len(news)
+    assert merged.by_day == engine.by_day and merged.by_ticker == engine.by_ticker
+
+# Test 5: Shards from a generator are pulled a window at a time
+pulled = []
+
+def shard_stream():
+    for i, shard in enumerate(shards * 5):
+        pulled.append(i)
+        yield shard
+
+class CountingPool(ThreadPoolExecutor):
+    """Thread pool that tracks the most shards submitted but not yet merged."""
+    outstanding = peak = 0
+
+    def submit(self, fn, *args, **kwargs):
+        CountingPool.outstanding += 1
+        CountingPool.peak = max(CountingPool.peak, CountingPool.outstanding)
+        future = super().submit(fn, *args, **kwargs)
+        original = future.result
+        def result(timeout=None):
+            CountingPool.outstanding -= 1
+            return original(timeout)
+        future.result = result
+        return future
+
+keywords.ProcessPoolExecutor = CountingPool
+streamed = count_keywords(shard_stream(), workers=2)
+keywords.ProcessPoolExecutor = ProcessPoolExecutor
+print(f"Streamed {len(pulled)} shards, at most {CountingPool.peak} in flight")
+assert CountingPool.peak <= 4
+assert len(pulled) == len(shards) * 5 and streamed.headlines == 5 * len(news)
+assert streamed.total == Counter({word: 5 * count for word, count in engine.total.items()})
+print("Keyword engine OK")
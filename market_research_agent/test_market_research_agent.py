@@ -0,0 +1,111 @@
+"""
+Test file for the Market Research Agent HTTP client.
+
+Runs offline against a local stub HTTP server standing in for Finnhub.
+"""
+
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import market_research_agent as mra
+from resilience import configure_provider
+
+
+DELAY = 0.3
+stats = {'connections': 0, 'requests': 0, 'earnings': []}
+
+
+class StubFinnhub(BaseHTTPRequestHandler):
+    """Canned company-news and earnings responses, each after DELAY seconds."""
+    protocol_version = "HTTP/1.1"  # keep-alive
+    
+    def setup(self):
+        stats['connections'] += 1
+        super().setup()
+    
+    def do_GET(self):
+        stats['requests'] += 1
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        symbol = query['symbol'][0]
+        assert self.headers['X-Finnhub-Token'] == 'test-key'
+        
+        if url.path.endswith('/stock/earnings'):
+            stats['earnings'].append(symbol)
+        if symbol == 'SLOW':
+            time.sleep(2)
+        time.sleep(DELAY)
+        
+        if symbol == 'DOWN':
+            body, status = {'error': 'Internal error'}, 500
+        elif url.path.endswith('/company-news'):
+            body, status = [
+                {'headline': f'{symbol} shares surge on record profit', 'url': 'http://x/1'},
+                {'headline': f'{symbol} faces lawsuit over losses', 'url': 'http://x/2'},
+                {'headline': f'{symbol} beats estimates, strong growth', 'url': 'http://x/3'}
+            ], 200
+        else:
+            body, status = [{'actual': 1.5, 'estimate': 1.4, 'surprisePercent': 7.1, 'period': '2024-09-30'}], 200
+        
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), StubFinnhub)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+mra.FINNHUB_BASE_URL = f"http://127.0.0.1:{server.server_port}/api/v1"
+mra.finnhub_key = 'test-key'
+mra.READ_TIMEOUT = 1.0
+# No throttling or retries here: these tests time the connection pool
+configure_provider('finnhub', rate=1000, burst=1000, max_retries=0, state_dir=tempfile.mkdtemp())
+
+
+# Test 1: News and earnings are requested concurrently
+start = time.perf_counter()
+result = mra.analyze_market('AAPL', '2024-01-01', '2024-01-31')
+elapsed = time.perf_counter() - start
+print(f"analyze_market: {elapsed:.2f}s, signal {result['overall_signal']}, earnings {result['earnings']}")
+assert result['success'] and result['headlines_analyzed'] == 3
+assert result['earnings']['actual_eps'] == 1.5
+assert elapsed < 2 * DELAY and stats['earnings'] == ['AAPL']
+
+# A failed news fetch returns its error without waiting for the earnings
+start = time.perf_counter()
+failed = mra.analyze_market('DOWN', '2024-01-01', '2024-01-31')
+assert not failed['success'] and time.perf_counter() - start < 2 * DELAY
+
+# Test 2: Connections are reused across calls
+before = dict(stats)
+for _ in range(3):
+    mra.fetch_earnings('AAPL')
+opened = stats['connections'] - before['connections']
+print(f"3 sequential requests opened {opened} new connection(s)")
+assert opened == 0
+
+# Test 3: Many tickers fan out over the pool; failures stay isolated
+tickers = ['MSFT', 'GOOG', 'DOWN', 'SLOW', 'NVDA', 'AMZN']
+start = time.perf_counter()
+results = mra.analyze_market_many(tickers, '2024-01-01', '2024-01-31')
+elapsed = time.perf_counter() - start
+for ticker, r in results.items():
+    print(f"  {ticker}: {'OK' if r['success'] else r['error'][:60]}")
+print(f"analyze_market_many: {len(tickers)} tickers in {elapsed:.2f}s")
+assert list(results) == tickers
+assert [results[t]['success'] for t in tickers] == [True, True, False, False, True, True]
+assert 'timed out' in results['SLOW']['error']
+assert elapsed < 2 * DELAY + mra.READ_TIMEOUT
+
+server.shutdown()
+print("HTTP client OK")
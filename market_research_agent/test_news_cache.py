@@ -0,0 +1,126 @@
+"""
+Test file for the news cache.
+
+Runs offline with a fake Finnhub fetcher and a fake clock.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from news_cache import NewsCache
+
+
+def ts(day, hour=12):
+    return int(datetime.fromisoformat(f"{day}T{hour:02d}:00:00+00:00").timestamp())
+
+
+calls = []
+
+
+def fake_news(ticker, from_date, to_date):
+    calls.append((from_date, to_date))
+    items = []
+    for day in range(int(from_date[-2:]), int(to_date[-2:]) + 1):
+        d = f"2024-03-{day:02d}"
+        items.append({'id': f'{ticker}-{d}', 'headline': f'{ticker} news on {d}', 'datetime': ts(d)})
+    return items[::-1]
+
+
+def fake_earnings(ticker):
+    calls.append(('earnings', ticker))
+    return [{'actual': 1.0, 'estimate': 0.9, 'surprisePercent': 11.1, 'period': '2024-03-31'}]
+
+
+now = [ts("2024-03-20", 15)]
+cache = NewsCache(os.path.join(tempfile.mkdtemp(), "finnhub.sqlite"),
+                  news_fetcher=fake_news, earnings_fetcher=fake_earnings,
+                  today_ttl=600, earnings_ttl=3600, clock=lambda: now[0])
+
+# Test 1: Miss, then hit
+items = cache.get_news("AAPL", "2024-03-05", "2024-03-10")
+assert len(items) == 6 and items[0]['id'] == 'AAPL-2024-03-10'
+assert cache.get_news("aapl", "2024-03-05", "2024-03-10") == items
+assert calls == [("2024-03-05", "2024-03-10")]
+print(f"Hit after miss: {cache.stats()}")
+
+# Test 2: Only the uncovered portion is requested
+calls.clear()
+items = cache.get_news("AAPL", "2024-03-01", "2024-03-12")
+print(f"Wider range requested: {calls}")
+assert calls == [("2024-03-01", "2024-03-04"), ("2024-03-11", "2024-03-12")]
+assert len(items) == 12
+
+# Test 3: Today's news expires after today_ttl, historical days don't
+calls.clear()
+cache.get_news("AAPL", "2024-03-19", "2024-03-20")
+now[0] += 300
+cache.get_news("AAPL", "2024-03-19", "2024-03-20")
+assert calls == [("2024-03-19", "2024-03-20")]
+now[0] += 600
+cache.get_news("AAPL", "2024-03-19", "2024-03-20")
+print(f"After today_ttl: {calls}")
+assert calls == [("2024-03-19", "2024-03-20"), ("2024-03-20", "2024-03-20")]
+
+# Test 4: A day fetched while it was still open is refreshed once it has ended
+calls.clear()
+now[0] = ts("2024-03-22", 1)
+cache.get_news("AAPL", "2024-03-19", "2024-03-20")
+assert calls == [("2024-03-20", "2024-03-20")]
+cache.get_news("AAPL", "2024-03-19", "2024-03-20")
+assert len(calls) == 1
+
+# Test 5: Earnings TTL
+calls.clear()
+cache.get_earnings("AAPL")
+cache.get_earnings("AAPL")
+now[0] += 3600
+cache.get_earnings("AAPL")
+assert calls == [('earnings', 'AAPL'), ('earnings', 'AAPL')]
+
+# Test 6: The cache persists across instances
+calls.clear()
+reopened = NewsCache(cache.path, news_fetcher=fake_news, earnings_fetcher=fake_earnings, clock=lambda: now[0])
+assert len(reopened.get_news("AAPL", "2024-03-01", "2024-03-12")) == 12
+assert calls == []
+print(f"Stats: {cache.stats()}")
+
+# Test 7: Concurrent overlapping windows of one ticker fetch each day once
+fetched_days = []
+active = [0, 0]  # current, peak concurrent fetches
+guard = threading.Lock()
+
+def slow_news(ticker, from_date, to_date):
+    with guard:
+        active[0] += 1
+        active[1] = max(active)
+    time.sleep(0.1)
+    items = fake_news(ticker, from_date, to_date)
+    with guard:
+        active[0] -= 1
+        fetched_days.extend(item['id'] for item in items)
+    return items
+
+calls.clear()
+threaded = NewsCache(os.path.join(tempfile.mkdtemp(), "finnhub.sqlite"), news_fetcher=slow_news,
+                     earnings_fetcher=fake_earnings, clock=lambda: now[0])
+# Whichever window starts first, another one is disjoint from it
+windows = [("2024-03-01", "2024-03-07"), ("2024-03-05", "2024-03-12"), ("2024-03-13", "2024-03-19")] * 4
+with ThreadPoolExecutor(max_workers=8) as pool:
+    results = list(pool.map(lambda w: threaded.get_news("MSFT", *w), windows))
+    earnings = list(pool.map(threaded.get_earnings, ["MSFT"] * 8))
+results.append(threaded.get_news("MSFT", "2024-03-01", "2024-03-19"))
+windows.append(("2024-03-01", "2024-03-19"))
+stats = threaded.stats()
+print(f"Concurrent windows: {len(calls)} requests, peak {active[1]} at once, stats {stats}")
+assert sorted(fetched_days) == sorted(set(fetched_days)) and len(fetched_days) == 19
+assert active[1] >= 2  # disjoint windows still fetch at the same time
+assert [len(r) for r in results] == [7, 8, 7] * 4 + [19]
+assert stats['hits'] + stats['partial_hits'] + stats['misses'] == len(windows)
+assert stats['requests'] == len(calls) and stats['items_fetched'] == 19
+assert stats['earnings_misses'] == 1 and stats['earnings_hits'] == 7
+assert threaded._inflight == set()
+print("News cache OK")
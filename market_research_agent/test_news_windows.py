@@ -0,0 +1,132 @@
+"""
+Test file for windowed news fetching.
+
+Runs offline against a local stub HTTP server that serves a year of
+fixture headlines, truncated per response like Finnhub.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import market_research_agent as mra
+from news_cache import NewsCache
+from resilience import configure_provider
+
+
+PAGE_LIMIT = 30  # items per response, newest first
+DELAY = 0.1
+
+
+def fixture_items():
+    """Three headlines per day in 2024; every Monday story is syndicated twice."""
+    items = []
+    day = date(2024, 1, 1)
+    while day.year == 2024:
+        for hour in (9, 13, 17):
+            ts = int(datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc).timestamp())
+            items.append({'id': ts, 'datetime': ts, 'url': f'http://news/{ts}',
+                          'headline': f'Company update {day.isoformat()} at {hour}h'})
+        if day.weekday() == 0:
+            # Same story under another URL
+            items.append(dict(items[-1], id=items[-1]['id'] + 1, url=items[-1]['url'] + '?syndicated'))
+        day += timedelta(days=1)
+    return items
+
+
+FIXTURE = fixture_items()
+requests_seen = []
+
+
+class StubFinnhub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.endswith('/stock/earnings'):
+            self.reply([])
+            return
+        
+        start, end = query['from'][0], query['to'][0]
+        requests_seen.append((start, end))
+        time.sleep(DELAY)
+        
+        if start == '2024-06-01' and query['symbol'][0] == 'FLAKY':
+            self.send_error(503)
+            return
+        
+        day = lambda item: datetime.fromtimestamp(item['datetime'], tz=timezone.utc).date().isoformat()
+        page = [item for item in FIXTURE if start <= day(item) <= end]
+        self.reply(sorted(page, key=lambda item: -item['datetime'])[:PAGE_LIMIT])
+    
+    def reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), StubFinnhub)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+mra.FINNHUB_BASE_URL = f"http://127.0.0.1:{server.server_port}/api/v1"
+mra.finnhub_key = 'test-key'
+# Unthrottled, with quick retries (the FLAKY window is retried, then reported)
+finnhub = configure_provider('finnhub', rate=1000, burst=1000, backoff_base=0.01, state_dir=tempfile.mkdtemp())
+
+
+# Test 1: One request only sees the newest page
+news, error = mra.fetch_news('AAPL', '2024-01-01', '2024-12-31', max_headlines=None)
+print(f"Single request: {len(news)} headlines")
+assert error is None and len(news) == PAGE_LIMIT
+
+# Test 2: Weekly windows reach the whole year, concurrently, without duplicates
+requests_seen.clear()
+start = time.perf_counter()
+news, error = mra.fetch_news('AAPL', '2024-01-01', '2024-12-31', max_headlines=None, window_days=7)
+elapsed = time.perf_counter() - start
+titles = [h['title'] for h in news]
+print(f"Weekly windows: {len(news)} headlines from {len(requests_seen)} requests in {elapsed:.2f}s")
+assert error is None and len(requests_seen) == 53
+assert len(news) == 366 * 3 and len(set(titles)) == len(titles)
+assert [h['datetime'] for h in news] == sorted((h['datetime'] for h in news), reverse=True)
+assert elapsed < len(requests_seen) * DELAY / 2
+
+# Test 3: Cap and sampling policies
+latest, _ = mra.fetch_news('AAPL', '2024-01-01', '2024-12-31', max_headlines=25, window_days=7)
+assert latest == news[:25]
+uniform, _ = mra.fetch_news('AAPL', '2024-01-01', '2024-12-31', max_headlines=25, sampling='uniform', window_days=7)
+months = {datetime.fromtimestamp(h['datetime'], tz=timezone.utc).month for h in uniform}
+print(f"Uniform sample covers {len(months)} months")
+assert len(uniform) == 25 and len(months) >= 6
+again, _ = mra.fetch_news('AAPL', '2024-01-01', '2024-12-31', max_headlines=25, sampling='uniform', window_days=7)
+assert again == uniform
+
+# Test 4: Streaming; a failed window is reported, the rest still arrive
+errors = []
+streamed = list(mra.iter_news('FLAKY', '2024-05-01', '2024-06-30', window_days=31, errors=errors))
+print(f"Streamed {len(streamed)} headlines, errors: {errors}")
+assert len(errors) == 1 and errors[0].startswith('2024-06-01 to 2024-06-30')
+assert 0 < len(streamed) <= PAGE_LIMIT and 'token' not in errors[0]
+assert all(h['title'].startswith('Company update 202405') for h in streamed)
+assert finnhub.stats()['retries'] == finnhub.max_retries
+
+# Test 5: Windows go through the news cache; a repeat run makes no requests
+cache = NewsCache(os.path.join(tempfile.mkdtemp(), 'finnhub.sqlite'))
+result = mra.analyze_market('AAPL', '2024-01-01', '2024-03-31', cache=cache, max_headlines=50, window_days=7)
+requests_seen.clear()
+again = mra.analyze_market('AAPL', '2024-01-01', '2024-03-31', cache=cache, max_headlines=50, window_days=7)
+assert result['headlines_analyzed'] == 50 and again == result and requests_seen == []
+
+server.shutdown()
+print("Windowed news OK")
@@ -0,0 +1,55 @@
+"""
+Test file for the sentiment scorer.
+
+Runs offline; needs vaderSentiment.
+"""
+
+import os
+import tempfile
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from sentiment import SentimentScorer, classify
+
+
+analyzer = SentimentIntensityAnalyzer()
+headlines = [
+    "Apple shares surge on record profit",
+    "Apple faces lawsuit over losses",
+    "Apple to hold annual meeting",
+    "  Apple shares   surge on record profit ",
+    "APPLE SHARES SURGE ON RECORD PROFIT!",
+]
+
+# Test 1: Same results as scoring each headline with VADER directly
+scorer = SentimentScorer(maxsize=3)
+scored = scorer.score_many(headlines)
+for text, (label, compound) in zip(headlines, scored):
+    expected = analyzer.polarity_scores(text)['compound']
+    print(f"  {label:<8} {compound:+.4f}  {text!r}")
+    assert compound == expected and label == classify(expected)
+
+# Test 2: Whitespace variants share a memo entry; case variants don't
+stats = scorer.stats()
+print(f"Stats: {stats}")
+assert stats['misses'] == 4 and stats['hits'] == 1
+
+# Test 3: The memo is bounded (least recently used dropped)
+assert stats['size'] == 3 and stats['evictions'] == 1
+scorer.score("Apple faces lawsuit over losses")
+assert scorer.stats()['hits'] == 2
+
+# Test 4: Process pool gives the same scores
+corpus = [f"{text} {i % 50}" for i in range(600) for text in headlines[:3]]
+serial = SentimentScorer().score_many(corpus)
+parallel = SentimentScorer().score_many(corpus, workers=2, chunk_size=40)
+assert serial == parallel
+
+# Test 5: The memo can be saved and reloaded
+path = os.path.join(tempfile.mkdtemp(), "sentiment.json")
+scorer.save(path)
+reloaded = SentimentScorer()
+reloaded.load(path)
+assert reloaded.score_many(headlines[1:3]) == scored[1:3]
+assert reloaded.stats()['misses'] == 0
+print("Sentiment scorer OK")
@@ -10,29 +10,222 @@ Flow:
 4. Report Writer Agent → final report
 """
 
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
 import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 sys.path.append('data_analyst_agent')
 sys.path.append('market_research_agent')
 sys.path.append('report_writer')
+sys.path.append('shared')
 
 from agent import DataAnalystAgent
+from price_cache import PriceCache
+from data_sources import LocalDirectorySource
+from columnar_store import ColumnarStore
+from chart_cache import ChartCache
 from market_research_agent import analyze_market, to_report_format as market_to_report
+from news_cache import NewsCache
 from report_writer_agent import generate_full_report
 from report_generator import generate_pdf_report
+from resilience import provider_stats
+import tracing
 
+# Shared across runs so repeat analyses only download new bars
+price_cache = PriceCache(cache_dir="data_analyst_agent/cache")
 
-def run_analysis(ticker: str, start_date: str, end_date: str) -> str:
+
+def open_data_dir(directory: str):
+    """A columnar store (memory-mapped) or per-ticker price files."""
+    if ColumnarStore.is_store(directory):
+        return ColumnarStore(directory)
+    return LocalDirectorySource(directory)
+
+
+# Local price data (a columnar store, or <TICKER>.parquet / .csv files) to
+# run without network access; Yahoo Finance through price_cache when unset
+DATA_DIR = os.getenv("FINCREW_DATA_DIR")
+price_source = open_data_dir(DATA_DIR) if DATA_DIR else None
+chart_cache = ChartCache(cache_dir="data_analyst_agent/cache/charts")
+news_cache = NewsCache(path="market_research_agent/cache/finnhub.sqlite")
+
+CHARTS_DIR = "data_analyst_agent/outputs"
+CHART_MODES = ("raster", "vector")
+
+
+# Used when the Market Research Agent cannot produce a result
+FALLBACK_MARKET_DATA = {
+    "sentiment": "Neutral",
+    "confidence_score": 0.0,
+    "key_risks": ["Unable to fetch news data"],
+    "summary": ["Market research unavailable"]
+}
+
+SUPPORTED_FORMATS = ("text", "pdf")
+
+
+class AnalysisError(Exception):
+    """An agent could not produce the data the report needs."""
+
+
+def check_formats(formats):
+    """Raise ValueError for any output format not in SUPPORTED_FORMATS."""
+    for fmt in formats:
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported output format: {fmt}")
+
+
+@tracing.traced("market_research", stage=True)
+def run_market_research(ticker: str, start_date: str, end_date: str) -> dict:
+    """
+    Run the Market Research Agent and convert its output for the report.
+    
+    Returns:
+        market_research dict (fallback data if the agent failed)
+    """
+    market_result = analyze_market(ticker, start_date, end_date, cache=news_cache)
+    
+    if not market_result['success']:
+        print(f"  ⚠ Warning: {market_result['error']}")
+        return dict(FALLBACK_MARKET_DATA)
+    
+    market_data = market_to_report(market_result)["market_research"]
+    print(f"  ✓ Sentiment: {market_data['sentiment']}")
+    print(f"  ✓ Confidence: {market_data['confidence_score']}")
+    return market_data
+
+
+@tracing.traced("data_analyst", stage=True)
+def run_data_analyst(ticker: str, start_date: str, end_date: str, chart_mode: str = "raster") -> dict:
+    """
+    Run the Data Analyst Agent.
+    
+    Parameters:
+        chart_mode: 'raster' (PNG charts) or 'vector' (chart series drawn
+            as vector graphics in the PDF)
+    
+    Returns:
+        (DataAnalystAgent.run result, quant_analysis dict)
+    
+    Raises:
+        AnalysisError: if the agent failed (e.g. no price data)
+    """
+    # Charts come back as in-memory artifacts so the PDF embeds them
+    # without reading them back from disk
+    analyst = DataAnalystAgent(
+        output_dir=CHARTS_DIR,
+        cache=price_cache if price_source is None else None,
+        source=price_source,
+        chart_cache=chart_cache,
+        in_memory_charts=True,
+        chart_mode=chart_mode
+    )
+    quant_result = analyst.run(ticker, start_date, end_date)
+    
+    if not quant_result['success']:
+        raise AnalysisError("; ".join(quant_result.get('errors') or ["Unknown error"]))
+    
+    print(f"  ✓ Total Return: {quant_result['metrics']['total_return']*100:.2f}%")
+    print(f"  ✓ Volatility: {quant_result['metrics']['volatility_annual']*100:.2f}%")
+    chart_path = quant_result['charts']['price'].get('path')
+    if chart_path:
+        print(f"  ✓ Charts saved to: {os.path.dirname(chart_path)}/")
+    return quant_result, analyst.to_report_format(quant_result)["quant_analysis"]
+
+
+@tracing.traced("write_report", stage=True)
+def build_run_result(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    market_data: dict,
+    quant_result: dict,
+    quant_data: dict
+) -> dict:
+    """
+    Combine both agents' outputs into one run result and write the text report.
+    """
+    report = generate_full_report(market_data, quant_data)
+    print("  ✓ Report generated!")
+    
+    return {
+        'ticker': ticker,
+        'period': {'start': start_date, 'end': end_date},
+        'market_data': market_data,
+        'quant_data': quant_data,
+        'metrics': quant_result['metrics'],
+        'charts': quant_result['charts'],
+        'report': report,
+        'outputs': {'text': report}
+    }
+
+
+@tracing.traced("build_outputs", stage=True)
+def build_outputs(run: dict, formats=("text",)) -> dict:
+    """
+    Build every requested output format from one run result.
+    
+    Parameters:
+        run: Result of run_analysis
+        formats: Any of 'text', 'pdf'
+    
+    Returns:
+        dict of format -> output (report text, or path to the PDF)
+    """
+    check_formats(formats)
+    
+    if "pdf" in formats and "pdf" not in run['outputs']:
+        run['outputs']['pdf'] = generate_pdf_report(
+            ticker=run['ticker'],
+            start_date=run['period']['start'],
+            end_date=run['period']['end'],
+            market_data=run['market_data'],
+            quant_data=run['quant_data'],
+            charts=run['charts']
+        )
+    
+    return {fmt: run['outputs'][fmt] for fmt in formats}
+
+
+@tracing.traced("run_analysis")
+def run_analysis(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    formats=("text",),
+    chart_mode: str = "raster",
+    raise_errors: bool = False
+) -> dict:
     """
     Run complete financial analysis pipeline.
     
+    Each agent runs once; every output format is built from the same result.
+    
     Parameters:
         ticker: Stock symbol (e.g., 'AAPL')
         start_date: Format 'YYYY-MM-DD'
         end_date: Format 'YYYY-MM-DD'
+        formats: Outputs to build, any of 'text', 'pdf'
+        chart_mode: 'raster' or 'vector' charts in the PDF report
+        raise_errors: Raise AnalysisError on failure instead of printing
+            the reason and returning None
     
     Returns:
-        Complete financial report as string
+        Run result dict with market_data, quant_data, metrics, charts,
+        report text and 'outputs' (format -> output), or None on failure
     """
+    check_formats(formats)
+    tracing.annotate(ticker=ticker, start_date=start_date, end_date=end_date,
+                     formats=list(formats), chart_mode=chart_mode)
+    
     print(f"\n{'='*60}")
     print(f"FINCREW ANALYSIS: {ticker}")
     print(f"Period: {start_date} to {end_date}")
@@ -40,45 +233,316 @@ def run_analysis(ticker: str, start_date: str, end_date: str) -> str:
     
     # Step 1: Market Research
     print("[1/3] Running Market Research Agent...")
-    market_result = analyze_market(ticker, start_date, end_date)
-    
-    if not market_result['success']:
-        print(f"  ⚠ Warning: {market_result['error']}")
-        # Use fallback data
-        market_data = {
-            "sentiment": "Neutral",
-            "confidence_score": 0.0,
-            "key_risks": ["Unable to fetch news data"],
-            "summary": ["Market research unavailable"]
-        }
-    else:
-        market_data = market_to_report(market_result)["market_research"]
-        print(f"  ✓ Sentiment: {market_data['sentiment']}")
-        print(f"  ✓ Confidence: {market_data['confidence_score']}")
+    market_data = run_market_research(ticker, start_date, end_date)
     
     # Step 2: Data Analyst
     print("\n[2/3] Running Data Analyst Agent...")
-    analyst = DataAnalystAgent(output_dir="data_analyst_agent/outputs")
-    quant_result = analyst.run(ticker, start_date, end_date)
-    
-    if not quant_result['success']:
-        print(f"  ✗ Error: {quant_result.get('errors', 'Unknown error')}")
+    try:
+        quant = run_data_analyst(ticker, start_date, end_date, chart_mode)
+    except AnalysisError as e:
+        if raise_errors:
+            raise
+        print(f"  ✗ Error: {e}")
         return None
     
-    quant_data = analyst.to_report_format(quant_result)["quant_analysis"]
-    print(f"  ✓ Total Return: {quant_result['metrics']['total_return']*100:.2f}%")
-    print(f"  ✓ Volatility: {quant_result['metrics']['volatility_annual']*100:.2f}%")
-    print(f"  ✓ Charts saved to: data_analyst_agent/outputs/")
-    
     # Step 3: Generate Report
     print("\n[3/3] Generating Report...")
-    report = generate_full_report(market_data, quant_data)
-    print("  ✓ Report generated!")
+    quant_result, quant_data = quant
+    run = build_run_result(ticker, start_date, end_date, market_data, quant_result, quant_data)
+    build_outputs(run, formats)
     
-    return report
+    return run
 
 
-if __name__ == "__main__":
+@tracing.traced("run_analysis_async")
+async def run_analysis_async(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    formats=("text",),
+    executor=None,
+    chart_mode: str = "raster",
+    raise_errors: bool = False
+) -> dict:
+    """
+    Async version of run_analysis for embedding in an event loop.
+    
+    The Market Research Agent (Finnhub HTTP) and the Data Analyst Agent
+    (Yahoo download + metrics + charts) don't depend on each other, so
+    both run concurrently in an executor and are only joined before the
+    report is written. Latency is roughly max(market, quant) instead of
+    their sum, and the event loop is never blocked.
+    
+    Parameters:
+        ticker: Stock symbol (e.g., 'AAPL')
+        start_date: Format 'YYYY-MM-DD'
+        end_date: Format 'YYYY-MM-DD'
+        formats: Outputs to build, any of 'text', 'pdf'
+        executor: concurrent.futures executor for the blocking work
+            (defaults to the loop's default thread pool)
+        chart_mode: 'raster' or 'vector' charts in the PDF report
+        raise_errors: Raise AnalysisError on failure instead of returning None
+    
+    Returns:
+        Same run result as run_analysis, or None on failure
+    """
+    check_formats(formats)
+    loop = asyncio.get_running_loop()
+    tracing.annotate(ticker=ticker, start_date=start_date, end_date=end_date,
+                     formats=list(formats), chart_mode=chart_mode)
+    
+    print(f"\nFINCREW ANALYSIS (async): {ticker} {start_date} to {end_date}")
+    
+    # Steps 1 + 2: both agents at once
+    try:
+        market_data, quant = await asyncio.gather(
+            loop.run_in_executor(executor, tracing.bind(run_market_research), ticker, start_date, end_date),
+            loop.run_in_executor(executor, tracing.bind(run_data_analyst), ticker, start_date, end_date, chart_mode)
+        )
+    except AnalysisError as e:
+        if raise_errors:
+            raise
+        print(f"  ✗ Error: {e}")
+        return None
+    
+    # Step 3: Generate Report (PDF rendering is blocking, so it goes to the executor too)
+    quant_result, quant_data = quant
+    run = build_run_result(ticker, start_date, end_date, market_data, quant_result, quant_data)
+    await loop.run_in_executor(executor, tracing.bind(build_outputs), run, formats)
+    
+    return run
+
+
+def load_tickers(path: str) -> list:
+    """
+    Read a ticker list file.
+    
+    One or more symbols per line (comma or whitespace separated);
+    blank lines and '#' comments are skipped, duplicates dropped.
+    """
+    tickers = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            for symbol in line.replace(',', ' ').split():
+                symbol = symbol.upper()
+                if symbol not in tickers:
+                    tickers.append(symbol)
+    return tickers
+
+
+def _run_batch_item(ticker: str, start_date: str, end_date: str, formats, chart_mode: str = "raster") -> dict:
+    """
+    Run one ticker inside a worker process.
+    
+    Any failure is caught and returned, so one bad ticker never takes
+    down the batch.
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    counters_before = provider_stats()
+    
+    run = None
+    error = None
+    try:
+        with contextlib.redirect_stdout(log):
+            run = run_analysis(ticker, start_date, end_date, formats=formats, chart_mode=chart_mode,
+                               raise_errors=True)
+    except AnalysisError as e:
+        error = str(e)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    
+    if run is not None:
+        # The outputs are built; don't ship the chart images back to the parent
+        run['charts'] = {name: chart.get('path') for name, chart in run['charts'].items()}
+    
+    item = {
+        'ticker': ticker,
+        'success': run is not None,
+        'error': error,
+        'elapsed': round(time.perf_counter() - start, 3),
+        'providers': _provider_counters_since(counters_before),
+        'result': run
+    }
+    
+    _, profiling = tracing.settings()
+    if profiling:
+        # Stage profiles go back to the parent, which writes one report
+        item['profiles'] = tracing.collect_profiles()
+    return item
+
+
+def _provider_counters_since(before: dict) -> dict:
+    """Rate-limit/retry counters this worker added since the before snapshot."""
+    delta = {}
+    for name, stats in provider_stats().items():
+        previous = before.get(name, {})
+        delta[name] = {key: value - previous.get(key, 0) for key, value in stats.items()
+                       if isinstance(value, (int, float))}
+    return delta
+
+
+def _failed_item(ticker: str, error: Exception) -> dict:
+    """Batch result for a ticker whose worker never returned (e.g. it crashed the pool)."""
+    return {
+        'ticker': ticker,
+        'success': False,
+        'error': f"{type(error).__name__}: {error}",
+        'elapsed': 0.0,
+        'providers': {},
+        'result': None
+    }
+
+
+def _new_batch_pool(max_workers: int) -> ProcessPoolExecutor:
+    # Workers trace and profile like the parent (also under spawn)
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=tracing.configure,
+                               initargs=tracing.settings())
+
+
+def run_batch(
+    tickers: list,
+    start_date: str,
+    end_date: str,
+    formats=("text",),
+    max_workers: int = None,
+    max_in_flight: int = None,
+    chart_mode: str = "raster"
+) -> dict:
+    """
+    Run the analysis pipeline over a ticker universe on a process pool.
+    
+    A ticker whose worker dies fails on its own: the pool is rebuilt and
+    the tickers that were in flight with it are run again.
+    
+    Parameters:
+        tickers: Stock symbols
+        start_date: Format 'YYYY-MM-DD'
+        end_date: Format 'YYYY-MM-DD'
+        formats: Outputs to build per ticker, any of 'text', 'pdf'
+        max_workers: Worker processes (defaults to the CPU count)
+        max_in_flight: Maximum submitted-but-unfinished tickers
+            (defaults to 2 x max_workers)
+        chart_mode: 'raster' or 'vector' charts in the PDF reports
+    
+    Returns:
+        Summary dict with counts, throughput, failures and per-ticker results
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * max_workers
+    
+    results = {}
+    pending = iter(tickers)
+    start = time.perf_counter()
+    
+    # A worker that dies breaks the whole pool and fails every ticker in
+    # flight with it. Those tickers become suspects: the pool is rebuilt
+    # and each suspect is run again on its own, so only a ticker that
+    # breaks the pool by itself is reported as failed.
+    suspects = deque()
+    isolated = None
+    in_flight = {}
+    pool = _new_batch_pool(max_workers)
+    
+    def record(item):
+        results[item['ticker']] = item
+        status = "✓" if item['success'] else "✗"
+        print(f"  {status} {item['ticker']} ({item['elapsed']:.1f}s) [{len(results)}/{len(tickers)}]")
+    
+    def submit(ticker):
+        future = pool.submit(_run_batch_item, ticker, start_date, end_date, tuple(formats), chart_mode)
+        in_flight[future] = ticker
+    
+    broken = False
+    try:
+        while True:
+            if broken and not in_flight:
+                pool.shutdown(wait=True)
+                pool = _new_batch_pool(max_workers)
+                broken = False
+            
+            try:
+                if broken:
+                    pass  # the old pool's futures are still failing out
+                elif suspects:
+                    # Suspects run alone, once the rest of the pool has drained
+                    if not in_flight:
+                        isolated = suspects[0]
+                        submit(isolated)
+                        suspects.popleft()
+                else:
+                    # Keep the pool fed without queueing the whole universe up front
+                    while len(in_flight) < max_in_flight:
+                        ticker = next(pending, None)
+                        if ticker is None:
+                            break
+                        try:
+                            submit(ticker)
+                        except BrokenProcessPool:
+                            # Never ran, so not at fault: submit it to the new pool
+                            pending = itertools.chain([ticker], pending)
+                            raise
+            except BrokenProcessPool:
+                # A worker died since the last wait
+                broken = True
+            
+            if not in_flight:
+                if broken:
+                    continue
+                break
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                ticker = in_flight.pop(future)
+                try:
+                    item = future.result()
+                except BrokenProcessPool as e:
+                    broken = True
+                    if ticker == isolated:
+                        # It broke a pool it had to itself
+                        record(_failed_item(ticker, e))
+                    else:
+                        suspects.append(ticker)
+                    continue
+                except Exception as e:
+                    # The worker's result could not be pickled
+                    item = _failed_item(ticker, e)
+                tracing.merge_profiles(item.pop('profiles', {}))
+                record(item)
+            
+            if not in_flight:
+                isolated = None
+    finally:
+        pool.shutdown(wait=True)
+    
+    elapsed = time.perf_counter() - start
+    failures = {t: r['error'] for t, r in results.items() if not r['success']}
+    
+    # Throttle waits and retries summed over every worker
+    providers = {}
+    for item in results.values():
+        for name, counters in item.get('providers', {}).items():
+            totals = providers.setdefault(name, {})
+            for key, value in counters.items():
+                totals[key] = round(totals.get(key, 0) + value, 3)
+    
+    return {
+        'period': {'start': start_date, 'end': end_date},
+        'total': len(results),
+        'succeeded': len(results) - len(failures),
+        'failed': len(failures),
+        'workers': max_workers,
+        'elapsed_seconds': round(elapsed, 2),
+        'tickers_per_second': round(len(results) / elapsed, 3) if elapsed > 0 else 0.0,
+        'failures': failures,
+        'providers': providers,
+        'results': results
+    }
+
+
+def main_interactive(chart_mode: str = "raster"):
+    """Prompt for one ticker and build the text and PDF reports."""
     # Get user input
     print("\n" + "="*60)
     print("FINCREW - AI Financial Analysis System")
@@ -88,41 +552,82 @@ if __name__ == "__main__":
     start_date = input("Enter start date (YYYY-MM-DD): ").strip()
     end_date = input("Enter end date (YYYY-MM-DD): ").strip()
     
-    # Run analysis
-    report = run_analysis(ticker, start_date, end_date)
+    # Run analysis once and build both outputs from the same result
+    run = run_analysis(ticker, start_date, end_date, formats=["text", "pdf"], chart_mode=chart_mode)
     
-    if report:
+    if run:
         print("\n" + "="*60)
         print("FINAL REPORT")
         print("="*60)
-        print(report)
-        
-        # Generate PDF
-        print("\nGenerating PDF report...")
-        
-        # Get the data again for PDF
-        market_result = analyze_market(ticker, start_date, end_date)
-        if market_result['success']:
-            market_data = market_to_report(market_result)["market_research"]
-        else:
-            market_data = {
-                "sentiment": "Neutral",
-                "confidence_score": 0.0,
-                "key_risks": ["Unable to fetch news data"],
-                "summary": ["Market research unavailable"]
-            }
+        print(run['report'])
         
-        analyst = DataAnalystAgent(output_dir="data_analyst_agent/outputs")
-        quant_result = analyst.run(ticker, start_date, end_date)
-        quant_data = analyst.to_report_format(quant_result)["quant_analysis"]
-        
-        pdf_path = generate_pdf_report(
-            ticker=ticker,
-            start_date=start_date,
-            end_date=end_date,
-            market_data=market_data,
-            quant_data=quant_data
-        )
-        
-        print(f"\n✓ PDF Report saved to: {pdf_path}")
-        print(f"✓ Charts embedded in report")
\ No newline at end of file
+        print(f"\n✓ PDF Report saved to: {run['outputs']['pdf']}")
+        print(f"✓ Charts embedded in report")
+
+
+def main_batch(args):
+    """Run a ticker list file through run_batch and print a summary."""
+    tickers = load_tickers(args.batch)
+    print(f"\nFINCREW BATCH: {len(tickers)} tickers, {args.start} to {args.end}")
+    
+    summary = run_batch(
+        tickers,
+        args.start,
+        args.end,
+        formats=args.formats,
+        max_workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        chart_mode=args.chart_mode
+    )
+    
+    print(f"\n{'='*60}")
+    print(f"Succeeded: {summary['succeeded']}/{summary['total']}")
+    print(f"Elapsed:   {summary['elapsed_seconds']}s ({summary['tickers_per_second']} tickers/s, {summary['workers']} workers)")
+    for name, counters in summary['providers'].items():
+        print(f"{name + ':':<10} {counters['calls']} calls, {counters['throttle_waits']} throttle waits "
+              f"({counters['throttle_seconds']}s), {counters['retries']} retries, "
+              f"{counters['circuit_rejections']} rejected while down")
+    for ticker, error in summary['failures'].items():
+        print(f"  ✗ {ticker}: {error}")
+    
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2, default=str)
+        print(f"Summary written to: {args.summary}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FinCrew - AI Financial Analysis System")
+    parser.add_argument("--batch", metavar="FILE", help="Ticker list file; runs in batch mode instead of prompting")
+    parser.add_argument("--start", help="Start date (YYYY-MM-DD), batch mode")
+    parser.add_argument("--end", help="End date (YYYY-MM-DD), batch mode")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Maximum tickers queued at once (default: 2 x workers)")
+    parser.add_argument("--formats", nargs="+", default=["text"], choices=SUPPORTED_FORMATS, help="Outputs per ticker")
+    parser.add_argument("--chart-mode", default="raster", choices=CHART_MODES, help="PDF charts as PNG images or native vector drawings")
+    parser.add_argument("--summary", metavar="FILE", help="Write the batch summary as JSON")
+    parser.add_argument("--data-dir", metavar="DIR", help="Read prices from a columnar store or local <TICKER>.parquet/.csv files instead of Yahoo Finance")
+    parser.add_argument("--trace", metavar="FILE", help="Append per-stage tracing spans to FILE as JSON lines ('-' for stderr)")
+    parser.add_argument("--profile", metavar="FILE", help="Profile each pipeline stage with cProfile and write the stats to FILE")
+    args = parser.parse_args()
+    
+    if args.batch and not (args.start and args.end):
+        parser.error("--batch requires --start and --end")
+    
+    tracing.configure(trace_path=args.trace, profile=bool(args.profile))
+    
+    if args.data_dir:
+        # Through the environment too, so spawned batch workers pick it up
+        os.environ["FINCREW_DATA_DIR"] = args.data_dir
+        price_source = open_data_dir(args.data_dir)
+    
+    if args.batch:
+        main_batch(args)
+    else:
+        main_interactive(chart_mode=args.chart_mode)
+    
+    if args.trace and args.trace != "-":
+        print(f"Trace written to: {args.trace}")
+    if args.profile:
+        stages = tracing.write_profile(args.profile)
+        print(f"Profile of {len(stages)} stage(s) written to: {args.profile} (+ .<stage>.prof)")
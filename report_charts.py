@@ -0,0 +1,193 @@
+"""
+VECTOR REPORT CHARTS
+=====================
+Draws the price/SMA, RSI and drawdown charts as native reportlab vector
+graphics, from the series returned by visualizer.chart_series.
+
+Vector charts stay sharp at any zoom and are a fraction of the size of
+the 150-dpi PNGs, and building them skips matplotlib entirely.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+from reportlab.graphics.shapes import Drawing, Group, Line, PolyLine, Polygon, Rect, String
+from reportlab.lib.colors import HexColor
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# Plot area margins inside the drawing (points)
+LEFT, RIGHT, BOTTOM, TOP = 42, 8, 26, 22
+
+AXIS_COLOR = HexColor('#4a5568')
+GRID_COLOR = HexColor('#e2e8f0')
+FONT = 'Helvetica'
+
+
+def _nice_ticks(low: float, high: float, count: int = 5) -> list:
+    """Round tick values covering [low, high]."""
+    if not np.isfinite(low) or not np.isfinite(high):
+        return []
+    if high <= low:
+        high = low + 1
+
+    raw = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+
+    start = math.ceil(low / step) * step
+    return list(np.arange(start, high + step * 1e-9, step))
+
+
+def _format_tick(value: float) -> str:
+    if abs(value) >= 1000:
+        return f"{value:,.0f}"
+    return f"{value:g}"
+
+
+class _Axes:
+    """Maps data coordinates onto the plot area of a Drawing."""
+
+    def __init__(self, width: float, height: float, dates: pd.DatetimeIndex, y_range: tuple):
+        self.x0, self.x1 = LEFT, width - RIGHT
+        self.y0, self.y1 = BOTTOM, height - TOP
+
+        # Nanoseconds since the first date, as floats
+        self.t = (dates.asi8 - dates.asi8[0]).astype(float)
+        self.t_span = self.t[-1] if len(self.t) and self.t[-1] > 0 else 1.0
+        self.y_low, self.y_high = y_range
+
+    def x(self, t: np.ndarray) -> np.ndarray:
+        return self.x0 + (self.x1 - self.x0) * t / self.t_span
+
+    def y(self, values: np.ndarray) -> np.ndarray:
+        span = (self.y_high - self.y_low) or 1.0
+        return self.y0 + (self.y1 - self.y0) * (values - self.y_low) / span
+
+
+def _segments(xs: np.ndarray, ys: np.ndarray) -> list:
+    """Split a line at NaNs into runs of flat [x0, y0, x1, y1, ...] points."""
+    valid = ~np.isnan(ys)
+    runs = []
+    start = None
+    for i, ok in enumerate(np.append(valid, False)):
+        if ok and start is None:
+            start = i
+        elif not ok and start is not None:
+            if i - start > 1:
+                runs.append(np.column_stack([xs[start:i], ys[start:i]]).ravel().tolist())
+            start = None
+    return runs
+
+
+def _frame(drawing: Drawing, axes: _Axes, dates: pd.DatetimeIndex, title: str, y_ticks: list, y_label: str):
+    """Title, grid, tick labels and the plot border."""
+    width = drawing.width
+    drawing.add(String(width / 2, drawing.height - 14, title, fontName=FONT + '-Bold',
+                       fontSize=10, textAnchor='middle'))
+
+    for value in y_ticks:
+        y = float(axes.y(np.array(value)))
+        drawing.add(Line(axes.x0, y, axes.x1, y, strokeColor=GRID_COLOR, strokeWidth=0.5))
+        drawing.add(String(axes.x0 - 4, y - 2.5, _format_tick(value), fontName=FONT,
+                           fontSize=7, textAnchor='end', fillColor=AXIS_COLOR))
+
+    # Date ticks: ~6 evenly spaced labels, years only for long histories
+    if len(dates) > 1:
+        years = (dates[-1] - dates[0]).days / 365.25
+        fmt = '%Y' if years > 3 else '%b %Y'
+        for i in np.linspace(0, len(dates) - 1, 6).astype(int):
+            x = float(axes.x(axes.t[i]))
+            drawing.add(Line(x, axes.y0, x, axes.y0 - 3, strokeColor=AXIS_COLOR, strokeWidth=0.5))
+            drawing.add(String(x, axes.y0 - 12, dates[i].strftime(fmt), fontName=FONT,
+                               fontSize=7, textAnchor='middle', fillColor=AXIS_COLOR))
+
+    # Rotated y-axis label
+    label = Group(String(0, 0, y_label, fontName=FONT, fontSize=7, fillColor=AXIS_COLOR, textAnchor='middle'))
+    label.transform = (0, 1, -1, 0, 8, (axes.y0 + axes.y1) / 2)
+    drawing.add(label)
+    drawing.add(Rect(axes.x0, axes.y0, axes.x1 - axes.x0, axes.y1 - axes.y0,
+                     fillColor=None, strokeColor=AXIS_COLOR, strokeWidth=0.5))
+
+
+def _legend(drawing: Drawing, axes: _Axes, entries: list):
+    """Legend in the top-left corner of the plot area."""
+    x = axes.x0 + 6
+    y = axes.y1 - 10
+    for label, color in entries:
+        drawing.add(Line(x, y + 2.5, x + 12, y + 2.5, strokeColor=color, strokeWidth=1.2))
+        drawing.add(String(x + 15, y, label, fontName=FONT, fontSize=7))
+        x += 25 + stringWidth(label, FONT, 7)
+
+
+def _add_line(drawing: Drawing, axes: _Axes, values: np.ndarray, color, width: float = 0.8):
+    xs = axes.x(axes.t)
+    ys = axes.y(values)
+    for points in _segments(xs, ys):
+        drawing.add(PolyLine(points, strokeColor=color, strokeWidth=width, strokeLineJoin=1))
+
+
+def price_drawing(chart: dict, ticker: str, width: float, height: float) -> Drawing:
+    """Price with 20/50-day moving averages."""
+    dates, lines = pd.DatetimeIndex(chart['dates']), chart['lines']
+    values = np.concatenate([lines['close'], lines['sma_20'], lines['sma_50']])
+    low, high = np.nanmin(values), np.nanmax(values)
+    pad = (high - low) * 0.05
+
+    drawing = Drawing(width, height)
+    axes = _Axes(width, height, dates, (low - pad, high + pad))
+    _frame(drawing, axes, dates, f'{ticker} - Price with Moving Averages',
+           _nice_ticks(low - pad, high + pad), 'Price ($)')
+
+    series = [('Price', 'close', HexColor('#1f4fd1')),
+              ('SMA 20', 'sma_20', HexColor('#ed8936')),
+              ('SMA 50', 'sma_50', HexColor('#e53e3e'))]
+    for _, name, color in series:
+        _add_line(drawing, axes, lines[name], color)
+    _legend(drawing, axes, [(label, color) for label, _, color in series])
+    return drawing
+
+
+def rsi_drawing(chart: dict, ticker: str, width: float, height: float) -> Drawing:
+    """RSI with overbought (70) and oversold (30) bands."""
+    dates = pd.DatetimeIndex(chart['dates'])
+    period = chart.get('period', 14)
+
+    drawing = Drawing(width, height)
+    axes = _Axes(width, height, dates, (0, 100))
+    _frame(drawing, axes, dates, f'{ticker} - RSI ({period}-day)', [0, 30, 50, 70, 100], 'RSI')
+
+    for level, color in ((70, HexColor('#e53e3e')), (30, HexColor('#38a169'))):
+        y = float(axes.y(np.array(level)))
+        drawing.add(Line(axes.x0, y, axes.x1, y, strokeColor=color, strokeWidth=0.8,
+                         strokeDashArray=[3, 2]))
+
+    _add_line(drawing, axes, chart['lines']['rsi'], HexColor('#805ad5'))
+    _legend(drawing, axes, [('RSI', HexColor('#805ad5'))])
+    return drawing
+
+
+def drawdown_drawing(chart: dict, ticker: str, width: float, height: float) -> Drawing:
+    """Drawdown (%) as a filled area below zero."""
+    dates = pd.DatetimeIndex(chart['dates'])
+    drawdown = np.asarray(chart['lines']['drawdown'], dtype=float)
+    low = min(float(np.nanmin(drawdown)), -1.0) * 1.05
+
+    drawing = Drawing(width, height)
+    axes = _Axes(width, height, dates, (low, 0))
+    _frame(drawing, axes, dates, f'{ticker} - Drawdown', _nice_ticks(low, 0), 'Drawdown (%)')
+
+    xs = axes.x(axes.t)
+    ys = axes.y(np.nan_to_num(drawdown))
+    zero = float(axes.y(np.array(0.0)))
+    area = np.column_stack([xs, ys]).ravel().tolist() + [float(xs[-1]), zero, float(xs[0]), zero]
+    drawing.add(Polygon(area, fillColor=HexColor('#feb2b2'), strokeColor=None, strokeWidth=0))
+    _add_line(drawing, axes, drawdown, HexColor('#e53e3e'))
+    return drawing
+
+
+CHART_DRAWINGS = {
+    'price': price_drawing,
+    'rsi': rsi_drawing,
+    'drawdown': drawdown_drawing
+}
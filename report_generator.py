@@ -10,10 +10,261 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.colors import HexColor
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
 from reportlab.lib import colors
+import copy
+import io
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from report_charts import CHART_DRAWINGS
 
+# Shared utilities live in the repo-level shared/ directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shared'))
+from tracing import annotate, span, traced
+
+
+def _chart_image(name: str, chart, ticker: str, width: float, height: float):
+    """
+    Build the flowable for one chart.
+    
+    Parameters:
+        name: 'price', 'rsi' or 'drawdown'
+        chart: A chart path, an in-memory chart artifact, or chart series
+            from visualizer.chart_series (drawn as native vector graphics)
+    
+    Returns:
+        Image or Drawing flowable, or None if the chart is missing
+    """
+    if isinstance(chart, dict) and 'lines' in chart:
+        # Vector mode: draw the lines with reportlab itself
+        return CHART_DRAWINGS[name](chart, ticker, width, height)
+    
+    if isinstance(chart, dict):
+        # Artifact from generate_all_charts(in_memory=True): no disk read
+        if not chart.get('image'):
+            return None
+        return Image(io.BytesIO(chart['image']), width=width, height=height)
+    
+    if chart and os.path.exists(chart):
+        return Image(chart, width=width, height=height)
+    return None
+
+
+class ReportTemplate:
+    """
+    Compiled report layout: paragraph styles, the metrics table style and
+    the static disclaimer are built once and reused for every report.
+    
+    One template can build any number of PDFs; generate_pdf_reports keeps
+    one per worker process.
+    """
+    
+    DISCLAIMER = """
+    This report is generated automatically by FinCrew AI and is for informational purposes only. 
+    It does not constitute financial advice, investment recommendations, or an offer to buy or sell securities. 
+    Past performance is not indicative of future results. Always consult with a qualified financial advisor 
+    before making investment decisions.
+    """
+    
+    def __init__(self):
+        """Build every style and static flowable."""
+        styles = getSampleStyleSheet()
+        
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            textColor=HexColor('#1a365d')
+        )
+        
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            spaceBefore=20,
+            spaceAfter=10,
+            textColor=HexColor('#2c5282')
+        )
+        
+        self.body_style = ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=8,
+            leading=14
+        )
+        
+        self.ticker_style = ParagraphStyle('Ticker', parent=styles['Heading1'], fontSize=36, textColor=HexColor('#2b6cb0'))
+        self.disclaimer_style = ParagraphStyle('Disclaimer', parent=self.body_style, fontSize=9, textColor=HexColor('#718096'))
+        
+        self.metrics_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5282')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f7fafc')),
+            ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0'))
+        ])
+        
+        # Static text is parsed once; build() hands out copies
+        self.report_title = Paragraph("Financial Analysis Report", self.title_style)
+        self.prepared_by = Paragraph("Prepared by FinCrew AI", self.body_style)
+        self.disclaimer_heading = Paragraph("Disclaimer", self.heading_style)
+        self.disclaimer = Paragraph(self.DISCLAIMER, self.disclaimer_style)
+    
+    def build(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        market_data: dict,
+        quant_data: dict,
+        charts_dir: str = "data_analyst_agent/outputs",
+        output_dir: str = "reports",
+        charts: dict = None
+    ) -> str:
+        """
+        Build one PDF report (same arguments as generate_pdf_report).
+        
+        Returns:
+            Path to generated PDF
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        filename = f"{output_dir}/{ticker}_report_{end_date}.pdf"
+        
+        doc = SimpleDocTemplate(
+            filename,
+            pagesize=letter,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=72
+        )
+        
+        title_style = self.title_style
+        heading_style = self.heading_style
+        body_style = self.body_style
+        
+        # Build content
+        story = []
+        
+        # === TITLE PAGE ===
+        story.append(Spacer(1, 2*inch))
+        story.append(copy.copy(self.report_title))
+        story.append(Spacer(1, 0.5*inch))
+        story.append(Paragraph(f"<b>{ticker}</b>", self.ticker_style))
+        story.append(Spacer(1, 0.3*inch))
+        story.append(Paragraph(f"Analysis Period: {start_date} to {end_date}", body_style))
+        story.append(Paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", body_style))
+        story.append(Spacer(1, 1*inch))
+        story.append(copy.copy(self.prepared_by))
+        story.append(PageBreak())
+        
+        # === EXECUTIVE SUMMARY ===
+        story.append(Paragraph("Executive Summary", title_style))
+        
+        # Market Sentiment Box
+        sentiment = market_data.get('sentiment', 'N/A')
+        confidence = market_data.get('confidence_score', 0)
+        
+        sentiment_color = '#38a169' if sentiment == 'Bullish' else '#e53e3e' if sentiment == 'Bearish' else '#718096'
+        
+        story.append(Paragraph("Market Sentiment", heading_style))
+        story.append(Paragraph(f"<b>Overall Signal:</b> <font color='{sentiment_color}'>{sentiment}</font>", body_style))
+        story.append(Paragraph(f"<b>Confidence Score:</b> {confidence:.0%}", body_style))
+        story.append(Spacer(1, 0.2*inch))
+        
+        # Key Metrics Table
+        story.append(Paragraph("Key Metrics", heading_style))
+        
+        metrics_data = [
+            ['Metric', 'Value'],
+            ['Average Return', f"{quant_data.get('avg_return', 0)*100:.2f}%"],
+            ['Annual Volatility', f"{quant_data.get('volatility', 0)*100:.2f}%"],
+            ['RSI', f"{quant_data.get('RSI', 'N/A')}"],
+            ['Max Drawdown', f"{quant_data.get('max_drawdown', 0)*100:.2f}%"]
+        ]
+        
+        metrics_table = Table(metrics_data, colWidths=[2.5*inch, 2*inch])
+        metrics_table.setStyle(self.metrics_table_style)
+        story.append(metrics_table)
+        story.append(Spacer(1, 0.3*inch))
+        
+        # Summary Points
+        story.append(Paragraph("Key Highlights", heading_style))
+        for point in market_data.get('summary', []):
+            story.append(Paragraph(f"• {point}", body_style))
+        
+        story.append(Spacer(1, 0.2*inch))
+        
+        # Risks
+        story.append(Paragraph("Key Risks", heading_style))
+        for risk in market_data.get('key_risks', []):
+            story.append(Paragraph(f"• {risk}", body_style))
+        
+        story.append(PageBreak())
+        
+        # === CHARTS PAGE ===
+        story.append(Paragraph("Technical Analysis", title_style))
+        
+        if charts is None:
+            charts = {
+                'price': f"{charts_dir}/{ticker}_price.png",
+                'rsi': f"{charts_dir}/{ticker}_rsi.png",
+                'drawdown': f"{charts_dir}/{ticker}_drawdown.png"
+            }
+        
+        # Price Chart
+        price_chart = _chart_image('price', charts.get('price'), ticker, 6*inch, 3*inch)
+        if price_chart is not None:
+            story.append(Paragraph("Price Chart with Moving Averages", heading_style))
+            story.append(price_chart)
+            story.append(Spacer(1, 0.3*inch))
+        
+        # RSI Chart
+        rsi_chart = _chart_image('rsi', charts.get('rsi'), ticker, 6*inch, 2*inch)
+        if rsi_chart is not None:
+            story.append(Paragraph("Relative Strength Index (RSI)", heading_style))
+            story.append(rsi_chart)
+            story.append(Spacer(1, 0.3*inch))
+        
+        # Drawdown Chart
+        drawdown_chart = _chart_image('drawdown', charts.get('drawdown'), ticker, 6*inch, 2*inch)
+        if drawdown_chart is not None:
+            story.append(Paragraph("Drawdown Analysis", heading_style))
+            story.append(drawdown_chart)
+        
+        story.append(PageBreak())
+        
+        # === DISCLAIMER ===
+        story.append(copy.copy(self.disclaimer_heading))
+        story.append(copy.copy(self.disclaimer))
+        
+        # Build PDF
+        with span("render_pdf", flowables=len(story)):
+            doc.build(story)
+        
+        return filename
+
+
+# One template per process, built on first use
+_template = None
+
+
+def get_template() -> ReportTemplate:
+    """Return this process's shared ReportTemplate."""
+    global _template
+    if _template is None:
+        _template = ReportTemplate()
+    return _template
+
+
+@traced("generate_pdf_report")
 def generate_pdf_report(
     ticker: str,
     start_date: str,
@@ -21,158 +272,103 @@ def generate_pdf_report(
     market_data: dict,
     quant_data: dict,
     charts_dir: str = "data_analyst_agent/outputs",
-    output_dir: str = "reports"
+    output_dir: str = "reports",
+    charts: dict = None
 ) -> str:
     """
     Generate a professional PDF report.
     
+    Parameters:
+        charts: Charts keyed 'price', 'rsi', 'drawdown'. Each is a PNG
+            path or in-memory artifact from generate_all_charts (raster),
+            or series from visualizer.chart_series (drawn as vectors:
+            smaller, faster to build, sharp at any zoom). If omitted,
+            the default filenames are looked up in charts_dir.
+    
     Returns:
         Path to generated PDF
     """
-    os.makedirs(output_dir, exist_ok=True)
-    filename = f"{output_dir}/{ticker}_report_{end_date}.pdf"
-    
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=letter,
-        rightMargin=72,
-        leftMargin=72,
-        topMargin=72,
-        bottomMargin=72
-    )
-    
-    # Styles
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        textColor=HexColor('#1a365d')
+    annotate(ticker=ticker)
+    return get_template().build(
+        ticker, start_date, end_date, market_data, quant_data,
+        charts_dir=charts_dir, output_dir=output_dir, charts=charts
     )
+
+
+def _build_report_item(job: dict, charts_dir: str, output_dir: str) -> dict:
+    """
+    Build one report inside a worker process.
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceBefore=20,
-        spaceAfter=10,
-        textColor=HexColor('#2c5282')
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=8,
-        leading=14
-    )
-    
-    # Build content
-    story = []
-    
-    # === TITLE PAGE ===
-    story.append(Spacer(1, 2*inch))
-    story.append(Paragraph(f"Financial Analysis Report", title_style))
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(f"<b>{ticker}</b>", ParagraphStyle('Ticker', parent=styles['Heading1'], fontSize=36, textColor=HexColor('#2b6cb0'))))
-    story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph(f"Analysis Period: {start_date} to {end_date}", body_style))
-    story.append(Paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", body_style))
-    story.append(Spacer(1, 1*inch))
-    story.append(Paragraph("Prepared by FinCrew AI", body_style))
-    story.append(PageBreak())
-    
-    # === EXECUTIVE SUMMARY ===
-    story.append(Paragraph("Executive Summary", title_style))
-    
-    # Market Sentiment Box
-    sentiment = market_data.get('sentiment', 'N/A')
-    confidence = market_data.get('confidence_score', 0)
-    
-    sentiment_color = '#38a169' if sentiment == 'Bullish' else '#e53e3e' if sentiment == 'Bearish' else '#718096'
-    
-    story.append(Paragraph("Market Sentiment", heading_style))
-    story.append(Paragraph(f"<b>Overall Signal:</b> <font color='{sentiment_color}'>{sentiment}</font>", body_style))
-    story.append(Paragraph(f"<b>Confidence Score:</b> {confidence:.0%}", body_style))
-    story.append(Spacer(1, 0.2*inch))
-    
-    # Key Metrics Table
-    story.append(Paragraph("Key Metrics", heading_style))
-    
-    metrics_data = [
-        ['Metric', 'Value'],
-        ['Average Return', f"{quant_data.get('avg_return', 0)*100:.2f}%"],
-        ['Annual Volatility', f"{quant_data.get('volatility', 0)*100:.2f}%"],
-        ['RSI', f"{quant_data.get('RSI', 'N/A')}"],
-        ['Max Drawdown', f"{quant_data.get('max_drawdown', 0)*100:.2f}%"]
-    ]
-    
-    metrics_table = Table(metrics_data, colWidths=[2.5*inch, 2*inch])
-    metrics_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5282')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f7fafc')),
-        ('GRID', (0, 0), (-1, -1), 1, HexColor('#e2e8f0'))
-    ]))
-    story.append(metrics_table)
-    story.append(Spacer(1, 0.3*inch))
-    
-    # Summary Points
-    story.append(Paragraph("Key Highlights", heading_style))
-    for point in market_data.get('summary', []):
-        story.append(Paragraph(f"• {point}", body_style))
-    
-    story.append(Spacer(1, 0.2*inch))
-    
-    # Risks
-    story.append(Paragraph("Key Risks", heading_style))
-    for risk in market_data.get('key_risks', []):
-        story.append(Paragraph(f"• {risk}", body_style))
-    
-    story.append(PageBreak())
-    
-    # === CHARTS PAGE ===
-    story.append(Paragraph("Technical Analysis", title_style))
-    
-    # Price Chart
-    price_chart = f"{charts_dir}/{ticker}_price.png"
-    if os.path.exists(price_chart):
-        story.append(Paragraph("Price Chart with Moving Averages", heading_style))
-        story.append(Image(price_chart, width=6*inch, height=3*inch))
-        story.append(Spacer(1, 0.3*inch))
-    
-    # RSI Chart
-    rsi_chart = f"{charts_dir}/{ticker}_rsi.png"
-    if os.path.exists(rsi_chart):
-        story.append(Paragraph("Relative Strength Index (RSI)", heading_style))
-        story.append(Image(rsi_chart, width=6*inch, height=2*inch))
-        story.append(Spacer(1, 0.3*inch))
+    Any failure is caught and returned, so one bad report never takes
+    down the batch.
+    """
+    start = time.perf_counter()
+    try:
+        path = get_template().build(
+            job['ticker'],
+            job['start_date'],
+            job['end_date'],
+            job.get('market_data', {}),
+            job.get('quant_data', {}),
+            charts_dir=job.get('charts_dir', charts_dir),
+            output_dir=job.get('output_dir', output_dir),
+            charts=job.get('charts')
+        )
+        error = None
+    except Exception as e:
+        path = None
+        error = f"{type(e).__name__}: {e}"
     
-    # Drawdown Chart
-    drawdown_chart = f"{charts_dir}/{ticker}_drawdown.png"
-    if os.path.exists(drawdown_chart):
-        story.append(Paragraph("Drawdown Analysis", heading_style))
-        story.append(Image(drawdown_chart, width=6*inch, height=2*inch))
+    return {
+        'ticker': job.get('ticker'),
+        'success': error is None,
+        'path': path,
+        'error': error,
+        'elapsed': round(time.perf_counter() - start, 3)
+    }
+
+
+def generate_pdf_reports(
+    batch: list,
+    charts_dir: str = "data_analyst_agent/outputs",
+    output_dir: str = "reports",
+    max_workers: int = None
+) -> list:
+    """
+    Generate many PDF reports across a process pool.
     
-    story.append(PageBreak())
+    Parameters:
+        batch: List of dicts with 'ticker', 'start_date', 'end_date',
+            'market_data', 'quant_data' and optionally 'charts' (same
+            meaning as generate_pdf_report's arguments); 'charts_dir' and
+            'output_dir' override the defaults per report
+        charts_dir: Default charts directory
+        output_dir: Default output directory
+        max_workers: Worker processes (defaults to the CPU count);
+            1 builds in this process
     
-    # === DISCLAIMER ===
-    story.append(Paragraph("Disclaimer", heading_style))
-    disclaimer = """
-    This report is generated automatically by FinCrew AI and is for informational purposes only. 
-    It does not constitute financial advice, investment recommendations, or an offer to buy or sell securities. 
-    Past performance is not indicative of future results. Always consult with a qualified financial advisor 
-    before making investment decisions.
+    Returns:
+        One dict per report, in batch order, with 'ticker', 'success',
+        'path', 'error' and 'elapsed'
     """
-    story.append(Paragraph(disclaimer, ParagraphStyle('Disclaimer', parent=body_style, fontSize=9, textColor=HexColor('#718096'))))
+    max_workers = max_workers or os.cpu_count() or 1
     
-    # Build PDF
-    doc.build(story)
+    if max_workers == 1 or len(batch) <= 1:
+        return [_build_report_item(job, charts_dir, output_dir) for job in batch]
     
-    return filename
\ No newline at end of file
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_build_report_item, job, charts_dir, output_dir) for job in batch]
+        for job, future in zip(batch, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker itself died (or the job couldn't be pickled)
+                results.append({
+                    'ticker': job.get('ticker'),
+                    'success': False,
+                    'path': None,
+                    'error': f"{type(e).__name__}: {e}",
+                    'elapsed': 0.0
+                })
+    return results
@@ -0,0 +1,379 @@
+"""
+RESILIENCE MODULE
+
+Client-side rate limiting, retries and circuit breaking for the external
+data providers (Yahoo Finance, Finnhub).
+
+Each provider has one token bucket whose state lives in a small file
+under the system temp directory, guarded by an fcntl lock, so every
+thread and every worker process on the machine draws from the same
+budget. A call that finds the bucket empty reserves the next token and
+sleeps until it is due, so waiting callers are served in order instead
+of polling.
+
+Failed calls are retried with full-jitter exponential backoff when the
+error is retryable (connection errors, timeouts, HTTP 429 and 5xx).
+Consecutive retryable failures open a circuit breaker: while it is open
+every call fails fast with CircuitOpenError, and after reset_timeout a
+single probe call is let through to test whether the provider is back.
+
+Settings per provider come from configure_provider() or environment
+variables, e.g. FINNHUB_RATE_LIMIT=1 (requests per second),
+FINNHUB_BURST=30, FINNHUB_MAX_RETRIES=3.
+"""
+
+import contextlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: the bucket is only shared between threads
+    fcntl = None
+
+try:
+    import requests
+    _NETWORK_ERRORS = (ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout)
+except ImportError:
+    _NETWORK_ERRORS = (ConnectionError, TimeoutError)
+
+
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Defaults per provider; anything not listed uses DEFAULT_SETTINGS
+DEFAULT_SETTINGS = {
+    'rate': 5.0,
+    'burst': 10,
+    'max_retries': 3,
+    'backoff_base': 0.5,
+    'backoff_max': 30.0,
+    'failure_threshold': 5,
+    'reset_timeout': 30.0
+}
+PROVIDER_DEFAULTS = {
+    # Free tier: 60 calls per minute, short bursts of up to 30
+    'finnhub': {'rate': 1.0, 'burst': 30},
+    # Unpublished limit; a couple of requests per second stays clear of it
+    'yahoo': {'rate': 2.0, 'burst': 5}
+}
+ENV_SETTINGS = {
+    'rate': ('RATE_LIMIT', float),
+    'burst': ('BURST', float),
+    'max_retries': ('MAX_RETRIES', int),
+    'failure_threshold': ('FAILURE_THRESHOLD', int),
+    'reset_timeout': ('RESET_TIMEOUT', float)
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider while its circuit breaker is open."""
+
+
+def is_retryable(exc: Exception) -> bool:
+    """
+    Whether a failed call is worth retrying.
+
+    Retries network errors, timeouts, rate-limit errors and HTTP 408/425/
+    429/5xx responses; anything else (bad symbol, 4xx, parse errors) is
+    raised straight away.
+    """
+    status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if isinstance(exc, _NETWORK_ERRORS):
+        return True
+    # e.g. yfinance's YFRateLimitError
+    return 'RateLimit' in type(exc).__name__
+
+
+class Provider:
+    """
+    Rate limit, retry policy and circuit breaker for one external provider.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = DEFAULT_SETTINGS['rate'],
+        burst: float = DEFAULT_SETTINGS['burst'],
+        max_retries: int = DEFAULT_SETTINGS['max_retries'],
+        backoff_base: float = DEFAULT_SETTINGS['backoff_base'],
+        backoff_max: float = DEFAULT_SETTINGS['backoff_max'],
+        failure_threshold: int = DEFAULT_SETTINGS['failure_threshold'],
+        reset_timeout: float = DEFAULT_SETTINGS['reset_timeout'],
+        retryable=None,
+        state_dir: str = None,
+        clock=None,
+        sleep=None
+    ):
+        """
+        Initialize the provider.
+
+        Parameters:
+            name: Provider name, also the name of its state file
+            rate: Sustained requests per second
+            burst: Most requests allowed back to back after an idle period
+            max_retries: Retries after the first attempt (0 disables retries)
+            backoff_base: Backoff cap of the first retry in seconds; doubles
+                on every further retry, up to backoff_max
+            backoff_max: Longest sleep between two attempts
+            failure_threshold: Consecutive retryable failures that open the
+                circuit breaker
+            reset_timeout: Seconds the breaker stays open before a probe
+            retryable: Function (exception) -> bool, defaults to is_retryable
+            state_dir: Directory of the shared state file (defaults to
+                <tmp>/fincrew-limits)
+            clock: Function returning the current Unix time (for tests)
+            sleep: Function sleeping for a number of seconds (for tests)
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retryable = retryable or is_retryable
+        self.state_dir = state_dir or os.path.join(tempfile.gettempdir(), 'fincrew-limits')
+        self.clock = clock or time.time
+        self.sleep = sleep or time.sleep
+        self._lock = threading.Lock()
+
+        self.counters = {
+            'calls': 0,
+            'throttle_waits': 0,
+            'throttle_seconds': 0.0,
+            'retries': 0,
+            'failures': 0,
+            'circuit_opens': 0,
+            'circuit_rejections': 0
+        }
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.state_dir, f'{self.name}.json')
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs) under the rate limit, retrying
+        retryable errors with backoff.
+
+        Returns:
+            Whatever func returns
+
+        Raises:
+            CircuitOpenError while the provider's breaker is open, otherwise
+            the last exception raised by func
+        """
+        self._count('calls')
+        attempt = 0
+
+        while True:
+            self._wait(self._admit())
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not self.retryable(e):
+                    # The provider answered; the request itself was bad
+                    self._record_success()
+                    raise
+                self._count('failures')
+                opened = self._record_failure()
+                if opened or attempt >= self.max_retries:
+                    raise
+                self._count('retries')
+                self.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+
+            self._record_success()
+            return result
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available.
+
+        Returns:
+            Seconds waited
+        """
+        with self._state() as state:
+            wait = self._reserve(state, self.clock())
+        self._wait(wait)
+        return wait
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number attempt + 1."""
+        cap = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    def circuit_state(self) -> str:
+        """'closed', 'open', or 'half-open' (the next call is a probe)."""
+        with self._state() as state:
+            return self._circuit(state, self.clock())
+
+    def stats(self) -> dict:
+        """Return throttle/retry/breaker counters and the circuit state."""
+        with self._lock:
+            stats = dict(self.counters)
+        stats['throttle_seconds'] = round(stats['throttle_seconds'], 3)
+        stats['circuit'] = self.circuit_state()
+        return stats
+
+    def reset(self):
+        """Refill the bucket and close the breaker (for every process)."""
+        with self._state() as state:
+            state.clear()
+            state.update(self._initial_state())
+
+    def _initial_state(self) -> dict:
+        return {'tokens': self.burst, 'updated': self.clock(), 'failures': 0, 'open_until': 0.0}
+
+    @staticmethod
+    def _circuit(state: dict, now: float) -> str:
+        if not state['open_until']:
+            return 'closed'
+        return 'open' if now < state['open_until'] else 'half-open'
+
+    def _reserve(self, state: dict, now: float) -> float:
+        """Take a token from the shared bucket; return how long until it is due."""
+        tokens = min(self.burst, state['tokens'] + (now - state['updated']) * self.rate)
+        # Reserve the token even when the bucket is empty and wait for it
+        # outside the lock: callers are served in the order they arrived
+        state['tokens'] = tokens - 1
+        state['updated'] = now
+        return max(0.0, (1 - tokens) / self.rate)
+
+    def _wait(self, seconds: float):
+        if seconds > 0:
+            with self._lock:
+                self.counters['throttle_waits'] += 1
+                self.counters['throttle_seconds'] += seconds
+            self.sleep(seconds)
+
+    def _admit(self) -> float:
+        """
+        Check the breaker and reserve a token in one locked step.
+
+        Fails fast while the breaker is open and lets one probe through
+        after reset_timeout.
+
+        Returns:
+            Seconds to wait for the token
+        """
+        with self._state() as state:
+            now = self.clock()
+            circuit = self._circuit(state, now)
+            if circuit == 'half-open':
+                # Keep everyone else out until the probe has finished
+                state['open_until'] = now + self.reset_timeout
+            if circuit != 'open':
+                return self._reserve(state, now)
+            retry_in = state['open_until'] - now
+
+        self._count('circuit_rejections')
+        raise CircuitOpenError(f"{self.name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+
+    def _record_failure(self) -> bool:
+        """Count a retryable failure; True if it opened the breaker."""
+        with self._state() as state:
+            state['failures'] += 1
+            reopen = state['open_until'] > 0
+            if reopen or state['failures'] >= self.failure_threshold:
+                state['open_until'] = self.clock() + self.reset_timeout
+                opened = True
+            else:
+                opened = False
+
+        if opened:
+            self._count('circuit_opens')
+        return opened
+
+    def _record_success(self):
+        with self._state() as state:
+            if state['failures'] or state['open_until']:
+                state['failures'] = 0
+                state['open_until'] = 0.0
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    @contextlib.contextmanager
+    def _state(self):
+        """Read-modify-write the shared state file under an exclusive lock."""
+        os.makedirs(self.state_dir, exist_ok=True)
+        with self._lock_file() as f:
+            f.seek(0)
+            raw = f.read()
+            try:
+                state = json.loads(raw) if raw else self._initial_state()
+            except ValueError:
+                state = self._initial_state()
+
+            yield state
+
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(state))
+            f.flush()
+
+    @contextlib.contextmanager
+    def _lock_file(self):
+        # A fresh descriptor per use: flock locks belong to the open file, so
+        # this excludes other threads as well as other (forked) processes
+        with self._lock if fcntl is None else contextlib.nullcontext():
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, 'r+') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                yield f
+
+
+# One Provider per name, per process
+_providers = {}
+_providers_guard = threading.Lock()
+
+
+def _settings_for(name: str) -> dict:
+    """Defaults for a provider, overridden by <NAME>_RATE_LIMIT etc."""
+    settings = dict(DEFAULT_SETTINGS, **PROVIDER_DEFAULTS.get(name, {}))
+    for key, (suffix, cast) in ENV_SETTINGS.items():
+        value = os.getenv(f'{name.upper()}_{suffix}')
+        if value:
+            settings[key] = cast(value)
+    return settings
+
+
+def get_provider(name: str) -> Provider:
+    """Return the provider with this name, creating it from its settings on first use."""
+    with _providers_guard:
+        if name not in _providers:
+            _providers[name] = Provider(name, **_settings_for(name))
+        return _providers[name]
+
+
+def configure_provider(name: str, **settings) -> Provider:
+    """
+    Replace a provider with new settings (any Provider keyword argument).
+
+    Settings not given keep their defaults.
+
+    Returns:
+        The new Provider
+    """
+    provider = Provider(name, **dict(_settings_for(name), **settings))
+    with _providers_guard:
+        _providers[name] = provider
+    return provider
+
+
+def provider_stats() -> dict:
+    """Counters of every provider used in this process, by name."""
+    with _providers_guard:
+        providers = dict(_providers)
+    return {name: provider.stats() for name, provider in providers.items()}
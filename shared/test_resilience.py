@@ -0,0 +1,142 @@
+"""
+Test file for the shared rate limiter, retries and circuit breaker.
+
+Runs offline with a fake clock; the cross-process test uses real time.
+"""
+
+import tempfile
+import time
+from multiprocessing import Pool
+
+import requests
+
+from resilience import CircuitOpenError, Provider, is_retryable
+
+
+class FakeClock:
+    """Clock that only moves when something sleeps."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_provider(clock, **settings):
+    return Provider('test', state_dir=tempfile.mkdtemp(), clock=clock.time, sleep=clock.sleep, **settings)
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+# Test 1: Burst, then one token every 1/rate seconds
+clock = FakeClock()
+provider = make_provider(clock, rate=2.0, burst=3)
+waits = [provider.acquire() for _ in range(5)]
+print(f"Waits: {waits}")
+assert waits == [0, 0, 0, 0.5, 0.5]
+clock.now += 10
+assert provider.acquire() == 0  # refilled while idle
+assert provider.stats()['throttle_waits'] == 2
+
+# Test 2: Two instances over the same state directory share one bucket
+clock = FakeClock()
+first = make_provider(clock, rate=1.0, burst=2)
+second = Provider('test', rate=1.0, burst=2, state_dir=first.state_dir, clock=clock.time, sleep=clock.sleep)
+assert [first.acquire(), second.acquire(), first.acquire()] == [0, 0, 1.0]
+
+# Test 3: Retryable errors are retried with capped, jittered backoff
+clock = FakeClock()
+provider = make_provider(clock, rate=1000, burst=1000, max_retries=3, backoff_base=0.5)
+attempts = []
+
+def flaky():
+    attempts.append(1)
+    if len(attempts) < 3:
+        raise http_error(503)
+    return 'ok'
+
+assert provider.call(flaky) == 'ok' and len(attempts) == 3
+assert len(clock.sleeps) == 2 and clock.sleeps[0] <= 0.5 and clock.sleeps[1] <= 1.0
+assert provider.stats()['retries'] == 2 and provider.circuit_state() == 'closed'
+
+# Test 4: Non-retryable errors are raised straight away
+assert not is_retryable(http_error(404)) and not is_retryable(ValueError("bad symbol"))
+assert is_retryable(http_error(429)) and is_retryable(requests.ConnectionError()) and is_retryable(TimeoutError())
+calls = []
+
+def bad_request():
+    calls.append(1)
+    raise http_error(404)
+
+try:
+    provider.call(bad_request)
+    raise AssertionError("expected HTTPError")
+except requests.HTTPError:
+    pass
+assert len(calls) == 1
+
+# Test 5: The breaker opens after consecutive failures, fails fast, then probes
+clock = FakeClock()
+provider = make_provider(clock, rate=1000, burst=1000, max_retries=1, backoff_base=0.1,
+                         failure_threshold=3, reset_timeout=30)
+calls = []
+
+def down():
+    calls.append(1)
+    raise requests.ConnectionError("connection refused")
+
+for _ in range(2):
+    try:
+        provider.call(down)
+    except requests.ConnectionError:
+        pass
+print(f"After 2 calls: {len(calls)} attempts, circuit {provider.circuit_state()}")
+assert len(calls) == 3 and provider.circuit_state() == 'open'
+
+try:
+    provider.call(down)
+    raise AssertionError("expected CircuitOpenError")
+except CircuitOpenError as e:
+    print(f"Fail fast: {e}")
+assert len(calls) == 3
+
+clock.now += 31
+assert provider.circuit_state() == 'half-open'
+assert provider.call(lambda: 'back') == 'back'
+assert provider.circuit_state() == 'closed'
+
+stats = provider.stats()
+print(f"Stats: {stats}")
+assert stats['circuit_opens'] == 1 and stats['circuit_rejections'] == 1 and stats['failures'] == 3
+
+# Test 6: Worker processes draw from the same bucket
+RATE = 50.0
+
+
+def take_tokens(n, state_dir):
+    provider = Provider('shared', rate=RATE, burst=1, state_dir=state_dir)
+    for _ in range(n):
+        provider.acquire()
+    return provider.stats()['throttle_waits']
+
+
+if __name__ == '__main__':
+    state_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    with Pool(4) as pool:
+        waits = pool.starmap(take_tokens, [(5, state_dir)] * 4)
+    elapsed = time.perf_counter() - start
+    print(f"4 processes x 5 tokens at {RATE}/s: {elapsed:.2f}s, waits per process {waits}")
+    assert elapsed >= 19 / RATE * 0.95 and sum(waits) >= 15
+
+    print("Resilience OK")
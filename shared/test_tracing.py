@@ -0,0 +1,99 @@
+"""
+Test file for the tracing spans and stage profiles.
+"""
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+
+def read_spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@tracing.traced("work", stage=True)
+def work(n):
+    tracing.annotate(n=n)
+    with tracing.span("inner", size=n) as step:
+        total = sum(i * i for i in range(n))
+        step.set(total=total)
+    return total
+
+
+@tracing.traced("pipeline")
+def pipeline():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(tracing.bind(work), n) for n in (1000, 2000)]
+        return [future.result() for future in futures]
+
+
+# Test 1: Disabled tracing is a no-op with negligible overhead
+assert not tracing.enabled()
+assert tracing.span("x") is tracing.span("y")  # shared no-op object
+
+def plain():
+    return 1
+
+wrapped = tracing.traced("plain")(plain)
+calls = 200_000
+start = time.perf_counter()
+for _ in range(calls):
+    plain()
+baseline = time.perf_counter() - start
+start = time.perf_counter()
+for _ in range(calls):
+    wrapped()
+overhead_ns = (time.perf_counter() - start - baseline) / calls * 1e9
+print(f"Disabled overhead: {overhead_ns:.0f} ns per traced call")
+assert overhead_ns < 2000
+
+# Test 2: Nested spans across threads, with attributes and durations
+directory = tempfile.mkdtemp()
+trace_path = os.path.join(directory, 'trace.jsonl')
+tracing.configure(trace_path=trace_path, profile=True)
+assert pipeline() == [sum(i * i for i in range(1000)), sum(i * i for i in range(2000))]
+
+spans = read_spans(trace_path)
+by_name = {}
+for record in spans:
+    by_name.setdefault(record['name'], []).append(record)
+root = by_name['pipeline'][0]
+print(f"{len(spans)} spans: {[s['name'] for s in spans]}")
+assert len(spans) == 5 and root['parent_id'] is None
+assert {s['trace_id'] for s in spans} == {root['trace_id']}
+assert all(s['parent_id'] == root['span_id'] for s in by_name['work'])
+work_ids = {s['span_id'] for s in by_name['work']}
+assert all(s['parent_id'] in work_ids for s in by_name['inner'])
+assert sorted(s['attributes']['n'] for s in by_name['work']) == [1000, 2000]
+assert all('total' in s['attributes'] and s['duration_ms'] >= 0 for s in by_name['inner'])
+assert root['duration_ms'] >= max(s['duration_ms'] for s in by_name['work'])
+
+# Test 3: Errors are recorded and re-raised
+try:
+    with tracing.span("failing", ticker="BAD"):
+        raise ValueError("no data")
+except ValueError:
+    pass
+failing = read_spans(trace_path)[-1]
+assert failing['status'] == 'error' and failing['error'] == 'ValueError: no data'
+
+# Test 4: Stage profiles, also merged from another process's raw stats
+raw = tracing.collect_profiles()
+assert set(raw) == {'work'}
+tracing.merge_profiles(raw)
+tracing.merge_profiles(raw)
+profile_path = os.path.join(directory, 'profile.txt')
+assert tracing.write_profile(profile_path) == ['work']
+report = open(profile_path).read()
+print(report.splitlines()[1])
+assert 'STAGE work' in report and 'genexpr' in report
+assert os.path.exists(profile_path + '.work.prof')
+
+tracing.configure()
+assert not tracing.enabled()
+print("Tracing OK")
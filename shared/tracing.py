@@ -0,0 +1,321 @@
+"""
+TRACING MODULE
+
+Lightweight spans for the analysis pipeline, written as JSON lines.
+
+A span times one step (fetching news, computing metrics, rendering
+charts...) and records its attributes; spans opened inside it become its
+children, following the current context (contextvars), so nesting works
+across function calls and, with bind(), across thread pools. One JSON
+object is written per finished span:
+
+    {"name": "generate_all_charts", "trace_id": "...", "span_id": "...",
+     "parent_id": "...", "start": 1718000000.12, "duration_ms": 412.5,
+     "status": "ok", "attributes": {"ticker": "AAPL"}, "pid": 4242, ...}
+
+Spans marked as stages can also be profiled: with profiling on, each
+stage runs under cProfile and its stats are accumulated per stage name
+and written out by write_profile().
+
+Tracing is off until configure() is called. While it is off, span()
+returns one shared no-op object and traced functions call straight
+through, so the instrumentation costs a global lookup per call.
+"""
+
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+# Set by configure()
+_enabled = False
+_trace_path = None
+_profile = False
+
+# Trace file, reopened after a fork so every process appends on its own descriptor
+_sink = None
+_sink_pid = None
+_sink_lock = threading.Lock()
+
+# Stage name -> accumulated pstats.Stats
+_profiles = {}
+_profiles_lock = threading.Lock()
+_profiling = threading.local()
+
+
+def configure(trace_path: str = None, profile: bool = False):
+    """
+    Turn tracing on or off.
+
+    Parameters:
+        trace_path: File the spans are appended to as JSON lines ('-' for
+            stderr; None with profile=False turns tracing off)
+        profile: Run every stage span under cProfile
+    """
+    global _enabled, _trace_path, _profile, _sink, _sink_pid
+    with _sink_lock:
+        if _sink is not None and _sink is not sys.stderr:
+            _sink.close()
+        _sink = _sink_pid = None
+        _trace_path = trace_path
+        _profile = profile
+        _enabled = bool(trace_path or profile)
+
+
+def settings() -> tuple:
+    """Current configure() arguments, e.g. to configure worker processes."""
+    return _trace_path, _profile
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+class Span:
+    """One timed step of the pipeline."""
+
+    def __init__(self, name: str, stage: bool = False, attributes: dict = None):
+        self.name = name
+        self.stage = stage
+        self.attributes = attributes or {}
+        self.parent = None
+        self.trace_id = None
+        self.span_id = os.urandom(8).hex()
+        self._token = None
+        self._profiler = None
+
+    def set(self, **attributes):
+        """Add attributes (e.g. result sizes known only at the end)."""
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self.trace_id = self.parent.trace_id if self.parent else os.urandom(16).hex()
+        self._token = _current_span.set(self)
+
+        if self.stage and _profile and not getattr(_profiling, 'active', False):
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+                _profiling.active = True
+            except ValueError:
+                # Another profiler is running (e.g. under an external profiler)
+                self._profiler = None
+
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._t0
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            _profiling.active = False
+            _add_profile(self.name, self._profiler)
+
+        _current_span.reset(self._token)
+
+        if _trace_path:
+            record = {
+                'name': self.name,
+                'trace_id': self.trace_id,
+                'span_id': self.span_id,
+                'parent_id': self.parent.span_id if self.parent else None,
+                'start': round(self.start, 6),
+                'duration_ms': round(duration * 1000, 3),
+                'status': 'error' if exc_type else 'ok',
+                'attributes': self.attributes,
+                'pid': os.getpid(),
+                'thread': threading.current_thread().name
+            }
+            if exc_type:
+                record['error'] = f"{exc_type.__name__}: {exc}"
+            _emit(record)
+        return False
+
+
+class _NoopSpan:
+    """Stands in for Span while tracing is off."""
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, stage: bool = False, **attributes):
+    """
+    Context manager timing a block as a span.
+
+    Parameters:
+        name: Span name, e.g. 'fetch_news'
+        stage: Profile this span (with profile=True); stages don't nest
+            their profiles, an inner stage is only traced
+        attributes: JSON-serializable span attributes (ticker, sizes...)
+    """
+    if not _enabled:
+        return _NOOP
+    return Span(name, stage, attributes)
+
+
+def current_span():
+    """The innermost open span (a no-op span when there is none)."""
+    return (_current_span.get() if _enabled else None) or _NOOP
+
+
+def annotate(**attributes):
+    """Add attributes to the innermost open span."""
+    if _enabled:
+        current_span().set(**attributes)
+
+
+def traced(name: str = None, stage: bool = False):
+    """
+    Decorator running every call of a function inside a span.
+
+    Parameters:
+        name: Span name (defaults to the function's qualified name)
+        stage: Profile the span, see span()
+    """
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                with Span(span_name, stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def bind(func):
+    """
+    Wrap func to run in a copy of the current context.
+
+    Thread pools don't carry contextvars over, so spans opened in a
+    submitted task would start new traces; bind the task first.
+    """
+    if not _enabled:
+        return func
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
+
+
+def _emit(record: dict):
+    global _sink, _sink_pid
+    line = json.dumps(record, default=str) + "\n"
+    with _sink_lock:
+        if _sink is None or _sink_pid != os.getpid():
+            if _trace_path == '-':
+                _sink = sys.stderr
+            else:
+                directory = os.path.dirname(_trace_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                _sink = open(_trace_path, 'a', buffering=1)
+            _sink_pid = os.getpid()
+        _sink.write(line)
+
+
+class _Captured:
+    """Raw pstats data from another process, in the shape pstats.Stats loads."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def _add_profile(stage: str, source):
+    """Accumulate a profiler (or raw stats from collect_profiles) under a stage name."""
+    if not isinstance(source, cProfile.Profile):
+        source = _Captured(source)
+    else:
+        source.create_stats()
+    if not source.stats:
+        return
+
+    with _profiles_lock:
+        if stage in _profiles:
+            _profiles[stage].add(source)
+        else:
+            _profiles[stage] = pstats.Stats(source, stream=io.StringIO())
+
+
+def collect_profiles() -> dict:
+    """
+    Take the stage profiles accumulated in this process.
+
+    Returns:
+        dict of stage -> raw pstats data (picklable, for merge_profiles);
+        the accumulated profiles are cleared
+    """
+    with _profiles_lock:
+        profiles = {stage: stats.stats for stage, stats in _profiles.items()}
+        _profiles.clear()
+    return profiles
+
+
+def merge_profiles(profiles: dict):
+    """Add stage profiles returned by collect_profiles (e.g. from a worker)."""
+    for stage, stats in profiles.items():
+        _add_profile(stage, stats)
+
+
+def write_profile(path: str, limit: int = 30) -> list:
+    """
+    Write the accumulated stage profiles.
+
+    path gets a text report with the top functions of each stage by
+    cumulative time, and every stage's full stats are dumped next to it
+    as <path>.<stage>.prof (for pstats, snakeviz...).
+
+    Returns:
+        Stage names written, slowest first
+    """
+    with _profiles_lock:
+        profiles = dict(_profiles)
+
+    stages = sorted(profiles, key=lambda stage: -profiles[stage].total_tt)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, 'w') as f:
+        for stage in stages:
+            stats = profiles[stage]
+            f.write(f"{'=' * 70}\nSTAGE {stage}: {stats.total_tt:.3f}s, {stats.total_calls} calls\n{'=' * 70}\n")
+            stats.stream = f
+            stats.sort_stats('cumulative').print_stats(limit)
+            stats.dump_stats(f"{path}.{stage}.prof")
+    return stages
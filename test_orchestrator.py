@@ -0,0 +1,153 @@
+"""
+Orchestrator Test
+Runs the pipeline with stubbed agents: output formats, the async
+pipeline, ticker files and batch runs.
+Runs offline; run from the repo root.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import orchestrator
+
+
+pdf_calls = []
+
+# Seconds each stubbed agent takes
+DELAYS = {'market': 0.0, 'quant': 0.0}
+
+def stub_analyze_market(ticker, start_date, end_date, cache=None):
+    time.sleep(DELAYS['market'])
+    if ticker == "CRASH":
+        raise RuntimeError("stub agent crashed")
+    if ticker.startswith("DEAD"):
+        os._exit(1)  # kills the worker process
+    return {'success': True, 'ticker': ticker}
+
+
+def stub_market_to_report(result):
+    return {"market_research": {
+        "sentiment": "Bullish",
+        "confidence_score": 0.7,
+        "key_risks": ["Stub risk"],
+        "summary": [f"Stub news for {result['ticker']}"]
+    }}
+
+
+class StubAnalyst:
+    """Stands in for DataAnalystAgent: fixed metrics, no download."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def run(self, ticker, start_date, end_date):
+        time.sleep(DELAYS['quant'])
+        if ticker == "BAD":
+            return {'success': False, 'errors': [f"No data found for {ticker}"]}
+        return {
+            'success': True,
+            'metrics': {'total_return': 0.1, 'volatility_annual': 0.2, 'max_drawdown': -0.05,
+                        'rsi_current': 55.0, 'avg_daily_return': 0.0004},
+            'charts': {'price': {'path': None}}
+        }
+
+    def to_report_format(self, result):
+        metrics = result['metrics']
+        return {"quant_analysis": {"volatility": metrics['volatility_annual'], "avg_return": metrics['avg_daily_return'],
+                                   "RSI": int(metrics['rsi_current']), "max_drawdown": metrics['max_drawdown']}}
+
+
+def stub_pdf(ticker, start_date, end_date, market_data, quant_data, charts):
+    pdf_calls.append(ticker)
+    return f"reports/{ticker}_stub.pdf"
+
+
+# Patched at import time, so worker processes that import this module get the stubs too
+orchestrator.analyze_market = stub_analyze_market
+orchestrator.market_to_report = stub_market_to_report
+orchestrator.DataAnalystAgent = StubAnalyst
+orchestrator.generate_pdf_report = stub_pdf
+
+
+if __name__ == "__main__":
+    # Test 1: Only the requested formats are built
+    print("Test 1: Output formats")
+    run = orchestrator.run_analysis("AAPL", "2024-01-01", "2024-12-31", formats=("text",))
+    assert set(run['outputs']) == {'text'} and pdf_calls == []
+    assert "Stub news for AAPL" in run['outputs']['text']
+
+    run = orchestrator.run_analysis("AAPL", "2024-01-01", "2024-12-31", formats=("text", "pdf"))
+    assert set(run['outputs']) == {'text', 'pdf'} and pdf_calls == ["AAPL"]
+
+    # A format that was already built is reused, not rendered again
+    assert orchestrator.build_outputs(run, ("pdf",)) == {'pdf': "reports/AAPL_stub.pdf"}
+    assert pdf_calls == ["AAPL"]
+
+    # Test 2: Unknown formats are rejected before any agent runs
+    print("\nTest 2: Unknown format")
+    calls = []
+    orchestrator.analyze_market = lambda *args, **kwargs: calls.append(args)
+    for build in (lambda: orchestrator.run_analysis("AAPL", "2024-01-01", "2024-12-31", formats=("text", "docx")),
+                  lambda: orchestrator.build_outputs(run, ("docx",))):
+        try:
+            build()
+            raise AssertionError("unknown format accepted")
+        except ValueError as e:
+            print(f"Rejected: {e}")
+            assert "docx" in str(e)
+    assert calls == []
+    orchestrator.analyze_market = stub_analyze_market
+
+    # Test 3: The async pipeline overlaps both agents and matches the sync result
+    print("\nTest 3: Async pipeline")
+    DELAYS.update(market=0.5, quant=0.5)
+    start = time.perf_counter()
+    sync_run = orchestrator.run_analysis("MSFT", "2024-01-01", "2024-12-31", formats=("text", "pdf"))
+    sync_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    async_run = asyncio.run(orchestrator.run_analysis_async("MSFT", "2024-01-01", "2024-12-31", formats=("text", "pdf")))
+    async_elapsed = time.perf_counter() - start
+    print(f"Sync: {sync_elapsed:.2f}s, async: {async_elapsed:.2f}s")
+
+    assert sync_elapsed >= 1.0
+    assert 0.5 <= async_elapsed < 0.8  # max(market, quant), not their sum
+    assert set(async_run) == set(sync_run) and set(async_run['outputs']) == {'text', 'pdf'}
+    for key in ('ticker', 'period', 'market_data', 'quant_data', 'metrics', 'report', 'outputs'):
+        assert async_run[key] == sync_run[key], key
+    DELAYS.update(market=0.0, quant=0.0)
+
+    # Test 4: Ticker files skip comments, blank lines and duplicates
+    print("\nTest 4: load_tickers")
+    path = os.path.join(tempfile.mkdtemp(), 'tickers.txt')
+    with open(path, 'w') as f:
+        f.write("# universe\naapl, MSFT\n\n  nvda  # chips\nAAPL\n#GOOG\nbad crash\n")
+    tickers = orchestrator.load_tickers(path)
+    print(f"Tickers: {tickers}")
+    assert tickers == ["AAPL", "MSFT", "NVDA", "BAD", "CRASH"]
+
+    # Test 5: Failing tickers are reported without stopping the batch
+    print("\nTest 5: run_batch")
+    summary = orchestrator.run_batch(tickers, "2024-01-01", "2024-12-31", formats=("text", "pdf"), max_workers=2)
+    print(f"Failures: {summary['failures']}")
+    assert (summary['total'], summary['succeeded'], summary['failed']) == (5, 3, 2)
+    assert summary['failures'] == {"BAD": "No data found for BAD", "CRASH": "RuntimeError: stub agent crashed"}
+    assert set(summary['results']) == set(tickers)
+    aapl = summary['results']["AAPL"]
+    assert aapl['success'] and aapl['error'] is None and aapl['result']['outputs']['pdf'] == "reports/AAPL_stub.pdf"
+    assert summary['results']["BAD"]['result'] is None
+
+    # Test 6: A dead worker fails only its own ticker; the pool is rebuilt for the rest
+    print("\nTest 6: Broken pool")
+    for workers, in_flight in [(1, 1), (2, None)]:
+        summary = orchestrator.run_batch(["AAPL", "DEAD", "MSFT", "NVDA", "DEAD2"], "2024-01-01", "2024-12-31",
+                                         max_workers=workers, max_in_flight=in_flight)
+        print(f"Failures: {summary['failures']}")
+        assert (summary['total'], summary['succeeded'], summary['failed']) == (5, 3, 2)
+        assert set(summary['failures']) == {"DEAD", "DEAD2"}
+        assert all(error.startswith(BrokenProcessPool.__name__) for error in summary['failures'].values())
+
+    print("\nOrchestrator OK")
@@ -0,0 +1,47 @@
+"""
+Batch PDF Report Test
+Builds several reports from one template and across a process pool.
+Runs offline; needs reportlab.
+"""
+
+import os
+import tempfile
+
+from report_generator import ReportTemplate, generate_pdf_reports
+
+
+market_data = {
+    "sentiment": "Bullish",
+    "confidence_score": 0.75,
+    "key_risks": ["Interest rate hikes"],
+    "summary": ["Strong sales"]
+}
+quant_data = {"volatility": 0.25, "avg_return": 0.001, "RSI": 55, "max_drawdown": -0.12}
+output_dir = tempfile.mkdtemp()
+
+
+# Test 1: One template builds many reports
+template = ReportTemplate()
+paths = [template.build(t, "2024-01-01", "2024-12-31", market_data, quant_data, output_dir=output_dir, charts={})
+         for t in ("AAPL", "MSFT", "AAPL")]
+print(f"Template reports: {[os.path.getsize(p) for p in paths]}")
+assert os.path.getsize(paths[0]) == os.path.getsize(paths[2])
+
+
+# Test 2: A bad report fails alone; results keep batch order
+batch = [
+    {"ticker": t, "start_date": "2024-01-01", "end_date": "2024-12-31",
+     "market_data": market_data, "quant_data": quant_data, "charts": {}}
+    for t in ("AAPL", "MSFT", "GOOG", "NVDA")
+]
+batch[1]["quant_data"] = {"volatility": "not a number"}
+
+results = generate_pdf_reports(batch, output_dir=output_dir, max_workers=2)
+for r in results:
+    print(f"  {r['ticker']}: {'OK' if r['success'] else r['error']}")
+
+assert [r['ticker'] for r in results] == ["AAPL", "MSFT", "GOOG", "NVDA"]
+assert [r['success'] for r in results] == [True, False, True, True]
+assert "ValueError" in results[1]['error']
+assert all(os.path.exists(r['path']) for r in results if r['success'])
+print("Batch reports OK")